@@ -0,0 +1,63 @@
+// Formato colunar de /api/data (?format=columns): nomes das colunas uma vez só,
+// um array de valores por coluna, dinheiro em centavos inteiros e datas como
+// número de dias desde 1970-01-01. Decodificado em src/lib/data-client.ts.
+
+export type ColumnType = 'id' | 'text' | 'num' | 'cents' | 'day' | 'bool' | 'ts'
+
+export type ColumnarTable = { columns: string[]; types: ColumnType[]; data: unknown[][] }
+
+type Table = 'clientes' | 'servicos' | 'despesas' | 'comissoes'
+
+const DAY_MS = 86_400_000
+
+const SPECS: Record<Table, [string, ColumnType][]> = {
+  clientes: [
+    ['id', 'id'], ['nome', 'text'], ['created_at', 'ts'], ['telefone', 'text'], ['email', 'text'],
+    ['endereco', 'text'], ['cpf', 'text'], ['updated_at', 'ts']
+  ],
+  servicos: [
+    ['id', 'id'], ['data_servico', 'day'], ['veiculo', 'text'], ['placa', 'text'], ['valor_bruto', 'cents'],
+    ['porcentagem_comissao', 'num'], ['observacao', 'text'], ['valor_pago', 'cents'], ['quitado', 'bool'],
+    ['comissao_recebida', 'cents'], ['cliente_id', 'id'], ['updated_at', 'ts']
+  ],
+  despesas: [
+    ['id', 'id'], ['descricao', 'text'], ['valor', 'cents'], ['data_vencimento', 'day'], ['pago', 'bool'], ['updated_at', 'ts']
+  ],
+  comissoes: [
+    ['id', 'id'], ['servico_id', 'id'], ['valor', 'cents'], ['data_recebimento', 'day'], ['status', 'text'],
+    ['created_at', 'ts'], ['updated_at', 'ts']
+  ]
+}
+
+// DATE chega do driver como Date à meia-noite local (ou texto YYYY-MM-DD)
+function toDay(value: unknown) {
+  if (value instanceof Date) return Math.round((value.getTime() - value.getTimezoneOffset() * 60_000) / DAY_MS)
+  const time = Date.parse(String(value).slice(0, 10))
+  return Number.isNaN(time) ? null : Math.round(time / DAY_MS)
+}
+
+function encodeValue(type: ColumnType, value: unknown) {
+  if (value === null || value === undefined) return null
+  switch (type) {
+    // BIGINT chega como texto; ids cabem com folga em 2^53
+    case 'id': return Number(value)
+    // DECIMAL(10,2) chega como texto ("123.45"); o arredondamento só desfaz o erro binário
+    case 'cents': return Math.round(Number(value) * 100)
+    case 'num': return Number(value)
+    case 'day': return toDay(value)
+    case 'bool': return value ? 1 : 0
+    case 'ts': return value instanceof Date ? value.toISOString() : String(value)
+    default: return value
+  }
+}
+
+/** Converte as linhas de uma tabela (na forma devolvida pelos readers) para o formato colunar. */
+export function toColumns(table: Table, rows: any[]): ColumnarTable {
+  const spec = SPECS[table]
+  const data = spec.map(() => new Array(rows.length))
+  for (let r = 0; r < rows.length; r++) {
+    const row = rows[r]
+    for (let c = 0; c < spec.length; c++) data[c][r] = encodeValue(spec[c][1], row[spec[c][0]])
+  }
+  return { columns: spec.map(([name]) => name), types: spec.map(([, type]) => type), data }
+}
@@ -1,7 +1,120 @@
-import { neon } from '@neondatabase/serverless'
+import { AsyncLocalStorage } from 'node:async_hooks'
+import { Pool, type PoolClient } from '@neondatabase/serverless'
 
 if (!process.env.DATABASE_URL) {
   throw new Error('Missing DATABASE_URL')
 }
 
-export const sql = neon(process.env.DATABASE_URL)
\ No newline at end of file
+// O Pool do driver da Neon fala com o banco por WebSocket (global a partir do Node 22)
+if (typeof WebSocket === 'undefined') {
+  throw new Error('WebSocket indisponível: as funções da API precisam do Node 22 ou superior')
+}
+
+// Criado uma vez por instância: as conexões abertas continuam disponíveis nas
+// próximas invocações enquanto a função estiver quente, em vez de um handshake
+// TLS por consulta como no driver HTTP
+export const pool = new Pool({ connectionString: process.env.DATABASE_URL, max: 5, idleTimeoutMillis: 60_000 })
+
+// Conexão ociosa derrubada pelo servidor: o Pool a descarta e abre outra na próxima consulta
+pool.on('error', err => console.error('Conexão do pool encerrada:', err.message))
+
+// Conexão da transação em andamento; consultas feitas dentro de withTransaction usam ela
+const transactionClient = new AsyncLocalStorage<PoolClient>()
+let savepointSeq = 0
+
+/**
+ * Consulta criada pelo template `sql`. Só é executada ao ser aguardada (ou
+ * passada para `sql.transaction`), no cliente da transação atual ou no pool.
+ */
+export class Query<T = any> implements PromiseLike<T[]> {
+  private result: Promise<T[]> | null = null
+
+  constructor(readonly text: string, readonly values: unknown[]) {}
+
+  run(client: Pool | PoolClient = transactionClient.getStore() ?? pool): Promise<T[]> {
+    return client.query(this.text, this.values as any[]).then(r => r.rows as T[])
+  }
+
+  then<A = T[], B = never>(
+    onfulfilled?: ((rows: T[]) => A | PromiseLike<A>) | null,
+    onrejected?: ((reason: any) => B | PromiseLike<B>) | null
+  ): Promise<A | B> {
+    this.result ??= this.run()
+    return this.result.then(onfulfilled, onrejected)
+  }
+}
+
+export type TransactionOptions = {
+  isolationMode?: 'ReadCommitted' | 'RepeatableRead' | 'Serializable'
+  readOnly?: boolean
+}
+
+const ISOLATION: Record<NonNullable<TransactionOptions['isolationMode']>, string> = {
+  ReadCommitted: 'READ COMMITTED',
+  RepeatableRead: 'REPEATABLE READ',
+  Serializable: 'SERIALIZABLE'
+}
+
+/**
+ * Executa `fn` numa transação em uma conexão do pool: todo `sql` aguardado
+ * dentro dela (inclusive em funções chamadas) vai para a mesma conexão. Erro
+ * desfaz tudo. Chamadas aninhadas participam da transação externa.
+ */
+export async function withTransaction<T>(fn: () => Promise<T>, opts: TransactionOptions = {}): Promise<T> {
+  if (transactionClient.getStore()) return fn()
+
+  const client = await pool.connect()
+  try {
+    await client.query(`BEGIN ISOLATION LEVEL ${ISOLATION[opts.isolationMode ?? 'ReadCommitted']}${opts.readOnly ? ' READ ONLY' : ''}`)
+    const result = await transactionClient.run(client, fn)
+    await client.query('COMMIT')
+    return result
+  } catch (e) {
+    await client.query('ROLLBACK').catch(() => undefined)
+    throw e
+  } finally {
+    client.release()
+  }
+}
+
+/**
+ * Dentro de uma transação, isola `fn` num SAVEPOINT: se falhar, só o que ela
+ * fez é desfeito e a transação continua utilizável. Fora de transação só executa `fn`.
+ */
+export async function withSavepoint<T>(fn: () => Promise<T>): Promise<T> {
+  const client = transactionClient.getStore()
+  if (!client) return fn()
+
+  const name = `sp_${++savepointSeq}`
+  await client.query(`SAVEPOINT ${name}`)
+  try {
+    const result = await fn()
+    await client.query(`RELEASE SAVEPOINT ${name}`)
+    return result
+  } catch (e) {
+    await client.query(`ROLLBACK TO SAVEPOINT ${name}`)
+    throw e
+  }
+}
+
+function sqlTag<T = any>(strings: TemplateStringsArray, ...values: unknown[]): Query<T> {
+  let text = strings[0]
+  values.forEach((_, i) => {
+    text += `$${i + 1}${strings[i + 1]}`
+  })
+  return new Query<T>(text, values)
+}
+
+/**
+ * Template de consultas parametrizadas (`sql\`... ${valor}\``), com a mesma
+ * forma de uso do driver HTTP. `sql.transaction([...])` roda as consultas em
+ * sequência numa única transação e devolve as linhas de cada uma.
+ */
+export const sql = Object.assign(sqlTag, {
+  transaction: (queries: Query[], opts?: TransactionOptions): Promise<any[][]> =>
+    withTransaction(async () => {
+      const results: any[][] = []
+      for (const query of queries) results.push(await query.run())
+      return results
+    }, opts)
+})
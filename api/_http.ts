@@ -0,0 +1,50 @@
+import type { VercelRequest, VercelResponse } from '@vercel/node'
+import { createHash } from 'node:crypto'
+import { promisify } from 'node:util'
+import { brotliCompress, gzip, constants } from 'node:zlib'
+
+const brotli = promisify(brotliCompress)
+const gz = promisify(gzip)
+
+// Abaixo disso o cabeçalho da compressão custa mais do que economiza
+const MIN_COMPRESS_SIZE = 1024
+
+/** ETag fraca a partir de uma string de versão (não expõe a versão em si). */
+export const weakEtag = (version: string) => `W/"${createHash('sha1').update(version).digest('base64url')}"`
+
+/** Confere o If-None-Match (lista separada por vírgulas, com ou sem W/) contra a ETag atual. */
+export function etagMatches(req: VercelRequest, etag: string) {
+  const header = req.headers['if-none-match']
+  if (typeof header !== 'string' || !header) return false
+  const bare = etag.replace(/^W\//, '')
+  return header.split(',').some(tag => {
+    const t = tag.trim()
+    return t === '*' || t.replace(/^W\//, '') === bare
+  })
+}
+
+/**
+ * Envia JSON comprimido com brotli ou gzip, conforme o Accept-Encoding.
+ * Qualidade 5 no brotli: quase a taxa do máximo (11) a uma fração do tempo de CPU.
+ */
+export async function sendJson(req: VercelRequest, res: VercelResponse, status: number, body: unknown) {
+  const payload = Buffer.from(JSON.stringify(body))
+  const accept = String(req.headers['accept-encoding'] || '')
+  res.setHeader('Content-Type', 'application/json; charset=utf-8')
+  res.setHeader('Vary', 'Accept-Encoding')
+
+  if (payload.length >= MIN_COMPRESS_SIZE && /\bbr\b/.test(accept)) {
+    const compressed = await brotli(payload, {
+      params: { [constants.BROTLI_PARAM_QUALITY]: 5, [constants.BROTLI_PARAM_SIZE_HINT]: payload.length }
+    })
+    res.setHeader('Content-Encoding', 'br')
+    res.status(status).send(compressed)
+    return
+  }
+  if (payload.length >= MIN_COMPRESS_SIZE && /\bgzip\b/.test(accept)) {
+    res.setHeader('Content-Encoding', 'gzip')
+    res.status(status).send(await gz(payload))
+    return
+  }
+  res.status(status).send(payload)
+}
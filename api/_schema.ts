@@ -0,0 +1,29 @@
+import { sql } from './_db.js'
+
+export type SchemaStatus = { tables_present: string[]; tables_missing: string[] }
+
+const EXPECTED = ['clientes', 'servicos', 'despesas', 'comissoes']
+
+// Guardado enquanto a instância da função estiver quente: o schema não muda
+// entre requisições, então só a primeira paga a consulta ao information_schema
+let cached: Promise<SchemaStatus> | null = null
+
+async function readSchema(): Promise<SchemaStatus> {
+  const tbls = await sql`SELECT table_name FROM information_schema.tables WHERE table_schema = 'public' AND table_name = ANY(${EXPECTED})` as { table_name: string }[]
+  const present = tbls.map(t => t.table_name)
+  return { tables_present: present, tables_missing: EXPECTED.filter(n => !present.includes(n)) }
+}
+
+export function checkSchema(): Promise<SchemaStatus> {
+  if (!cached) {
+    cached = readSchema().then(status => {
+      // Schema incompleto (ou erro) não fica em cache, para enxergar as tabelas assim que forem criadas
+      if (status.tables_missing.length > 0) cached = null
+      return status
+    }, err => {
+      cached = null
+      throw err
+    })
+  }
+  return cached
+}
@@ -0,0 +1,231 @@
+import { sql, withSavepoint, withTransaction } from './_db.js'
+
+export type ClienteInput = { id?: number | string; nome: string; telefone?: string; email?: string; endereco?: string; cpf?: string }
+export type ServicoInput = { id?: number | string; data_servico: string; veiculo: string; placa: string; valor_bruto: number | string; porcentagem_comissao: number | string; observacao: string; valor_pago: number | string; quitado: boolean; comissao_recebida: number | string; cliente_id: number | string }
+export type DespesaInput = { id?: number | string; descricao: string; valor: number | string; data_vencimento: string; pago: boolean }
+export type ComissaoInput = { id?: number | string; servico_id: number | string; valor: number | string; data_recebimento: string; status: string }
+
+export type ImportBody = {
+  clientes?: ClienteInput[]
+  servicos?: ServicoInput[]
+  despesas?: DespesaInput[]
+  comissoes?: ComissaoInput[]
+}
+
+export type RowError = { table: string; index: number; message: string }
+
+// Linhas por instrução: cada coluna vai como um array em um único parâmetro do unnest;
+// lotes limitados mantêm esses arrays (e a mensagem de cada query) pequenos e fazem
+// uma linha ruim refazer só o seu lote, linha a linha
+const BATCH_SIZE = 1000
+
+const parseNumber = (v: any) => {
+  const n = typeof v === 'string' ? Number(v) : v
+  return Number.isFinite(n) ? n : 0
+}
+
+const parseId = (v: any) => (typeof v === 'string' ? Number(v) : v)
+
+type Indexed<T> = { index: number; row: T }
+
+// Ids BIGINT chegam do cliente como texto ("42"); só dígitos contam como id real
+const realId = (id: unknown) =>
+  typeof id === 'number' ? id : typeof id === 'string' && /^\d+$/.test(id) ? Number(id) : undefined
+
+// Separa linhas com id (upsert) e sem id (insert). Ids repetidos ficam com a
+// última ocorrência, como aconteceria aplicando as linhas uma a uma.
+function partition<T extends { id?: number | string }>(rows: T[]) {
+  const withId = new Map<number, Indexed<T>>()
+  const withoutId: Indexed<T>[] = []
+  rows.forEach((row, index) => {
+    const id = realId(row.id)
+    if (id !== undefined) withId.set(id, { index, row: { ...row, id } })
+    else withoutId.push({ index, row })
+  })
+  return { withId: [...withId.values()], withoutId }
+}
+
+// Executa um lote em uma única instrução; se falhar, refaz linha a linha só
+// para descobrir quais registros têm problema e reportá-los com o índice original.
+// Cada tentativa roda num savepoint, então uma falha não invalida a transação.
+async function runBatched<T>(
+  table: string,
+  rows: Indexed<T>[],
+  bulk: (rows: T[]) => Promise<unknown>,
+  single: (row: T) => Promise<unknown>,
+  fallbackMessage: string,
+  errors: RowError[]
+) {
+  for (let start = 0; start < rows.length; start += BATCH_SIZE) {
+    const batch = rows.slice(start, start + BATCH_SIZE)
+    try {
+      await withSavepoint(() => bulk(batch.map(b => b.row)))
+    } catch {
+      for (const { index, row } of batch) {
+        try {
+          await withSavepoint(() => single(row))
+        } catch (e: any) {
+          errors.push({ table, index, message: e?.message || fallbackMessage })
+        }
+      }
+    }
+  }
+}
+
+const clienteValues = (c: ClienteInput) => [c.nome, c.telefone || '', c.email || '', c.endereco || '', c.cpf || ''] as const
+
+export async function upsertClientes(rows: ClienteInput[], errors: RowError[]) {
+  const { withId, withoutId } = partition(rows)
+  const upsert = async (batch: ClienteInput[]) => {
+    const cols = batch.map(clienteValues)
+    await sql`INSERT INTO public.clientes (id, nome, telefone, email, endereco, cpf)
+              SELECT * FROM unnest(
+                ${batch.map(c => c.id)}::bigint[], ${cols.map(v => v[0])}::text[], ${cols.map(v => v[1])}::text[],
+                ${cols.map(v => v[2])}::text[], ${cols.map(v => v[3])}::text[], ${cols.map(v => v[4])}::text[]
+              )
+              ON CONFLICT (id) DO UPDATE SET
+                nome = EXCLUDED.nome,
+                telefone = EXCLUDED.telefone,
+                email = EXCLUDED.email,
+                endereco = EXCLUDED.endereco,
+                cpf = EXCLUDED.cpf`
+  }
+  const insert = async (batch: ClienteInput[]) => {
+    const cols = batch.map(clienteValues)
+    await sql`INSERT INTO public.clientes (nome, telefone, email, endereco, cpf)
+              SELECT * FROM unnest(
+                ${cols.map(v => v[0])}::text[], ${cols.map(v => v[1])}::text[], ${cols.map(v => v[2])}::text[],
+                ${cols.map(v => v[3])}::text[], ${cols.map(v => v[4])}::text[]
+              )`
+  }
+  await runBatched('clientes', withId, upsert, c => upsert([c]), 'Erro ao inserir cliente', errors)
+  await runBatched('clientes', withoutId, insert, c => insert([c]), 'Erro ao inserir cliente', errors)
+}
+
+const servicoValues = (s: ServicoInput) => ({
+  data_servico: s.data_servico,
+  veiculo: s.veiculo,
+  placa: s.placa,
+  valor_bruto: parseNumber(s.valor_bruto),
+  porcentagem_comissao: parseNumber(s.porcentagem_comissao),
+  observacao: s.observacao,
+  valor_pago: parseNumber(s.valor_pago),
+  quitado: s.quitado,
+  comissao_recebida: parseNumber(s.comissao_recebida),
+  cliente_id: parseId(s.cliente_id)
+})
+
+export async function upsertServicos(rows: ServicoInput[], errors: RowError[]) {
+  const { withId, withoutId } = partition(rows)
+  const upsert = async (batch: ServicoInput[]) => {
+    const v = batch.map(servicoValues)
+    await sql`INSERT INTO public.servicos (
+                id, data_servico, veiculo, placa, valor_bruto, porcentagem_comissao,
+                observacao, valor_pago, quitado, comissao_recebida, cliente_id
+              )
+              SELECT * FROM unnest(
+                ${batch.map(s => s.id)}::bigint[], ${v.map(s => s.data_servico)}::date[], ${v.map(s => s.veiculo)}::text[],
+                ${v.map(s => s.placa)}::text[], ${v.map(s => s.valor_bruto)}::numeric[], ${v.map(s => s.porcentagem_comissao)}::numeric[],
+                ${v.map(s => s.observacao)}::text[], ${v.map(s => s.valor_pago)}::numeric[], ${v.map(s => s.quitado)}::boolean[],
+                ${v.map(s => s.comissao_recebida)}::numeric[], ${v.map(s => s.cliente_id)}::bigint[]
+              )
+              ON CONFLICT (id) DO UPDATE SET
+                data_servico = EXCLUDED.data_servico,
+                veiculo = EXCLUDED.veiculo,
+                placa = EXCLUDED.placa,
+                valor_bruto = EXCLUDED.valor_bruto,
+                porcentagem_comissao = EXCLUDED.porcentagem_comissao,
+                observacao = EXCLUDED.observacao,
+                valor_pago = EXCLUDED.valor_pago,
+                quitado = EXCLUDED.quitado,
+                comissao_recebida = EXCLUDED.comissao_recebida,
+                cliente_id = EXCLUDED.cliente_id`
+  }
+  const insert = async (batch: ServicoInput[]) => {
+    const v = batch.map(servicoValues)
+    await sql`INSERT INTO public.servicos (
+                data_servico, veiculo, placa, valor_bruto, porcentagem_comissao,
+                observacao, valor_pago, quitado, comissao_recebida, cliente_id
+              )
+              SELECT * FROM unnest(
+                ${v.map(s => s.data_servico)}::date[], ${v.map(s => s.veiculo)}::text[], ${v.map(s => s.placa)}::text[],
+                ${v.map(s => s.valor_bruto)}::numeric[], ${v.map(s => s.porcentagem_comissao)}::numeric[], ${v.map(s => s.observacao)}::text[],
+                ${v.map(s => s.valor_pago)}::numeric[], ${v.map(s => s.quitado)}::boolean[], ${v.map(s => s.comissao_recebida)}::numeric[],
+                ${v.map(s => s.cliente_id)}::bigint[]
+              )`
+  }
+  await runBatched('servicos', withId, upsert, s => upsert([s]), 'Erro ao inserir serviço', errors)
+  await runBatched('servicos', withoutId, insert, s => insert([s]), 'Erro ao inserir serviço', errors)
+}
+
+export async function upsertDespesas(rows: DespesaInput[], errors: RowError[]) {
+  const { withId, withoutId } = partition(rows)
+  const upsert = async (batch: DespesaInput[]) => {
+    await sql`INSERT INTO public.despesas (id, descricao, valor, data_vencimento, pago)
+              SELECT * FROM unnest(
+                ${batch.map(d => d.id)}::bigint[], ${batch.map(d => d.descricao)}::text[], ${batch.map(d => parseNumber(d.valor))}::numeric[],
+                ${batch.map(d => d.data_vencimento)}::date[], ${batch.map(d => d.pago)}::boolean[]
+              )
+              ON CONFLICT (id) DO UPDATE SET
+                descricao = EXCLUDED.descricao,
+                valor = EXCLUDED.valor,
+                data_vencimento = EXCLUDED.data_vencimento,
+                pago = EXCLUDED.pago`
+  }
+  const insert = async (batch: DespesaInput[]) => {
+    await sql`INSERT INTO public.despesas (descricao, valor, data_vencimento, pago)
+              SELECT * FROM unnest(
+                ${batch.map(d => d.descricao)}::text[], ${batch.map(d => parseNumber(d.valor))}::numeric[],
+                ${batch.map(d => d.data_vencimento)}::date[], ${batch.map(d => d.pago)}::boolean[]
+              )`
+  }
+  await runBatched('despesas', withId, upsert, d => upsert([d]), 'Erro ao inserir despesa', errors)
+  await runBatched('despesas', withoutId, insert, d => insert([d]), 'Erro ao inserir despesa', errors)
+}
+
+export async function upsertComissoes(rows: ComissaoInput[], errors: RowError[]) {
+  const { withId, withoutId } = partition(rows)
+  const upsert = async (batch: ComissaoInput[]) => {
+    await sql`INSERT INTO public.comissoes (id, servico_id, valor, data_recebimento, status)
+              SELECT * FROM unnest(
+                ${batch.map(c => c.id)}::bigint[], ${batch.map(c => parseId(c.servico_id))}::bigint[], ${batch.map(c => parseNumber(c.valor))}::numeric[],
+                ${batch.map(c => c.data_recebimento)}::date[], ${batch.map(c => c.status)}::text[]
+              )
+              ON CONFLICT (id) DO UPDATE SET
+                servico_id = EXCLUDED.servico_id,
+                valor = EXCLUDED.valor,
+                data_recebimento = EXCLUDED.data_recebimento,
+                status = EXCLUDED.status`
+  }
+  const insert = async (batch: ComissaoInput[]) => {
+    await sql`INSERT INTO public.comissoes (servico_id, valor, data_recebimento, status)
+              SELECT * FROM unnest(
+                ${batch.map(c => parseId(c.servico_id))}::bigint[], ${batch.map(c => parseNumber(c.valor))}::numeric[],
+                ${batch.map(c => c.data_recebimento)}::date[], ${batch.map(c => c.status)}::text[]
+              )`
+  }
+  await runBatched('comissoes', withId, upsert, c => upsert([c]), 'Erro ao inserir comissão', errors)
+  await runBatched('comissoes', withoutId, insert, c => insert([c]), 'Erro ao inserir comissão', errors)
+}
+
+// Realinha as sequências BIGSERIAL depois de inserir ids explícitos (uma única ida ao banco)
+export async function syncSequences() {
+  await sql`SELECT
+              setval(pg_get_serial_sequence('public.clientes','id'), COALESCE((SELECT MAX(id) FROM public.clientes), 1)),
+              setval(pg_get_serial_sequence('public.servicos','id'), COALESCE((SELECT MAX(id) FROM public.servicos), 1)),
+              setval(pg_get_serial_sequence('public.despesas','id'), COALESCE((SELECT MAX(id) FROM public.despesas), 1)),
+              setval(pg_get_serial_sequence('public.comissoes','id'), COALESCE((SELECT MAX(id) FROM public.comissoes), 1))`
+}
+
+// Uma transação numa única conexão do pool, em vez de uma requisição HTTP por instrução
+export function upsertAll(body: ImportBody): Promise<RowError[]> {
+  return withTransaction(async () => {
+    const errors: RowError[] = []
+    await upsertClientes(body?.clientes || [], errors)
+    await upsertServicos(body?.servicos || [], errors)
+    await upsertDespesas(body?.despesas || [], errors)
+    await upsertComissoes(body?.comissoes || [], errors)
+    await syncSequences()
+    return errors
+  })
+}
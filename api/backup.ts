@@ -0,0 +1,166 @@
+import type { VercelRequest, VercelResponse } from '@vercel/node'
+import { once } from 'node:events'
+import { createGzip } from 'node:zlib'
+import type { Writable } from 'node:stream'
+import { sql } from './_db.js'
+
+type Table = 'clientes' | 'servicos' | 'despesas' | 'comissoes'
+type Format = 'json' | 'ndjson'
+
+const TABLES: Table[] = ['clientes', 'servicos', 'despesas', 'comissoes']
+
+// Linhas serializadas por escrita no stream de saída
+const ROWS_PER_WRITE = 500
+
+// Mesmo formato que a interface usa (e que os backups antigos já traziam)
+const toCliente = (c: any) => ({
+  id: c.id,
+  nome: c.nome,
+  telefone: c.telefone || '',
+  email: c.email || '',
+  endereco: c.endereco || '',
+  cpf: c.cpf || '',
+  data_cadastro: c.created_at || ''
+})
+
+const toServico = (s: any, recebidaEm: Map<string, string>) => ({
+  id: s.id,
+  data_servico: s.data_servico,
+  veiculo: s.veiculo,
+  placa: s.placa,
+  valor_bruto: Number(s.valor_bruto),
+  porcentagem_comissao: Number(s.porcentagem_comissao),
+  observacao: s.observacao || '',
+  valor_pago: Number(s.valor_pago),
+  quitado: s.quitado,
+  comissao_recebida: Number(s.comissao_recebida),
+  cliente_id: s.cliente_id,
+  data_recebimento_comissao: recebidaEm.get(String(s.id))
+})
+
+const toDespesa = (d: any) => ({
+  id: d.id,
+  descricao: d.descricao,
+  valor: Number(d.valor),
+  data_vencimento: d.data_vencimento,
+  pago: d.pago
+})
+
+const toComissao = (c: any) => ({
+  id: c.id,
+  servico_id: c.servico_id,
+  valor: Number(c.valor),
+  data_recebimento: c.data_recebimento,
+  status: c.status,
+  created_at: c.created_at,
+  updated_at: c.updated_at
+})
+
+// Lê as quatro tabelas numa única transação REPEATABLE READ somente leitura:
+// todas enxergam o mesmo instante do banco, mesmo com gravações em paralelo.
+// to_jsonb devolve a linha inteira, então colunas opcionais ausentes em bancos
+// antigos (telefone, cpf...) não derrubam a leitura.
+async function readSnapshot() {
+  const [clientes, servicos, despesas, comissoes, meta] = await sql.transaction([
+    sql`SELECT to_jsonb(c) AS r FROM public.clientes c ORDER BY c.nome`,
+    sql`SELECT to_jsonb(s) AS r FROM public.servicos s ORDER BY s.data_servico DESC`,
+    sql`SELECT to_jsonb(d) AS r FROM public.despesas d ORDER BY d.data_vencimento DESC`,
+    sql`SELECT to_jsonb(c) AS r FROM public.comissoes c ORDER BY c.data_recebimento DESC`,
+    sql`SELECT now() AS snapshot_at`
+  ], { isolationMode: 'RepeatableRead', readOnly: true }) as any[][]
+
+  // Primeira comissão recebida de cada serviço, na mesma ordem usada pela interface
+  const recebidaEm = new Map<string, string>()
+  for (const { r } of comissoes) {
+    if (r.status === 'recebido' && !recebidaEm.has(String(r.servico_id))) recebidaEm.set(String(r.servico_id), r.data_recebimento)
+  }
+
+  const rows: Record<Table, any[]> = {
+    clientes: clientes.map(({ r }) => toCliente(r)),
+    servicos: servicos.map(({ r }) => toServico(r, recebidaEm)),
+    despesas: despesas.map(({ r }) => toDespesa(r)),
+    comissoes: comissoes.map(({ r }) => toComissao(r))
+  }
+  const metadata = {
+    exportDate: new Date(meta[0].snapshot_at).toISOString(),
+    version: '1.0',
+    totalClientes: rows.clientes.length,
+    totalServicos: rows.servicos.length,
+    totalDespesas: rows.despesas.length,
+    totalComissoes: rows.comissoes.length
+  }
+  return { rows, metadata }
+}
+
+// Escreve respeitando o backpressure do destino (gzip ou a própria resposta)
+async function write(out: Writable, chunk: string) {
+  if (!out.write(chunk)) await once(out, 'drain')
+}
+
+async function writeJson(out: Writable, { rows, metadata }: Awaited<ReturnType<typeof readSnapshot>>) {
+  await write(out, '{')
+  for (const table of TABLES) {
+    await write(out, `${JSON.stringify(table)}:[`)
+    const list = rows[table]
+    for (let start = 0; start < list.length; start += ROWS_PER_WRITE) {
+      const chunk = list.slice(start, start + ROWS_PER_WRITE).map(row => JSON.stringify(row)).join(',')
+      await write(out, start === 0 ? chunk : ',' + chunk)
+    }
+    await write(out, '],')
+  }
+  await write(out, `"metadata":${JSON.stringify(metadata)}}`)
+}
+
+// Mesmo formato do backup gerado no navegador (src/lib/backup-stream.ts)
+async function writeNdjson(out: Writable, { rows, metadata }: Awaited<ReturnType<typeof readSnapshot>>) {
+  await write(out, JSON.stringify({ type: 'header', format: 'backup-ndjson', version: 1, metadata }) + '\n')
+  for (const table of TABLES) {
+    const list = rows[table]
+    for (let start = 0; start < list.length; start += ROWS_PER_WRITE) {
+      const chunk = list.slice(start, start + ROWS_PER_WRITE).map(row => JSON.stringify({ table, row }) + '\n').join('')
+      await write(out, chunk)
+    }
+  }
+}
+
+export default async function handler(req: VercelRequest, res: VercelResponse) {
+  if (req.method !== 'GET') {
+    res.status(405).json({ error: 'Method not allowed' })
+    return
+  }
+
+  const format: Format = req.query.format === 'ndjson' ? 'ndjson' : 'json'
+
+  let snapshot
+  try {
+    snapshot = await readSnapshot()
+  } catch (e: any) {
+    res.status(500).json({ error: e?.message || 'Erro ao gerar backup' })
+    return
+  }
+
+  const day = snapshot.metadata.exportDate.split('T')[0]
+  res.setHeader('Content-Type', format === 'ndjson' ? 'application/x-ndjson; charset=utf-8' : 'application/json; charset=utf-8')
+  res.setHeader('Content-Disposition', `attachment; filename="backup-sistema-financeiro-${day}.${format}"`)
+  res.setHeader('Cache-Control', 'no-store')
+  res.setHeader('Vary', 'Accept-Encoding')
+
+  // O arquivo salvo continua sendo JSON puro: o navegador descompacta no download
+  const gzip = /\bgzip\b/.test(String(req.headers['accept-encoding'] || '')) ? createGzip() : null
+  if (gzip) {
+    res.setHeader('Content-Encoding', 'gzip')
+    gzip.pipe(res)
+  }
+  const out: Writable = gzip || res
+
+  try {
+    if (format === 'ndjson') await writeNdjson(out, snapshot)
+    else await writeJson(out, snapshot)
+  } catch (e) {
+    // Cabeçalhos já enviados: só resta interromper a resposta
+    console.error('Erro ao enviar backup:', e)
+    res.destroy(e as Error)
+    return
+  }
+  out.end()
+}
@@ -15,10 +15,26 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
       return
     }
 
-    await sql`DELETE FROM public.comissoes WHERE servico_id = ${servicoId} AND status = ${'recebido'}`
-    await sql`UPDATE public.servicos SET comissao_recebida = 0 WHERE id = ${servicoId}`
+    // DELETE num CTE roda junto com o UPDATE na mesma instrução (atômica);
+    // o Postgres executa o CTE mesmo que a consulta principal não o leia
+    const rows = await sql`
+      WITH removidas AS (
+        DELETE FROM public.comissoes WHERE servico_id = ${servicoId} AND status = ${'recebido'}
+        RETURNING id
+      )
+      UPDATE public.servicos
+      SET comissao_recebida = 0
+      WHERE id = ${servicoId}
+      RETURNING id, comissao_recebida, updated_at, (SELECT count(*) FROM removidas)::int AS removidas` as
+      { id: number; comissao_recebida: string | number; updated_at: string; removidas: number }[]
 
-    res.status(200).json({ ok: true })
+    if (rows.length === 0) {
+      res.status(404).json({ error: 'Serviço não encontrado' })
+      return
+    }
+
+    const { removidas, ...servico } = rows[0]
+    res.status(200).json({ ok: true, removidas, servico: { ...servico, comissao_recebida: Number(servico.comissao_recebida) } })
   } catch (e: any) {
     res.status(500).json({ error: e?.message || 'Erro ao desfazer comissão' })
   }
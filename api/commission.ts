@@ -17,10 +17,27 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
 
     const dataRecebimento = date || new Date().toISOString().slice(0, 10)
 
-    await sql`INSERT INTO public.comissoes (servico_id, valor, data_recebimento, status) VALUES (${servicoId}, ${amount}, ${dataRecebimento}, ${'recebido'})`
-    await sql`UPDATE public.servicos SET comissao_recebida = COALESCE(comissao_recebida, 0) + ${amount} WHERE id = ${servicoId}`
+    // Uma única instrução: o lançamento e o total do serviço são gravados
+    // juntos (ou nenhum dos dois), numa só ida ao banco
+    const rows = await sql`
+      WITH lancamento AS (
+        INSERT INTO public.comissoes (servico_id, valor, data_recebimento, status)
+        SELECT id, ${amount}, ${dataRecebimento}, ${'recebido'} FROM public.servicos WHERE id = ${servicoId}
+        RETURNING servico_id, valor
+      )
+      UPDATE public.servicos s
+      SET comissao_recebida = COALESCE(s.comissao_recebida, 0) + lancamento.valor
+      FROM lancamento
+      WHERE s.id = lancamento.servico_id
+      RETURNING s.id, s.comissao_recebida, s.updated_at` as { id: number; comissao_recebida: string | number; updated_at: string }[]
 
-    res.status(200).json({ ok: true, data_recebimento: dataRecebimento })
+    if (rows.length === 0) {
+      res.status(404).json({ error: 'Serviço não encontrado' })
+      return
+    }
+
+    const servico = { ...rows[0], comissao_recebida: Number(rows[0].comissao_recebida) }
+    res.status(200).json({ ok: true, data_recebimento: dataRecebimento, servico })
   } catch (e: any) {
     res.status(500).json({ error: e?.message || 'Erro ao receber comissão' })
   }
@@ -1,5 +1,143 @@
 import type { VercelRequest, VercelResponse } from '@vercel/node'
 import { sql } from './_db.js'
+import { checkSchema } from './_schema.js'
+import { etagMatches, sendJson, weakEtag } from './_http.js'
+import { toColumns } from './_columns.js'
+
+type Table = 'clientes' | 'servicos' | 'despesas' | 'comissoes'
+type Cursor = { ts: string | null; id: number | null }
+type Page = { rows: any[]; next: string | null }
+
+const TABLES: Table[] = ['clientes', 'servicos', 'despesas', 'comissoes']
+const MAX_LIMIT = 5000
+
+// Cursor opaco "<updated_at>|<id>"; o timestamp vem como texto do Postgres para
+// manter a precisão de microssegundos (Date do JS truncaria e repetiria linhas)
+const encodeCursor = (row: { updated_at: string; id: number | string }) => `${row.updated_at}|${row.id}`
+
+function decodeCursor(value: unknown): Cursor {
+  if (typeof value !== 'string' || !value.includes('|')) return { ts: null, id: null }
+  const sep = value.lastIndexOf('|')
+  const id = Number(value.slice(sep + 1))
+  return { ts: value.slice(0, sep), id: Number.isFinite(id) ? id : null }
+}
+
+async function readClientes(since: string | null, after: Cursor, limit: number) {
+  try {
+    return await sql`SELECT id, nome, created_at, telefone, email, endereco, cpf, updated_at::text AS updated_at
+                     FROM public.clientes
+                     WHERE (${since}::timestamptz IS NULL OR updated_at > ${since}::timestamptz)
+                       AND (${after.ts}::timestamptz IS NULL OR (updated_at, id) > (${after.ts}::timestamptz, ${after.id}::bigint))
+                     ORDER BY updated_at, id
+                     LIMIT ${limit}`
+  } catch (err) {
+    return await sql`SELECT id, nome, created_at, updated_at::text AS updated_at
+                     FROM public.clientes
+                     WHERE (${since}::timestamptz IS NULL OR updated_at > ${since}::timestamptz)
+                       AND (${after.ts}::timestamptz IS NULL OR (updated_at, id) > (${after.ts}::timestamptz, ${after.id}::bigint))
+                     ORDER BY updated_at, id
+                     LIMIT ${limit}`
+  }
+}
+
+const readers: Record<Table, (since: string | null, after: Cursor, limit: number) => Promise<any[]>> = {
+  clientes: readClientes,
+  servicos: (since, after, limit) => sql`
+    SELECT id, data_servico, veiculo, placa, valor_bruto, porcentagem_comissao, observacao, valor_pago, quitado, comissao_recebida, cliente_id,
+           updated_at::text AS updated_at
+    FROM public.servicos
+    WHERE (${since}::timestamptz IS NULL OR updated_at > ${since}::timestamptz)
+      AND (${after.ts}::timestamptz IS NULL OR (updated_at, id) > (${after.ts}::timestamptz, ${after.id}::bigint))
+    ORDER BY updated_at, id
+    LIMIT ${limit}`,
+  despesas: (since, after, limit) => sql`
+    SELECT id, descricao, valor, data_vencimento, pago, updated_at::text AS updated_at
+    FROM public.despesas
+    WHERE (${since}::timestamptz IS NULL OR updated_at > ${since}::timestamptz)
+      AND (${after.ts}::timestamptz IS NULL OR (updated_at, id) > (${after.ts}::timestamptz, ${after.id}::bigint))
+    ORDER BY updated_at, id
+    LIMIT ${limit}`,
+  comissoes: (since, after, limit) => sql`
+    SELECT id, servico_id, valor, data_recebimento, status, created_at, updated_at::text AS updated_at
+    FROM public.comissoes
+    WHERE (${since}::timestamptz IS NULL OR updated_at > ${since}::timestamptz)
+      AND (${after.ts}::timestamptz IS NULL OR (updated_at, id) > (${after.ts}::timestamptz, ${after.id}::bigint))
+    ORDER BY updated_at, id
+    LIMIT ${limit}`
+}
+
+async function readPage(table: Table, since: string | null, after: Cursor, limit: number): Promise<Page> {
+  // Busca uma linha a mais só para saber se existe próxima página
+  const rows = await readers[table](since, after, limit + 1)
+  const hasMore = rows.length > limit
+  const page = hasMore ? rows.slice(0, limit) : rows
+  return { rows: page, next: hasMore ? encodeCursor(page[page.length - 1]) : null }
+}
+
+async function readDeleted(since: string) {
+  const rows = await sql`SELECT table_name, row_id FROM public.deleted_rows WHERE deleted_at > ${since}::timestamptz` as { table_name: Table; row_id: string | number }[]
+  const deleted: Record<Table, number[]> = { clientes: [], servicos: [], despesas: [], comissoes: [] }
+  for (const r of rows) deleted[r.table_name]?.push(Number(r.row_id))
+  return deleted
+}
+
+async function readAllClientes() {
+  try {
+    return await sql`SELECT id, nome, created_at, telefone, email, endereco, cpf FROM public.clientes ORDER BY nome`
+  } catch (err) {
+    return await sql`SELECT id, nome, created_at FROM public.clientes ORDER BY nome`
+  }
+}
+
+// Versão do conjunto de dados: uma linha de public.dataset_version, incrementada
+// por trigger a cada instrução que grava nas quatro tabelas (neon_init.sql).
+// Sem a migração aplicada, cai nos max(updated_at)/max(deleted_at) indexados.
+async function datasetVersion() {
+  try {
+    const [{ version }] = await sql<{ version: string }>`SELECT version::text AS version FROM public.dataset_version`
+    return version
+  } catch (err) {
+    const [{ version }] = await sql<{ version: string }>`
+      SELECT concat_ws('|',
+        (SELECT max(updated_at)::text FROM public.clientes),
+        (SELECT max(updated_at)::text FROM public.servicos),
+        (SELECT max(updated_at)::text FROM public.despesas),
+        (SELECT max(updated_at)::text FROM public.comissoes),
+        (SELECT max(deleted_at)::text FROM public.deleted_rows)
+      ) AS version`
+    return version
+  }
+}
+
+/**
+ * ETag da carga (completa ou primeira página) para a versão dos dados.
+ * Quem chama lê a versão antes de começar a ler as tabelas: se algo mudar no
+ * meio, a ETag fica "velha" e a próxima carga vem de novo, nunca o contrário.
+ * Responde 304 e devolve null quando o cliente já tem essa versão.
+ */
+function conditional(req: VercelRequest, res: VercelResponse, variant: string, version: string) {
+  const etag = weakEtag(`${version}#${variant}`)
+  res.setHeader('ETag', etag)
+  res.setHeader('Cache-Control', 'private, no-cache')
+  if (etagMatches(req, etag)) {
+    res.status(304).end()
+    return null
+  }
+  return etag
+}
+
+async function handleFull(req: VercelRequest, res: VercelResponse) {
+  if (conditional(req, res, 'full', await datasetVersion()) === null) return
+
+  const [clientes, servicos, despesas, comissoes] = await Promise.all([
+    readAllClientes(),
+    sql`SELECT id, data_servico, veiculo, placa, valor_bruto, porcentagem_comissao, observacao, valor_pago, quitado, comissao_recebida, cliente_id FROM public.servicos ORDER BY data_servico DESC`,
+    sql`SELECT id, descricao, valor, data_vencimento, pago FROM public.despesas ORDER BY data_vencimento DESC`,
+    sql`SELECT id, servico_id, valor, data_recebimento, status, created_at, updated_at FROM public.comissoes ORDER BY data_recebimento DESC`
+  ])
+
+  await sendJson(req, res, 200, { clientes, servicos, despesas, comissoes })
+}
 
 export default async function handler(req: VercelRequest, res: VercelResponse) {
   if (req.method !== 'GET') {
@@ -8,18 +146,82 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
   }
 
   try {
-    let clientes;
+    const { since, table, after, limit, format } = req.query
+    const paged = since !== undefined || table !== undefined || limit !== undefined
+    if (!paged) {
+      await handleFull(req, res)
+      return
+    }
+
+    if (table !== undefined && !TABLES.includes(table as Table)) {
+      res.status(400).json({ error: 'Invalid table' })
+      return
+    }
+    const sinceTs = typeof since === 'string' && since ? since : null
+    const pageSize = Math.min(MAX_LIMIT, Math.max(1, Number(limit) || 1000))
+    // Formato colunar opcional (api/_columns.ts); sem ele, arrays de objetos como antes
+    const columnar = format === 'columns'
+    const encode = (t: Table, rows: any[]) => columnar ? toColumns(t, rows) : rows
+    const variant = `page:${pageSize}:${columnar ? 'columns' : 'rows'}`
+
+    // Marca d'água para o próximo "since". updated_at vem de now(), que é o
+    // início da transação que gravou a linha: imports e syncs rodam numa
+    // transação só e podem confirmar bem depois. Por isso a marca não passa do
+    // início da transação aberta mais antiga, com folga de alguns segundos para
+    // as que começarem durante as leituras abaixo (em paralelo com ela); linhas
+    // repetidas são inofensivas porque o cliente mescla por id.
+    const watermark = () => sql`
+      SELECT (LEAST(now(), (SELECT min(xact_start) FROM pg_stat_activity WHERE datname = current_database()))
+              - interval '5 seconds')::text AS server_time`
+      .then(rows => (rows as { server_time: string }[])[0].server_time)
+
+    if (table !== undefined) {
+      const [page, server_time] = await Promise.all([
+        readPage(table as Table, sinceTs, decodeCursor(after), pageSize),
+        watermark()
+      ])
+      await sendJson(req, res, 200, { [table as string]: encode(table as Table, page.rows), next: { [table as string]: page.next }, serverTime: server_time })
+      return
+    }
+
+    let schema: ReturnType<typeof checkSchema> | undefined
+    let loaded
     try {
-      clientes = await sql`SELECT id, nome, created_at, telefone, email, endereco, cpf FROM public.clientes ORDER BY nome`
+      // A versão é lida (e conferida contra o If-None-Match) antes das tabelas,
+      // que usam outras conexões do pool; com o snapshot do cliente em dia a
+      // resposta é um 304 vazio, sem ler as tabelas
+      if (conditional(req, res, variant, await datasetVersion()) === null) return
+
+      // Primeira página = carga inicial do app: status do schema (em cache na
+      // instância quente), marca d'água, as quatro tabelas e as exclusões saem
+      // juntos numa única ida ao servidor, sem um /api/health antes
+      schema = checkSchema()
+      loaded = await Promise.all([
+        watermark(),
+        Promise.all(TABLES.map(t => readPage(t, sinceTs, { ts: null, id: null }, pageSize))),
+        sinceTs ? readDeleted(sinceTs) : undefined,
+        schema
+      ])
     } catch (err) {
-      clientes = await sql`SELECT id, nome, created_at FROM public.clientes ORDER BY nome`
+      // Tabela ausente: responde com o diagnóstico em vez do erro cru do Postgres
+      const status = await (schema ?? checkSchema()).catch(() => null)
+      if (status && status.tables_missing.length > 0) {
+        res.status(503).json({ ready: false, ...status, error: 'Tabelas ausentes no banco' })
+        return
+      }
+      throw err
     }
-    const servicos = await sql`SELECT id, data_servico, veiculo, placa, valor_bruto, porcentagem_comissao, observacao, valor_pago, quitado, comissao_recebida, cliente_id FROM public.servicos ORDER BY data_servico DESC`
-    const despesas = await sql`SELECT id, descricao, valor, data_vencimento, pago FROM public.despesas ORDER BY data_vencimento DESC`
-    const comissoes = await sql`SELECT id, servico_id, valor, data_recebimento, status, created_at, updated_at FROM public.comissoes ORDER BY data_recebimento DESC`
+    const [server_time, pages, deleted] = loaded
+
+    const body: Record<string, any> = { ready: true, next: {}, serverTime: server_time }
+    TABLES.forEach((t, i) => {
+      body[t] = encode(t, pages[i].rows)
+      body.next[t] = pages[i].next
+    })
+    if (deleted) body.deleted = deleted
 
-    res.status(200).json({ clientes, servicos, despesas, comissoes })
+    await sendJson(req, res, 200, body)
   } catch (e: any) {
     res.status(500).json({ error: e?.message || 'Erro ao carregar dados' })
   }
-}
\ No newline at end of file
+}
@@ -1,5 +1,12 @@
 import type { VercelRequest, VercelResponse } from '@vercel/node'
-import { sql } from './_db.js'
+import { sql, withTransaction } from './_db.js'
+import { upsertAll, type ImportBody, type RowError } from './_upsert.js'
+
+// Chaves de lotes concluídos ficam guardadas por alguns dias, o bastante para retomar uma restauração
+const KEY_RETENTION = '7 days'
+
+const rowCount = (body: ImportBody) =>
+  (body?.clientes?.length || 0) + (body?.servicos?.length || 0) + (body?.despesas?.length || 0) + (body?.comissoes?.length || 0)
 
 export default async function handler(req: VercelRequest, res: VercelResponse) {
   if (req.method !== 'POST') {
@@ -8,139 +15,45 @@ export default async function handler(req: VercelRequest, res: VercelResponse) {
   }
 
   try {
-    type Body = {
-      clientes?: { id?: number; nome: string; telefone?: string; email?: string; endereco?: string; cpf?: string }[]
-      servicos?: { id?: number; data_servico: string; veiculo: string; placa: string; valor_bruto: number | string; porcentagem_comissao: number | string; observacao: string; valor_pago: number | string; quitado: boolean; comissao_recebida: number | string; cliente_id: number | string }[]
-      despesas?: { id?: number; descricao: string; valor: number | string; data_vencimento: string; pago: boolean }[]
-      comissoes?: { id?: number; servico_id: number | string; valor: number | string; data_recebimento: string; status: string }[]
-    }
-    const body = req.body as Body
-    const clientes = body?.clientes || []
-    const servicos = body?.servicos || []
-    const despesas = body?.despesas || []
-    const comissoes = body?.comissoes || []
-
-    const errors: { table: string; index: number; message: string }[] = []
-
-    for (let i = 0; i < clientes.length; i++) {
-      const c = clientes[i]
-      try {
-        if (typeof c.id === 'number') {
-          await sql`INSERT INTO public.clientes (id, nome, telefone, email, endereco, cpf)
-                    VALUES (${c.id}, ${c.nome}, ${c.telefone || ''}, ${c.email || ''}, ${c.endereco || ''}, ${c.cpf || ''})
-                    ON CONFLICT (id) DO UPDATE SET 
-                      nome = EXCLUDED.nome,
-                      telefone = EXCLUDED.telefone,
-                      email = EXCLUDED.email,
-                      endereco = EXCLUDED.endereco,
-                      cpf = EXCLUDED.cpf`
-        } else {
-          await sql`INSERT INTO public.clientes (nome, telefone, email, endereco, cpf) 
-                    VALUES (${c.nome}, ${c.telefone || ''}, ${c.email || ''}, ${c.endereco || ''}, ${c.cpf || ''})`
-        }
-      } catch (e: any) {
-        errors.push({ table: 'clientes', index: i, message: e?.message || 'Erro ao inserir cliente' })
-      }
-    }
-
-    for (let i = 0; i < servicos.length; i++) {
-      const s = servicos[i]
-      try {
-        const parseNumber = (v: any) => {
-          const n = typeof v === 'string' ? Number(v) : v
-          return Number.isFinite(n) ? n : 0
+    // Lotes numerados do ImportDialog trazem uma chave; sem ela o import segue como antes
+    const header = req.headers['idempotency-key']
+    const key = typeof header === 'string' && header ? header.slice(0, 200) : null
+
+    const body = req.body as ImportBody
+    // A chave é reservada na mesma transação que grava as linhas: uma segunda
+    // tentativa simultânea do mesmo lote espera no INSERT da chave e, quando a
+    // primeira confirma, não reserva nada e só devolve o resultado gravado.
+    // Se a transação falhar, chave e linhas somem juntas e o lote pode ser refeito.
+    const outcome = await withTransaction(async () => {
+      if (key) {
+        const claimed = await sql`WITH purge AS (
+                                    DELETE FROM public.import_chunks WHERE completed_at < now() - ${KEY_RETENTION}::interval
+                                  )
+                                  INSERT INTO public.import_chunks (idempotency_key, row_count)
+                                  VALUES (${key}, ${rowCount(body)})
+                                  ON CONFLICT (idempotency_key) DO NOTHING
+                                  RETURNING idempotency_key`
+        if (claimed.length === 0) {
+          const done = await sql`SELECT errors FROM public.import_chunks WHERE idempotency_key = ${key}` as { errors: RowError[] }[]
+          return { errors: done[0]?.errors ?? [], skipped: true }
         }
-        const valorBruto = parseNumber(s.valor_bruto)
-        const porcentagem = parseNumber(s.porcentagem_comissao)
-        const valorPago = parseNumber(s.valor_pago)
-        const comissaoRecebida = parseNumber(s.comissao_recebida)
-        const clienteId = typeof s.cliente_id === 'string' ? Number(s.cliente_id) : s.cliente_id
-
-        if (typeof s.id === 'number') {
-          await sql`INSERT INTO public.servicos (
-                      id, data_servico, veiculo, placa, valor_bruto, porcentagem_comissao,
-                      observacao, valor_pago, quitado, comissao_recebida, cliente_id
-                    ) VALUES (
-                      ${s.id}, ${s.data_servico}, ${s.veiculo}, ${s.placa}, ${valorBruto}, ${porcentagem},
-                      ${s.observacao}, ${valorPago}, ${s.quitado}, ${comissaoRecebida}, ${clienteId}
-                    )
-                    ON CONFLICT (id) DO UPDATE SET
-                      data_servico = EXCLUDED.data_servico,
-                      veiculo = EXCLUDED.veiculo,
-                      placa = EXCLUDED.placa,
-                      valor_bruto = EXCLUDED.valor_bruto,
-                      porcentagem_comissao = EXCLUDED.porcentagem_comissao,
-                      observacao = EXCLUDED.observacao,
-                      valor_pago = EXCLUDED.valor_pago,
-                      quitado = EXCLUDED.quitado,
-                      comissao_recebida = EXCLUDED.comissao_recebida,
-                      cliente_id = EXCLUDED.cliente_id`
-        } else {
-          await sql`INSERT INTO public.servicos (
-                      data_servico, veiculo, placa, valor_bruto, porcentagem_comissao,
-                      observacao, valor_pago, quitado, comissao_recebida, cliente_id
-                    ) VALUES (
-                      ${s.data_servico}, ${s.veiculo}, ${s.placa}, ${valorBruto}, ${porcentagem},
-                      ${s.observacao}, ${valorPago}, ${s.quitado}, ${comissaoRecebida}, ${clienteId}
-                    )`
-        }
-      } catch (e: any) {
-        errors.push({ table: 'servicos', index: i, message: e?.message || 'Erro ao inserir serviço' })
       }
-    }
 
-    for (let i = 0; i < despesas.length; i++) {
-      const d = despesas[i]
-      try {
-        const valor = typeof d.valor === 'string' ? Number(d.valor) : d.valor
-        const parsedValor = Number.isFinite(valor) ? valor : 0
-        if (typeof d.id === 'number') {
-          await sql`INSERT INTO public.despesas (id, descricao, valor, data_vencimento, pago)
-                    VALUES (${d.id}, ${d.descricao}, ${parsedValor}, ${d.data_vencimento}, ${d.pago})
-                    ON CONFLICT (id) DO UPDATE SET
-                      descricao = EXCLUDED.descricao,
-                      valor = EXCLUDED.valor,
-                      data_vencimento = EXCLUDED.data_vencimento,
-                      pago = EXCLUDED.pago`
-        } else {
-          await sql`INSERT INTO public.despesas (descricao, valor, data_vencimento, pago)
-                    VALUES (${d.descricao}, ${parsedValor}, ${d.data_vencimento}, ${d.pago})`
-        }
-      } catch (e: any) {
-        errors.push({ table: 'despesas', index: i, message: e?.message || 'Erro ao inserir despesa' })
+      const errors = await upsertAll(body)
+      if (key) {
+        await sql`UPDATE public.import_chunks SET errors = ${JSON.stringify(errors)}::jsonb, completed_at = now()
+                  WHERE idempotency_key = ${key}`
       }
-    }
+      return { errors, skipped: false }
+    })
 
-    for (let i = 0; i < comissoes.length; i++) {
-      const c = comissoes[i]
-      try {
-        const valor = typeof c.valor === 'string' ? Number(c.valor) : c.valor
-        const parsedValor = Number.isFinite(valor) ? valor : 0
-        const servicoId = typeof c.servico_id === 'string' ? Number(c.servico_id) : c.servico_id
-        if (typeof c.id === 'number') {
-          await sql`INSERT INTO public.comissoes (id, servico_id, valor, data_recebimento, status)
-                    VALUES (${c.id}, ${servicoId}, ${parsedValor}, ${c.data_recebimento}, ${c.status})
-                    ON CONFLICT (id) DO UPDATE SET
-                      servico_id = EXCLUDED.servico_id,
-                      valor = EXCLUDED.valor,
-                      data_recebimento = EXCLUDED.data_recebimento,
-                      status = EXCLUDED.status`
-        } else {
-          await sql`INSERT INTO public.comissoes (servico_id, valor, data_recebimento, status)
-                    VALUES (${servicoId}, ${parsedValor}, ${c.data_recebimento}, ${c.status})`
-        }
-      } catch (e: any) {
-        errors.push({ table: 'comissoes', index: i, message: e?.message || 'Erro ao inserir comissão' })
-      }
+    if (outcome.skipped) {
+      res.status(200).json({ ok: outcome.errors.length === 0, errors: outcome.errors, skipped: true })
+      return
     }
-
-    await sql`SELECT setval(pg_get_serial_sequence('public.clientes','id'), COALESCE((SELECT MAX(id) FROM public.clientes), 1))`
-    await sql`SELECT setval(pg_get_serial_sequence('public.servicos','id'), COALESCE((SELECT MAX(id) FROM public.servicos), 1))`
-    await sql`SELECT setval(pg_get_serial_sequence('public.despesas','id'), COALESCE((SELECT MAX(id) FROM public.despesas), 1))`
-    await sql`SELECT setval(pg_get_serial_sequence('public.comissoes','id'), COALESCE((SELECT MAX(id) FROM public.comissoes), 1))`
-
+    const { errors } = outcome
     res.status(200).json({ ok: errors.length === 0, errors })
   } catch (e: any) {
     res.status(500).json({ error: e?.message || 'Erro ao importar dados' })
   }
-}
\ No newline at end of file
+}
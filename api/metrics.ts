@@ -0,0 +1,100 @@
+import type { VercelRequest, VercelResponse } from '@vercel/node'
+import { sql } from './_db.js'
+
+type MetricsRow = {
+  total_clientes: number
+  total_servicos: number
+  total_faturado: number
+  total_comissoes_recebidas: number
+  total_comissoes_calculadas: number
+  total_despesas: number
+  despesas_pagas: number
+  qtd_despesas_pagas: number
+  qtd_despesas_pendentes: number
+  servicos_recentes: {
+    id: number
+    data_servico: string
+    veiculo: string
+    placa: string
+    valor_bruto: number
+    porcentagem_comissao: number
+    cliente_id: number | null
+    cliente_nome: string | null
+  }[] | null
+}
+
+// Valores em dinheiro saem em centavos inteiros (float8 representa inteiros
+// exatos até 2^53), como o cliente guarda; a comissão é arredondada por
+// serviço, igual a commissionCents em src/lib/money.ts
+export default async function handler(req: VercelRequest, res: VercelResponse) {
+  if (req.method !== 'GET') {
+    res.status(405).json({ error: 'Method not allowed' })
+    return
+  }
+
+  try {
+    // Período opcional (YYYY-MM-DD); filtra por data_servico e data_vencimento usando os índices dessas colunas
+    const from = typeof req.query.from === 'string' && req.query.from ? req.query.from : null
+    const to = typeof req.query.to === 'string' && req.query.to ? req.query.to : null
+
+    const rows = await sql`
+      WITH s AS (
+        SELECT
+          count(*)::int AS total_servicos,
+          COALESCE(sum(valor_bruto) * 100, 0)::float8 AS total_faturado,
+          COALESCE(sum(comissao_recebida) * 100, 0)::float8 AS total_comissoes_recebidas,
+          COALESCE(sum(round(valor_bruto * porcentagem_comissao)), 0)::float8 AS total_comissoes_calculadas
+        FROM public.servicos
+        WHERE (${from}::date IS NULL OR data_servico >= ${from}::date)
+          AND (${to}::date IS NULL OR data_servico <= ${to}::date)
+      ), d AS (
+        SELECT
+          COALESCE(sum(valor) * 100, 0)::float8 AS total_despesas,
+          COALESCE(sum(valor) FILTER (WHERE pago) * 100, 0)::float8 AS despesas_pagas,
+          count(*) FILTER (WHERE pago)::int AS qtd_despesas_pagas,
+          count(*) FILTER (WHERE NOT COALESCE(pago, false))::int AS qtd_despesas_pendentes
+        FROM public.despesas
+        WHERE (${from}::date IS NULL OR data_vencimento >= ${from}::date)
+          AND (${to}::date IS NULL OR data_vencimento <= ${to}::date)
+      )
+      SELECT
+        (SELECT count(*)::int FROM public.clientes) AS total_clientes,
+        s.*, d.*,
+        (
+          SELECT json_agg(r ORDER BY r.data_servico DESC, r.id DESC)
+          FROM (
+            SELECT sv.id, sv.data_servico::text AS data_servico, sv.veiculo, sv.placa,
+                   (sv.valor_bruto * 100)::float8 AS valor_bruto, sv.porcentagem_comissao::float8 AS porcentagem_comissao,
+                   sv.cliente_id, c.nome AS cliente_nome
+            FROM public.servicos sv
+            LEFT JOIN public.clientes c ON c.id = sv.cliente_id
+            WHERE (${from}::date IS NULL OR sv.data_servico >= ${from}::date)
+              AND (${to}::date IS NULL OR sv.data_servico <= ${to}::date)
+            ORDER BY sv.data_servico DESC, sv.id DESC
+            LIMIT 5
+          ) r
+        ) AS servicos_recentes
+      FROM s, d` as MetricsRow[]
+
+    const m = rows[0]
+    const valorAReceber = m.total_comissoes_calculadas - m.total_comissoes_recebidas
+
+    res.status(200).json({
+      totalClientes: m.total_clientes,
+      totalServicos: m.total_servicos,
+      totalFaturado: m.total_faturado,
+      totalComissoesRecebidas: m.total_comissoes_recebidas,
+      totalComissoesCalculadas: m.total_comissoes_calculadas,
+      valorAReceber,
+      totalDespesas: m.total_despesas,
+      despesasPagas: m.despesas_pagas,
+      despesasPendentes: m.total_despesas - m.despesas_pagas,
+      qtdDespesasPagas: m.qtd_despesas_pagas,
+      qtdDespesasPendentes: m.qtd_despesas_pendentes,
+      lucroLiquido: m.total_comissoes_recebidas - m.despesas_pagas,
+      servicosRecentes: m.servicos_recentes || []
+    })
+  } catch (e: any) {
+    res.status(500).json({ error: e?.message || 'Erro ao calcular métricas' })
+  }
+}
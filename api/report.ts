@@ -0,0 +1,57 @@
+import type { VercelRequest, VercelResponse } from '@vercel/node'
+import { sql } from './_db.js'
+
+type RollupRow = {
+  month: string
+  servicos_count: number
+  valor_faturado: string
+  comissao_prevista: string
+  comissao_recebida: string
+  recebimentos: string
+  despesas_pagas: string
+  despesas_pendentes: string
+}
+
+// DECIMAL chega como texto ("123.45")
+const toCents = (value: string) => Math.round(Number(value) * 100)
+
+// Aceita YYYY-MM ou YYYY-MM-DD; devolve o primeiro dia do mês
+const parseMonth = (value: unknown) =>
+  typeof value === 'string' && /^\d{4}-\d{2}(-\d{2})?$/.test(value) ? `${value.slice(0, 7)}-01` : null
+
+export default async function handler(req: VercelRequest, res: VercelResponse) {
+  if (req.method !== 'GET') {
+    res.status(405).json({ error: 'Method not allowed' })
+    return
+  }
+
+  try {
+    // Lê só a tabela monthly_rollup (mantida por triggers): custo proporcional ao número de meses
+    const from = parseMonth(req.query.from)
+    const to = parseMonth(req.query.to)
+
+    const rows = await sql`
+      SELECT to_char(month, 'YYYY-MM') AS month, servicos_count, valor_faturado, comissao_prevista,
+             comissao_recebida, recebimentos, despesas_pagas, despesas_pendentes
+      FROM public.monthly_rollup
+      WHERE (${from}::date IS NULL OR month >= ${from}::date)
+        AND (${to}::date IS NULL OR month <= ${to}::date)
+      ORDER BY month` as RollupRow[]
+
+    // Valores em centavos inteiros, como o cliente guarda dinheiro (src/lib/money.ts)
+    const months = rows.map(r => ({
+      month: r.month,
+      servicos: Number(r.servicos_count),
+      valorFaturado: toCents(r.valor_faturado),
+      comissaoPrevista: toCents(r.comissao_prevista),
+      comissaoRecebida: toCents(r.comissao_recebida),
+      recebimentos: toCents(r.recebimentos),
+      despesasPagas: toCents(r.despesas_pagas),
+      despesasPendentes: toCents(r.despesas_pendentes)
+    }))
+
+    res.status(200).json({ months })
+  } catch (e: any) {
+    res.status(500).json({ error: e?.message || 'Erro ao carregar resumo mensal' })
+  }
+}
@@ -0,0 +1,121 @@
+import type { VercelRequest, VercelResponse } from '@vercel/node'
+import { sql, withTransaction } from './_db.js'
+import {
+  upsertClientes, upsertServicos, upsertDespesas, upsertComissoes,
+  type ClienteInput, type ServicoInput, type DespesaInput, type ComissaoInput, type RowError
+} from './_upsert.js'
+
+type TableChanges<T> = {
+  inserted?: (Omit<T, 'id'> & { id?: number | string })[]
+  updated?: T[]
+  deleted?: (number | string)[]
+}
+
+type Changeset = {
+  clientes?: TableChanges<ClienteInput>
+  servicos?: TableChanges<ServicoInput>
+  despesas?: TableChanges<DespesaInput>
+  comissoes?: TableChanges<ComissaoInput>
+}
+
+type Table = keyof Changeset
+type IdMap = Record<string, number>
+
+// Erro de uma linha do changeset, identificada como o cliente a conhece: tabela,
+// lista de origem (inserted/updated) e o id que ele enviou (temporário nas inclusões)
+type SyncError = { table: Table; kind: 'inserted' | 'updated'; id: number | string | null; message: string }
+
+const TABLES: Table[] = ['clientes', 'servicos', 'despesas', 'comissoes']
+
+const numericIds = (ids: (number | string)[] = []) =>
+  ids.map(id => (typeof id === 'string' ? Number(id) : id)).filter(id => Number.isFinite(id))
+
+// Reserva ids reais da sequência para as linhas novas (ids temporários do cliente),
+// assim o upsert grava com id explícito e o cliente recebe o mapeamento temp -> real.
+async function allocateIds(table: Table, count: number): Promise<number[]> {
+  if (count === 0) return []
+  const rows = await sql`SELECT nextval(pg_get_serial_sequence(${'public.' + table}, 'id'))::bigint AS id
+                         FROM generate_series(1, ${count})` as { id: string | number }[]
+  return rows.map(r => Number(r.id))
+}
+
+const remap = (value: number | string, ids: IdMap) =>
+  typeof value === 'string' && value in ids ? ids[value] : value
+
+export default async function handler(req: VercelRequest, res: VercelResponse) {
+  if (req.method !== 'POST') {
+    res.status(405).json({ error: 'Method not allowed' })
+    return
+  }
+
+  try {
+    const body = (req.body || {}) as Changeset
+    const errors: SyncError[] = []
+    const ids: Record<Table, IdMap> = { clientes: {}, servicos: {}, despesas: {}, comissoes: {} }
+
+    // Todo o changeset numa transação e numa única conexão; linhas com erro são
+    // isoladas em savepoints e voltam em "errors", as demais são confirmadas
+    await withTransaction(async () => {
+      for (const table of TABLES) {
+        const inserted = body[table]?.inserted || []
+        const real = await allocateIds(table, inserted.length)
+        inserted.forEach((row, i) => {
+          ids[table][String(row.id ?? `#${i}`)] = real[i]
+        })
+      }
+
+      const withRealId = <T extends { id?: number | string }>(table: Table, rows: T[] = []) =>
+        rows.map((row, i) => ({ ...row, id: ids[table][String(row.id ?? `#${i}`)] }))
+
+      // Os upserts recebem inserted + updated concatenados; o índice do erro volta
+      // para a linha que o cliente enviou. Inclusões que falharam saem de "ids"
+      // (o id reservado não existe no banco) e as referências a elas continuam
+      // temporárias, falhando também nas tabelas filhas.
+      const upsert = async <T>(table: Table, rows: T[], run: (rows: T[], errors: RowError[]) => Promise<void>) => {
+        const inserted = body[table]?.inserted || []
+        const updated = body[table]?.updated || []
+        const rowErrors: RowError[] = []
+        await run(rows, rowErrors)
+        for (const { index, message } of rowErrors) {
+          if (index < inserted.length) {
+            const clientId = inserted[index].id ?? `#${index}`
+            delete ids[table][String(clientId)]
+            errors.push({ table, kind: 'inserted', id: inserted[index].id ?? null, message })
+          } else {
+            errors.push({ table, kind: 'updated', id: updated[index - inserted.length]?.id ?? null, message })
+          }
+        }
+      }
+
+      // Exclusões primeiro, dos filhos para os pais
+      const deleted = Object.fromEntries(TABLES.map(t => [t, numericIds(body[t]?.deleted)])) as Record<Table, number[]>
+      if (deleted.comissoes.length) await sql`DELETE FROM public.comissoes WHERE id = ANY(${deleted.comissoes}::bigint[])`
+      if (deleted.servicos.length) await sql`DELETE FROM public.servicos WHERE id = ANY(${deleted.servicos}::bigint[])`
+      if (deleted.despesas.length) await sql`DELETE FROM public.despesas WHERE id = ANY(${deleted.despesas}::bigint[])`
+      if (deleted.clientes.length) {
+        // A tela de clientes promete manter os serviços vinculados, então desfaz o vínculo antes do CASCADE
+        await sql`UPDATE public.servicos SET cliente_id = NULL WHERE cliente_id = ANY(${deleted.clientes}::bigint[])`
+        await sql`DELETE FROM public.clientes WHERE id = ANY(${deleted.clientes}::bigint[])`
+      }
+
+      // Inclusões e alterações, dos pais para os filhos, com referências a ids temporários resolvidas
+      const clientes = [...withRealId('clientes', body.clientes?.inserted), ...(body.clientes?.updated || [])] as ClienteInput[]
+      await upsert('clientes', clientes, upsertClientes)
+
+      const servicos = [...withRealId('servicos', body.servicos?.inserted), ...(body.servicos?.updated || [])]
+        .map(s => ({ ...s, cliente_id: remap(s.cliente_id, ids.clientes) })) as ServicoInput[]
+      await upsert('servicos', servicos, upsertServicos)
+
+      const despesas = [...withRealId('despesas', body.despesas?.inserted), ...(body.despesas?.updated || [])] as DespesaInput[]
+      await upsert('despesas', despesas, upsertDespesas)
+
+      const comissoes = [...withRealId('comissoes', body.comissoes?.inserted), ...(body.comissoes?.updated || [])]
+        .map(c => ({ ...c, servico_id: remap(c.servico_id, ids.servicos) })) as ComissaoInput[]
+      await upsert('comissoes', comissoes, upsertComissoes)
+    })
+
+    res.status(200).json({ ok: errors.length === 0, errors, ids })
+  } catch (e: any) {
+    res.status(500).json({ error: e?.message || 'Erro ao sincronizar dados' })
+  }
+}
@@ -4,6 +4,7 @@ import { Alert, AlertDescription } from "@/components/ui/alert";
 import { BusinessData } from "@/types/business";
 import { Download, Upload, Database, AlertTriangle, Calendar } from "lucide-react";
 import { useToast } from "@/hooks/use-toast";
+import { backupFileName, downloadServerBackup, saveBackup } from "@/lib/backup-stream";
 
 interface BackupTabProps {
   data: BusinessData;
@@ -13,42 +14,22 @@ interface BackupTabProps {
 export const BackupTab = ({ data, onImportData }: BackupTabProps) => {
   const { toast } = useToast();
 
-  const exportData = () => {
+  const exportData = async () => {
     try {
-      const dataToExport = {
-        ...data,
-        metadata: {
-          ...data.metadata,
-          exportDate: new Date().toISOString(),
-          totalClientes: data.clientes.length,
-          totalServicos: data.servicos.length,
-          totalDespesas: data.despesas.length,
-          totalComissoes: data.comissoes.length,
-          version: "1.0"
-        }
-      };
+      const fileName = backupFileName();
+      if (navigator.onLine) {
+        // Snapshot consistente direto do Neon; o navegador baixa o stream sem passar pelo JS
+        downloadServerBackup();
+        toast({
+          title: "Backup iniciado!",
+          description: `O download de ${fileName} começará em instantes.`,
+        });
+        return;
+      }
 
-      const dataStr = JSON.stringify(dataToExport, null, 2);
-      const dataBlob = new Blob([dataStr], { type: 'application/json;charset=utf-8' });
-      
-      // Create download link
-      const url = URL.createObjectURL(dataBlob);
-      const link = document.createElement('a');
-      const fileName = `backup-sistema-financeiro-${new Date().toISOString().split('T')[0]}.json`;
-      
-      link.href = url;
-      link.download = fileName;
-      link.style.display = 'none';
-      
-      // Append to body, click, and remove
-      document.body.appendChild(link);
-      link.click();
-      
-      // Clean up
-      setTimeout(() => {
-        document.body.removeChild(link);
-        URL.revokeObjectURL(url);
-      }, 100);
+      // Sem conexão: gera o arquivo a partir dos dados carregados, um bloco por vez
+      const saved = await saveBackup(data, fileName);
+      if (!saved) return;
       
       toast({
         title: "Backup criado com sucesso!",
@@ -91,7 +72,7 @@ export const BackupTab = ({ data, onImportData }: BackupTabProps) => {
           </CardHeader>
           <CardContent className="space-y-4">
             <p className="text-sm text-muted-foreground">
-              Salve uma cópia de segurança de todos os seus dados atuais (clientes, serviços, etc.) em um arquivo json.
+              Salve uma cópia de segurança de todos os seus dados atuais (clientes, serviços, etc.) em um arquivo de backup (.ndjson).
             </p>
             
             <div className="p-4 bg-muted/50 rounded-lg space-y-2">
@@ -137,7 +118,7 @@ export const BackupTab = ({ data, onImportData }: BackupTabProps) => {
             </Alert>
 
             <p className="text-sm text-muted-foreground">
-              Restaure seus dados a partir de um arquivo de backup JSON. Todos os dados atuais serão substituídos.
+              Restaure seus dados a partir de um arquivo de backup (.ndjson ou .json). Todos os dados atuais serão substituídos.
             </p>
 
             <Button 
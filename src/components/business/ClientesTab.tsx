@@ -4,8 +4,18 @@ import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Badge } from "@/components/ui/badge";
 import { BusinessData, Cliente } from "@/types/business";
+import { selectClientStats, selectResumoClientes, selectServicosDoCliente } from "@/lib/selectors";
+import { commissionCents, formatCents } from "@/lib/money";
 import { Plus, Users, Eye, Calendar, DollarSign, Trash2, Edit } from "lucide-react";
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogFooter, DialogDescription } from "@/components/ui/dialog";
+import { useElementWidth, useVirtualRows } from "@/hooks/use-virtual-rows";
+
+// Altura estimada de cada linha da grade de clientes, em px, com o espaço até a próxima (a real é medida)
+const CLIENT_ROW_HEIGHT = 192;
+// Largura mínima de um cartão e espaço entre colunas (gap-x-4), em px; no máximo 3 colunas
+const CLIENT_CARD_MIN_WIDTH = 280;
+const CLIENT_GRID_GAP = 16;
+const CLIENT_GRID_MAX_COLUMNS = 3;
 
 interface ClientesTabProps {
   data: BusinessData;
@@ -28,14 +38,8 @@ export const ClientesTab = ({ data, onUpdateData }: ClientesTabProps) => {
   const [editAddress, setEditAddress] = useState("");
   const [editCpf, setEditCpf] = useState("");
 
-  const activeClientsCount = data.clientes.filter(c => getClientStats(c.id).totalServicos > 0).length;
-
-  const formatCurrency = (value: number) => {
-    return new Intl.NumberFormat('pt-BR', {
-      style: 'currency',
-      currency: 'BRL'
-    }).format(value);
-  };
+  // Estatísticas por cliente calculadas uma vez por versão dos dados, não a cada tecla digitada
+  const { activeClientsCount, ticketMedio } = selectResumoClientes(data);
 
   const handleSelectClient = (cliente: Cliente) => {
     setSelectedClient(cliente);
@@ -151,16 +155,18 @@ export const ClientesTab = ({ data, onUpdateData }: ClientesTabProps) => {
   };
 
   function getClientStats(clienteId: number | string) {
-    const servicosCliente = data.servicos.filter(s => s.cliente_id === clienteId);
-    const totalServicos = servicosCliente.length;
-    const totalFaturamento = servicosCliente.reduce((acc, s) => acc + s.valor_bruto, 0);
-    const ultimoServico = servicosCliente.length > 0 
-      ? new Date(Math.max(...servicosCliente.map(s => new Date(s.data_servico).getTime())))
-      : null;
-
-    return { totalServicos, totalFaturamento, ultimoServico };
+    return selectClientStats(data, clienteId);
   }
 
+  // Grade em janela: cada linha virtual tem quantos cartões couberem na largura da lista
+  const grade = useElementWidth();
+  const colunas = Math.min(
+    CLIENT_GRID_MAX_COLUMNS,
+    Math.max(1, Math.floor((grade.width + CLIENT_GRID_GAP) / (CLIENT_CARD_MIN_WIDTH + CLIENT_GRID_GAP)))
+  );
+  const linhas = Math.ceil(data.clientes.length / colunas);
+  const lista = useVirtualRows(linhas, CLIENT_ROW_HEIGHT);
+
   return (
     <div className="space-y-6">
       {/* Adicionar Novo Cliente */}
@@ -237,51 +243,61 @@ export const ClientesTab = ({ data, onUpdateData }: ClientesTabProps) => {
             <span>Clientes Cadastrados ({data.clientes.length})</span>
           </CardTitle>
         </CardHeader>
-        <CardContent>
+        <CardContent ref={grade.ref}>
           {data.clientes.length === 0 ? (
             <p className="text-center text-gray-400 py-6">Nenhum cliente cadastrado.</p>
           ) : (
-            <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
-              {data.clientes.map((cliente) => {
-                const stats = getClientStats(cliente.id);
-                return (
-                  <div key={cliente.id} className="p-4 bg-gray-800/50 border border-gray-800 rounded-lg hover:shadow-soft transition-shadow">
-                    <div className="flex items-start justify-between mb-3">
-                      <div className="overflow-hidden mr-2">
-                        <h3 className="font-semibold text-lg text-white truncate">{cliente.nome}</h3>
-                        <p className="text-sm text-gray-400 truncate">
-                          {cliente.telefone ? `📞 ${cliente.telefone}` : 'Sem telefone'}
-                        </p>
-                        <p className="text-sm text-gray-400 truncate">
-                          {cliente.email ? `📧 ${cliente.email}` : 'Sem email'}
-                        </p>
-                      </div>
-                      <Button
-                        variant="outline"
-                        size="sm"
-                        onClick={() => handleSelectClient(cliente)}
-                        className="bg-gray-800 border-gray-700 text-gray-300 hover:bg-gray-700 hover:text-white"
-                      >
-                        <Eye className="h-4 w-4" />
-                      </Button>
-                    </div>
+            <div ref={lista.containerRef} style={{ paddingTop: lista.paddingTop, paddingBottom: lista.paddingBottom }}>
+              {Array.from({ length: lista.end - lista.start }, (_, i) => lista.start + i).map((linha) => (
+                <div
+                  key={linha}
+                  ref={lista.measureRef}
+                  data-index={linha}
+                  className="grid gap-x-4 pb-4"
+                  style={{ gridTemplateColumns: `repeat(${colunas}, minmax(0, 1fr))` }}
+                >
+                  {data.clientes.slice(linha * colunas, (linha + 1) * colunas).map((cliente) => {
+                    const stats = getClientStats(cliente.id);
+                    return (
+                      <div key={cliente.id} className="p-4 bg-gray-800/50 border border-gray-800 rounded-lg hover:shadow-soft transition-shadow">
+                        <div className="flex items-start justify-between mb-3">
+                          <div className="min-w-0 mr-2">
+                            <h3 className="font-semibold text-lg text-white break-words">{cliente.nome}</h3>
+                            <p className="text-sm text-gray-400 break-words">
+                              {cliente.telefone ? `📞 ${cliente.telefone}` : 'Sem telefone'}
+                            </p>
+                            <p className="text-sm text-gray-400 break-all">
+                              {cliente.email ? `📧 ${cliente.email}` : 'Sem email'}
+                            </p>
+                          </div>
+                          <Button
+                            variant="outline"
+                            size="sm"
+                            onClick={() => handleSelectClient(cliente)}
+                            className="bg-gray-800 border-gray-700 text-gray-300 hover:bg-gray-700 hover:text-white"
+                          >
+                            <Eye className="h-4 w-4" />
+                          </Button>
+                        </div>
                     
-                    <div className="space-y-2 pt-2 border-t border-gray-800/80">
-                      <div className="flex items-center justify-between">
-                        <span className="text-sm text-gray-400">Serviços:</span>
-                        <Badge variant="secondary" className="bg-gray-800 text-gray-300 border border-gray-700">{stats.totalServicos}</Badge>
-                      </div>
+                        <div className="space-y-2 pt-2 border-t border-gray-800/80">
+                          <div className="flex items-center justify-between">
+                            <span className="text-sm text-gray-400">Serviços:</span>
+                            <Badge variant="secondary" className="bg-gray-800 text-gray-300 border border-gray-700">{stats.totalServicos}</Badge>
+                          </div>
                       
-                      <div className="flex items-center justify-between">
-                        <span className="text-sm text-gray-400">Faturamento:</span>
-                        <span className="font-medium text-green-400">
-                          {formatCurrency(stats.totalFaturamento)}
-                        </span>
+                          <div className="flex items-center justify-between">
+                            <span className="text-sm text-gray-400">Faturamento:</span>
+                            <span className="font-medium text-green-400">
+                              {formatCents(stats.totalFaturamento)}
+                            </span>
+                          </div>
+                        </div>
                       </div>
-                    </div>
-                  </div>
-                );
-              })}
+                    );
+                  })}
+                </div>
+              ))}
             </div>
           )}
         </CardContent>
@@ -325,7 +341,7 @@ export const ClientesTab = ({ data, onUpdateData }: ClientesTabProps) => {
               </div>
               <div>
                 <p className="text-2xl font-bold">
-                  {formatCurrency(data.servicos.reduce((acc, s) => acc + s.valor_bruto, 0) / (data.clientes.length || 1))}
+                  {formatCents(ticketMedio)}
                 </p>
                 <p className="text-sm text-gray-300">Ticket médio por cliente</p>
               </div>
@@ -384,7 +400,7 @@ export const ClientesTab = ({ data, onUpdateData }: ClientesTabProps) => {
                       <div className="bg-gray-800/40 p-3 rounded border border-gray-800 text-center">
                         <p className="text-xs text-gray-400">Total Faturamento</p>
                         <p className="text-xl font-bold text-green-400 mt-1">
-                          {formatCurrency(getClientStats(selectedClient.id).totalFaturamento)}
+                          {formatCents(getClientStats(selectedClient.id).totalFaturamento)}
                         </p>
                       </div>
                     </div>
@@ -449,7 +465,7 @@ export const ClientesTab = ({ data, onUpdateData }: ClientesTabProps) => {
               {/* Histórico de Serviços */}
               <div className="space-y-3">
                 <h4 className="text-sm font-semibold text-gray-300">Histórico de Serviços realizados</h4>
-                {data.servicos.filter(s => s.cliente_id === selectedClient.id).length === 0 ? (
+                {selectServicosDoCliente(data, selectedClient.id).length === 0 ? (
                   <p className="text-sm text-gray-500 bg-gray-900/30 p-4 rounded text-center border border-gray-800">
                     Nenhum serviço registrado para este cliente.
                   </p>
@@ -466,9 +482,7 @@ export const ClientesTab = ({ data, onUpdateData }: ClientesTabProps) => {
                         </tr>
                       </thead>
                       <tbody>
-                        {data.servicos
-                          .filter(s => s.cliente_id === selectedClient.id)
-                          .sort((a, b) => new Date(b.data_servico).getTime() - new Date(a.data_servico).getTime())
+                        {selectServicosDoCliente(data, selectedClient.id)
                           .map((s) => (
                             <tr key={s.id} className="border-t border-gray-800 bg-gray-900/50 hover:bg-gray-850">
                               <td className="p-3 text-gray-300">
@@ -476,9 +490,9 @@ export const ClientesTab = ({ data, onUpdateData }: ClientesTabProps) => {
                               </td>
                               <td className="p-3 font-medium text-white">{s.veiculo}</td>
                               <td className="p-3 uppercase text-gray-300">{s.placa}</td>
-                              <td className="p-3 text-right text-gray-300">{formatCurrency(s.valor_bruto)}</td>
+                              <td className="p-3 text-right text-gray-300">{formatCents(s.valor_bruto)}</td>
                               <td className="p-3 text-right text-green-400 font-medium">
-                                {formatCurrency((s.valor_bruto * s.porcentagem_comissao) / 100)}
+                                {formatCents(commissionCents(s.valor_bruto, s.porcentagem_comissao))}
                               </td>
                             </tr>
                           ))}
@@ -3,14 +3,21 @@ import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { Badge } from "@/components/ui/badge";
 import { BusinessData, Servico } from "@/types/business";
+import { getBusinessIndex, findCliente } from "@/lib/business-index";
 import { DollarSign, TrendingUp, Clock, CheckCircle, RefreshCw, Undo2, Calendar, FileText, Download } from "lucide-react";
 import { ReceiveCommissionDialog } from "./ReceiveCommissionDialog";
 import { UndoCommissionReceiptDialog } from "./UndoCommissionReceiptDialog";
+import { useVirtualRows } from "@/hooks/use-virtual-rows";
+import { selectComissoesFiltradas, selectTotaisComissoes } from "@/lib/selectors";
+import { Cents, asCents, commissionCents, formatCents } from "@/lib/money";
+
+// Altura estimada de cada linha da tabela, em px (data/veículo em duas linhas e botões "sm"); a real é medida
+const COMMISSION_ROW_HEIGHT = 68;
 
 interface ComissoesTabProps {
   data: BusinessData;
   onUpdateData: (newData: BusinessData) => void;
-  onReceiveCommission: (service: Servico, amount: number) => Promise<void>;
+  onReceiveCommission: (service: Servico, amount: Cents) => Promise<void>;
   onUndoCommission: (serviceId: number) => Promise<void>; // ✅ NOVA PROP
 }
 
@@ -20,18 +27,6 @@ export const ComissoesTab = ({ data, onUpdateData, onReceiveCommission, onUndoCo
   const [filtroMes, setFiltroMes] = useState<string>("todos");
   const [filtroStatus, setFiltroStatus] = useState<string>("todos");
 
-  // Função para arredondar valores monetários e evitar problemas de precisão
-  const roundCurrency = (value: number) => {
-    return Math.round(value * 100) / 100;
-  };
-
-  const formatCurrency = (value: number) => {
-    return new Intl.NumberFormat('pt-BR', {
-      style: 'currency',
-      currency: 'BRL'
-    }).format(value);
-  };
-
   const formatDate = (dateString: string) => {
     return new Date(dateString).toLocaleDateString('pt-BR', {
       day: '2-digit',
@@ -50,61 +45,27 @@ export const ComissoesTab = ({ data, onUpdateData, onReceiveCommission, onUndoCo
   };
 
   const getClienteName = (clienteId: number) => {
-    const cliente = data.clientes.find(c => c.id === clienteId);
+    const cliente = findCliente(index, clienteId);
     return cliente?.nome || "Cliente não encontrado";
   };
 
-  // Obter lista de meses disponíveis
-  const mesesDisponiveis = Array.from(new Set(
-    data.servicos.map(s => {
-      const date = new Date(s.data_servico);
-      return `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
-    })
-  )).sort().reverse();
-
-  // Filtrar serviços
-  const servicosFiltrados = data.servicos.filter(servico => {
-    const date = new Date(servico.data_servico);
-    const mesServico = `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
-    
-    const comissaoTotal = roundCurrency(servico.valor_bruto * servico.porcentagem_comissao / 100);
-    const comissaoRecebida = roundCurrency(servico.comissao_recebida);
-    
-    const isPendente = comissaoRecebida === 0;
-    const isCompleto = comissaoRecebida >= comissaoTotal;
-    const isParcial = comissaoRecebida > 0 && comissaoRecebida < comissaoTotal;
-
-    const passaMes = filtroMes === "todos" || mesServico === filtroMes;
-    const passaStatus = filtroStatus === "todos" || 
-      (filtroStatus === "pendente" && isPendente) ||
-      (filtroStatus === "parcial" && isParcial) ||
-      (filtroStatus === "completo" && isCompleto);
+  // Meses disponíveis e serviços por mês vêm prontos do índice
+  const index = getBusinessIndex(data);
+  const mesesDisponiveis = index.serviceMonths;
 
-    return passaMes && passaStatus;
-  });
+  // Filtro, ordenação e totais vêm dos seletores memoizados (por versão dos dados e filtros)
+  const { servicos: servicosFiltrados, totalComissoes, comissoesRecebidas, comissoesPendentes } =
+    selectComissoesFiltradas(data, filtroMes, filtroStatus);
 
-  // Calcular estatísticas de comissões (com filtros)
-  const totalComissoes = servicosFiltrados.reduce((acc, servico) => 
-    acc + (servico.valor_bruto * servico.porcentagem_comissao / 100), 0);
-  
-  const comissoesRecebidas = servicosFiltrados.reduce((acc, servico) => 
-    acc + servico.comissao_recebida, 0);
-  
-  const comissoesPendentes = totalComissoes - comissoesRecebidas;
-  
-  const servicosComComissao = servicosFiltrados.filter(s => s.comissao_recebida > 0);
-  const servicosPendentes = servicosFiltrados.filter(s => s.comissao_recebida === 0);
+  // Tabela em janela: só as linhas visíveis são montadas e medidas
+  const lista = useVirtualRows<HTMLTableSectionElement>(servicosFiltrados.length, COMMISSION_ROW_HEIGHT);
 
   // Estatísticas gerais (sem filtros)
-  const totalGeralComissoes = data.servicos.reduce((acc, servico) => 
-    acc + (servico.valor_bruto * servico.porcentagem_comissao / 100), 0);
-  
-  const totalGeralRecebidas = data.servicos.reduce((acc, servico) => 
-    acc + servico.comissao_recebida, 0);
+  const { totalComissoes: totalGeralComissoes, totalRecebidas: totalGeralRecebidas } = selectTotaisComissoes(data);
 
   const marcarComoRecebido = (servico: Servico) => {
-    const comissaoTotal = roundCurrency(servico.valor_bruto * servico.porcentagem_comissao / 100);
-    const valorReceber = roundCurrency(comissaoTotal - servico.comissao_recebida);
+    const comissaoTotal = commissionCents(servico.valor_bruto, servico.porcentagem_comissao);
+    const valorReceber = asCents(comissaoTotal - servico.comissao_recebida);
     
     if (valorReceber > 0) {
       onReceiveCommission(servico, valorReceber);
@@ -120,18 +81,18 @@ export const ComissoesTab = ({ data, onUpdateData, onReceiveCommission, onUndoCo
   // Função para exportar relatório
   const exportarRelatorio = () => {
     const relatorio = servicosFiltrados.map(servico => {
-      const comissaoTotal = roundCurrency(servico.valor_bruto * servico.porcentagem_comissao / 100);
-      const comissaoRecebida = roundCurrency(servico.comissao_recebida);
+      const comissaoTotal = commissionCents(servico.valor_bruto, servico.porcentagem_comissao);
+      const comissaoRecebida = servico.comissao_recebida;
       
       return {
         Data: formatDate(servico.data_servico),
         Cliente: getClienteName(servico.cliente_id),
         Veículo: `${servico.veiculo} - ${servico.placa}`,
-        'Valor Bruto': formatCurrency(servico.valor_bruto),
+        'Valor Bruto': formatCents(servico.valor_bruto),
         'Porcentagem': `${servico.porcentagem_comissao}%`,
-        'Comissão Total': formatCurrency(comissaoTotal),
-        'Comissão Recebida': formatCurrency(comissaoRecebida),
-        'Comissão Pendente': formatCurrency(comissaoTotal - comissaoRecebida),
+        'Comissão Total': formatCents(comissaoTotal),
+        'Comissão Recebida': formatCents(comissaoRecebida),
+        'Comissão Pendente': formatCents(asCents(comissaoTotal - comissaoRecebida)),
         Status: comissaoRecebida === 0 ? 'Pendente' : (comissaoRecebida >= comissaoTotal ? 'Completo' : 'Parcial')
       };
     });
@@ -161,15 +122,15 @@ export const ComissoesTab = ({ data, onUpdateData, onReceiveCommission, onUndoCo
         <CardContent>
           <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
             <div className="text-center">
-              <p className="text-3xl font-bold text-primary">{formatCurrency(totalGeralComissoes)}</p>
+              <p className="text-3xl font-bold text-primary">{formatCents(totalGeralComissoes)}</p>
               <p className="text-sm text-muted-foreground">Total Acumulado</p>
             </div>
             <div className="text-center">
-              <p className="text-3xl font-bold text-success">{formatCurrency(totalGeralRecebidas)}</p>
+              <p className="text-3xl font-bold text-success">{formatCents(totalGeralRecebidas)}</p>
               <p className="text-sm text-muted-foreground">Total Recebido</p>
             </div>
             <div className="text-center">
-              <p className="text-3xl font-bold text-warning">{formatCurrency(totalGeralComissoes - totalGeralRecebidas)}</p>
+              <p className="text-3xl font-bold text-warning">{formatCents(asCents(totalGeralComissoes - totalGeralRecebidas))}</p>
               <p className="text-sm text-muted-foreground">Total Pendente</p>
             </div>
           </div>
@@ -243,7 +204,7 @@ export const ComissoesTab = ({ data, onUpdateData, onReceiveCommission, onUndoCo
                 <DollarSign className="h-6 w-6 text-primary" />
               </div>
               <div>
-                <p className="text-2xl font-bold">{formatCurrency(totalComissoes)}</p>
+                <p className="text-2xl font-bold">{formatCents(totalComissoes)}</p>
                 <p className="text-sm text-muted-foreground">Total Comissões</p>
               </div>
             </div>
@@ -257,7 +218,7 @@ export const ComissoesTab = ({ data, onUpdateData, onReceiveCommission, onUndoCo
                 <CheckCircle className="h-6 w-6 text-success" />
               </div>
               <div>
-                <p className="text-2xl font-bold text-success">{formatCurrency(comissoesRecebidas)}</p>
+                <p className="text-2xl font-bold text-success">{formatCents(comissoesRecebidas)}</p>
                 <p className="text-sm text-muted-foreground">Recebidas</p>
               </div>
             </div>
@@ -271,7 +232,7 @@ export const ComissoesTab = ({ data, onUpdateData, onReceiveCommission, onUndoCo
                 <Clock className="h-6 w-6 text-warning" />
               </div>
               <div>
-                <p className="text-2xl font-bold text-warning">{formatCurrency(comissoesPendentes)}</p>
+                <p className="text-2xl font-bold text-warning">{formatCents(comissoesPendentes)}</p>
                 <p className="text-sm text-muted-foreground">Pendentes</p>
               </div>
             </div>
@@ -308,7 +269,7 @@ export const ComissoesTab = ({ data, onUpdateData, onReceiveCommission, onUndoCo
         </CardHeader>
         <CardContent>
           <div className="overflow-x-auto">
-            <table className="w-full">
+            <table className="w-full whitespace-nowrap">
               <thead>
                 <tr className="border-b">
                   <th className="p-3 text-left">Data</th>
@@ -323,17 +284,18 @@ export const ComissoesTab = ({ data, onUpdateData, onReceiveCommission, onUndoCo
                   <th className="p-3 text-left">Ações</th>
                 </tr>
               </thead>
-              <tbody>
-                {[...servicosFiltrados].sort((a, b) => new Date(b.data_servico).getTime() - new Date(a.data_servico).getTime()).map((servico) => {
-                  const comissaoTotal = roundCurrency(servico.valor_bruto * servico.porcentagem_comissao / 100);
-                  const comissaoRecebida = roundCurrency(servico.comissao_recebida);
-                  const comissaoPendente = comissaoTotal - comissaoRecebida;
+              <tbody ref={lista.containerRef}>
+                {lista.paddingTop > 0 && <tr aria-hidden style={{ height: lista.paddingTop }} />}
+                {servicosFiltrados.slice(lista.start, lista.end).map((servico, i) => {
+                  const comissaoTotal = commissionCents(servico.valor_bruto, servico.porcentagem_comissao);
+                  const comissaoRecebida = servico.comissao_recebida;
+                  const comissaoPendente = asCents(comissaoTotal - comissaoRecebida);
                   const isPendente = comissaoRecebida === 0;
                   const isCompleto = comissaoRecebida >= comissaoTotal;
                   const isParcial = comissaoRecebida > 0 && comissaoRecebida < comissaoTotal;
                   
                   return (
-                    <tr key={servico.id} className="border-b hover:bg-muted/50 transition-colors">
+                    <tr key={servico.id} ref={lista.measureRef} data-index={lista.start + i} className="border-b hover:bg-muted/50 transition-colors" style={{ height: COMMISSION_ROW_HEIGHT }}>
                       <td className="p-3">
                         <div className="font-medium">{formatDate(servico.data_servico)}</div>
                         <div className="text-xs text-muted-foreground">{formatDateExtended(servico.data_servico)}</div>
@@ -343,17 +305,17 @@ export const ComissoesTab = ({ data, onUpdateData, onReceiveCommission, onUndoCo
                         <div>{servico.veiculo}</div>
                         <div className="text-xs text-muted-foreground">{servico.placa}</div>
                       </td>
-                      <td className="p-3">{formatCurrency(servico.valor_bruto)}</td>
+                      <td className="p-3">{formatCents(servico.valor_bruto)}</td>
                       <td className="p-3">{servico.porcentagem_comissao}%</td>
-                      <td className="p-3 font-semibold">{formatCurrency(comissaoTotal)}</td>
+                      <td className="p-3 font-semibold">{formatCents(comissaoTotal)}</td>
                       <td className="p-3">
                         <span className={comissaoRecebida > 0 ? "text-success font-semibold" : "text-muted-foreground"}>
-                          {formatCurrency(comissaoRecebida)}
+                          {formatCents(comissaoRecebida)}
                         </span>
                       </td>
                       <td className="p-3">
                         <span className={comissaoPendente > 0 ? "text-warning font-semibold" : "text-muted-foreground"}>
-                          {formatCurrency(comissaoPendente)}
+                          {formatCents(comissaoPendente)}
                         </span>
                       </td>
                       <td className="p-3">
@@ -409,6 +371,7 @@ export const ComissoesTab = ({ data, onUpdateData, onReceiveCommission, onUndoCo
                     </tr>
                   );
                 })}
+                {lista.paddingBottom > 0 && <tr aria-hidden style={{ height: lista.paddingBottom }} />}
               </tbody>
             </table>
           </div>
@@ -1,5 +1,11 @@
+import { useEffect } from "react";
+import { useQuery } from "@tanstack/react-query";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { BusinessData } from "@/types/business";
+import { perfMark } from "@/lib/perf";
+import { METRICS_QUERY_KEY, fetchDashboardMetrics } from "@/lib/metrics";
+import { selectDashboardFallback } from "@/lib/selectors";
+import { commissionCents, formatCents } from "@/lib/money";
 import { 
   Users, 
   Car, 
@@ -10,50 +16,54 @@ import {
   CreditCard,
   Target,
   Wallet,
-  PiggyBank
+  PiggyBank,
+  Loader2
 } from "lucide-react";
 
 interface DashboardProps {
   data: BusinessData;
+  /** Indica se `data` já foi carregado do Neon (usado na reserva local das métricas) */
+  dataReady?: boolean;
 }
 
-export const Dashboard = ({ data }: DashboardProps) => {
-  const totalServicos = data.servicos.length;
-  const totalClientes = data.clientes.length;
-  
-  // Cálculos financeiros principais
-  const totalFaturado = data.servicos.reduce((acc, servico) => acc + servico.valor_bruto, 0);
-  const totalComissoesRecebidas = data.servicos.reduce((acc, servico) => acc + servico.comissao_recebida, 0);
-  const totalComissoesCalculadas = data.servicos.reduce((acc, servico) => acc + (servico.valor_bruto * servico.porcentagem_comissao / 100), 0);
-  const valorAReceber = totalComissoesCalculadas - totalComissoesRecebidas;
-  
-  const parseDateToTime = (dateString: string) => {
-    if (!dateString) return 0;
-    const datePart = dateString.includes('T') ? dateString.split('T')[0] : (dateString.includes(' ') ? dateString.split(' ')[0] : dateString);
-    const date = new Date(datePart + 'T00:00:00');
-    return isNaN(date.getTime()) ? new Date(dateString).getTime() || 0 : date.getTime();
-  };
+export const Dashboard = ({ data, dataReady = true }: DashboardProps) => {
+  // Os agregados vêm prontos do banco; os dados locais só servem de reserva
+  const metricsQuery = useQuery({
+    queryKey: METRICS_QUERY_KEY,
+    queryFn: fetchDashboardMetrics,
+    retry: 1,
+  });
+  const metrics = metricsQuery.data ?? (metricsQuery.isError && dataReady ? selectDashboardFallback(data) : null);
 
-  const servicosRecentes = data.servicos
-    .sort((a, b) => parseDateToTime(b.data_servico) - parseDateToTime(a.data_servico))
-    .slice(0, 5);
-  
-  // Cálculos para despesas
-  const totalDespesas = data.despesas.reduce((acc, despesa) => acc + despesa.valor, 0);
-  const despesasPagas = data.despesas.filter(d => d.pago).reduce((acc, despesa) => acc + despesa.valor, 0);
-  const despesasPendentes = totalDespesas - despesasPagas;
-  
-  // Lucro líquido estimado
-  const lucroLiquido = totalComissoesRecebidas - despesasPagas;
+  const hasMetrics = metrics !== null;
 
-  const formatCurrency = (value: number) => {
-    return new Intl.NumberFormat('pt-BR', {
-      style: 'currency',
-      currency: 'BRL'
-    }).format(value);
-  };
+  useEffect(() => {
+    if (hasMetrics) perfMark("dashboard:rendered");
+  }, [hasMetrics]);
+
+  if (!metrics) {
+    return (
+      <div className="flex items-center justify-center py-24">
+        <Loader2 className="h-8 w-8 animate-spin text-primary" />
+      </div>
+    );
+  }
+
+  const {
+    totalServicos,
+    totalClientes,
+    totalFaturado,
+    totalComissoesRecebidas,
+    valorAReceber,
+    servicosRecentes,
+    totalDespesas,
+    despesasPagas,
+    despesasPendentes,
+    qtdDespesasPagas,
+    qtdDespesasPendentes,
+    lucroLiquido
+  } = metrics;
 
-  const roundCurrency = (value: number) => Math.round((value + Number.EPSILON) * 100) / 100;
   const formatDate = (dateString: string | null | undefined) => {
     if (!dateString) return '-';
     try {
@@ -86,7 +96,7 @@ export const Dashboard = ({ data }: DashboardProps) => {
               <CreditCard className="h-5 w-5 text-blue-600 dark:text-blue-400" />
             </CardHeader>
             <CardContent>
-              <div className="text-2xl font-bold text-blue-800 dark:text-blue-200">{formatCurrency(totalFaturado)}</div>
+              <div className="text-2xl font-bold text-blue-800 dark:text-blue-200">{formatCents(totalFaturado)}</div>
               <p className="text-xs text-blue-600 dark:text-blue-400">Valor bruto dos serviços</p>
             </CardContent>
           </Card>
@@ -99,7 +109,7 @@ export const Dashboard = ({ data }: DashboardProps) => {
               <Wallet className="h-5 w-5 text-green-600 dark:text-green-400" />
             </CardHeader>
             <CardContent>
-              <div className="text-2xl font-bold text-green-800 dark:text-green-200">{formatCurrency(totalComissoesRecebidas)}</div>
+              <div className="text-2xl font-bold text-green-800 dark:text-green-200">{formatCents(totalComissoesRecebidas)}</div>
               <p className="text-xs text-green-600 dark:text-green-400">Já recebido</p>
             </CardContent>
           </Card>
@@ -112,7 +122,7 @@ export const Dashboard = ({ data }: DashboardProps) => {
               <Target className="h-5 w-5 text-orange-600 dark:text-orange-400" />
             </CardHeader>
             <CardContent>
-              <div className="text-2xl font-bold text-orange-800 dark:text-orange-200">{formatCurrency(valorAReceber)}</div>
+              <div className="text-2xl font-bold text-orange-800 dark:text-orange-200">{formatCents(valorAReceber)}</div>
               <p className="text-xs text-orange-600 dark:text-orange-400">Comissões pendentes</p>
             </CardContent>
           </Card>
@@ -126,7 +136,7 @@ export const Dashboard = ({ data }: DashboardProps) => {
             </CardHeader>
             <CardContent>
               <div className={`text-2xl font-bold ${lucroLiquido >= 0 ? 'text-purple-800 dark:text-purple-200' : 'text-red-600 dark:text-red-400'}`}>
-                {formatCurrency(lucroLiquido)}
+                {formatCents(lucroLiquido)}
               </div>
               <p className="text-xs text-purple-600 dark:text-purple-400">Comissões - Despesas pagas</p>
             </CardContent>
@@ -178,8 +188,8 @@ export const Dashboard = ({ data }: DashboardProps) => {
               <Receipt className="h-5 w-5 text-red-600 dark:text-red-400" />
             </CardHeader>
             <CardContent>
-              <div className="text-2xl font-bold text-red-800 dark:text-red-200">{formatCurrency(totalDespesas)}</div>
-              <p className="text-xs text-red-600 dark:text-red-400">{data.despesas.length} despesas registradas</p>
+              <div className="text-2xl font-bold text-red-800 dark:text-red-200">{formatCents(totalDespesas)}</div>
+              <p className="text-xs text-red-600 dark:text-red-400">{qtdDespesasPagas + qtdDespesasPendentes} despesas registradas</p>
             </CardContent>
           </Card>
 
@@ -191,9 +201,9 @@ export const Dashboard = ({ data }: DashboardProps) => {
               <DollarSign className="h-5 w-5 text-emerald-600 dark:text-emerald-400" />
             </CardHeader>
             <CardContent>
-              <div className="text-2xl font-bold text-emerald-800 dark:text-emerald-200">{formatCurrency(despesasPagas)}</div>
+              <div className="text-2xl font-bold text-emerald-800 dark:text-emerald-200">{formatCents(despesasPagas)}</div>
               <p className="text-xs text-emerald-600 dark:text-emerald-400">
-                {data.despesas.filter(d => d.pago).length} pagas
+                {qtdDespesasPagas} pagas
               </p>
             </CardContent>
           </Card>
@@ -206,9 +216,9 @@ export const Dashboard = ({ data }: DashboardProps) => {
               <Receipt className="h-5 w-5 text-amber-600 dark:text-amber-400" />
             </CardHeader>
             <CardContent>
-              <div className="text-2xl font-bold text-amber-800 dark:text-amber-200">{formatCurrency(despesasPendentes)}</div>
+              <div className="text-2xl font-bold text-amber-800 dark:text-amber-200">{formatCents(despesasPendentes)}</div>
               <p className="text-xs text-amber-600 dark:text-amber-400">
-                {data.despesas.filter(d => !d.pago).length} pendentes
+                {qtdDespesasPendentes} pendentes
               </p>
             </CardContent>
           </Card>
@@ -226,8 +236,7 @@ export const Dashboard = ({ data }: DashboardProps) => {
         <CardContent>
           <div className="space-y-4">
             {servicosRecentes.map((servico) => {
-              const cliente = data.clientes.find(c => c.id === servico.cliente_id);
-              const comissaoTotal = roundCurrency(servico.valor_bruto * servico.porcentagem_comissao / 100);
+              const comissaoTotal = commissionCents(servico.valor_bruto, servico.porcentagem_comissao);
               return (
                 <div key={servico.id} className="flex items-center justify-between p-4 bg-muted/50 rounded-lg">
                   <div className="flex items-center space-x-4">
@@ -237,14 +246,14 @@ export const Dashboard = ({ data }: DashboardProps) => {
                     <div>
                       <p className="font-medium">{servico.veiculo} - {servico.placa}</p>
                       <p className="text-sm text-muted-foreground">
-                        {cliente?.nome} • {formatDate(servico.data_servico)}
+                        {servico.cliente_nome} • {formatDate(servico.data_servico)}
                       </p>
                     </div>
                   </div>
                   <div className="text-right">
-                    <p className="font-medium">{formatCurrency(servico.valor_bruto)}</p>
+                    <p className="font-medium">{formatCents(servico.valor_bruto)}</p>
                      <p className="text-sm" style={{ color: 'hsl(var(--success))' }}>
-                       Comissão: {formatCurrency(comissaoTotal)}
+                       Comissão: {formatCents(comissaoTotal)}
                      </p>
                   </div>
                 </div>
@@ -6,6 +6,12 @@ import { Label } from "@/components/ui/label";
 import { Badge } from "@/components/ui/badge";
 import { BusinessData, Despesa } from "@/types/business";
 import { Plus, Receipt, Calendar, AlertCircle } from "lucide-react";
+import { useVirtualRows } from "@/hooks/use-virtual-rows";
+import { selectDespesasOrdenadas, selectTotaisDespesas } from "@/lib/selectors";
+import { formatCents, toCents } from "@/lib/money";
+
+// Altura estimada de cada cartão da lista, em px, com o espaço até o próximo (a real é medida)
+const EXPENSE_ROW_HEIGHT = 184;
 
 interface DespesasTabProps {
   data: BusinessData;
@@ -20,13 +26,6 @@ export const DespesasTab = ({ data, onUpdateData }: DespesasTabProps) => {
     data_vencimento: ""
   });
 
-  const formatCurrency = (value: number) => {
-    return new Intl.NumberFormat('pt-BR', {
-      style: 'currency',
-      currency: 'BRL'
-    }).format(value);
-  };
-
   const formatDate = (dateString: string) => {
     return new Date(dateString).toLocaleDateString('pt-BR', {
       day: '2-digit',
@@ -62,7 +61,7 @@ export const DespesasTab = ({ data, onUpdateData }: DespesasTabProps) => {
     const newExpense: Despesa = {
       id: 'temp_' + Date.now(),
       descricao: formData.descricao,
-      valor: parseFloat(formData.valor),
+      valor: toCents(parseFloat(formData.valor)),
       data_vencimento: formData.data_vencimento,
       pago: false
     };
@@ -113,9 +112,11 @@ export const DespesasTab = ({ data, onUpdateData }: DespesasTabProps) => {
     return <Badge variant="secondary">Pendente</Badge>;
   };
 
-  const totalDespesas = data.despesas.reduce((acc, despesa) => acc + despesa.valor, 0);
-  const totalPago = data.despesas.filter(d => d.pago).reduce((acc, despesa) => acc + despesa.valor, 0);
-  const totalPendente = totalDespesas - totalPago;
+  const { totalDespesas, totalPago, totalPendente } = selectTotaisDespesas(data);
+
+  // Só os cartões visíveis são montados
+  const despesasOrdenadas = selectDespesasOrdenadas(data);
+  const lista = useVirtualRows(despesasOrdenadas.length, EXPENSE_ROW_HEIGHT);
 
   return (
     <div className="space-y-6">
@@ -128,7 +129,7 @@ export const DespesasTab = ({ data, onUpdateData }: DespesasTabProps) => {
                 <Receipt className="h-6 w-6 text-primary" />
               </div>
               <div>
-                <p className="text-2xl font-bold">{formatCurrency(totalDespesas)}</p>
+                <p className="text-2xl font-bold">{formatCents(totalDespesas)}</p>
                 <p className="text-sm text-muted-foreground">Total de despesas</p>
               </div>
             </div>
@@ -142,7 +143,7 @@ export const DespesasTab = ({ data, onUpdateData }: DespesasTabProps) => {
                 <Receipt className="h-6 w-6 text-success" />
               </div>
               <div>
-                <p className="text-2xl font-bold text-success">{formatCurrency(totalPago)}</p>
+                <p className="text-2xl font-bold text-success">{formatCents(totalPago)}</p>
                 <p className="text-sm text-muted-foreground">Despesas pagas</p>
               </div>
             </div>
@@ -156,7 +157,7 @@ export const DespesasTab = ({ data, onUpdateData }: DespesasTabProps) => {
                 <AlertCircle className="h-6 w-6 text-warning" />
               </div>
               <div>
-                <p className="text-2xl font-bold text-warning">{formatCurrency(totalPendente)}</p>
+                <p className="text-2xl font-bold text-warning">{formatCents(totalPendente)}</p>
                 <p className="text-sm text-muted-foreground">Despesas pendentes</p>
               </div>
             </div>
@@ -245,48 +246,50 @@ export const DespesasTab = ({ data, onUpdateData }: DespesasTabProps) => {
               <p>Nenhuma despesa registrada ainda.</p>
             </div>
           ) : (
-            <div className="space-y-4">
-              {[...data.despesas].sort((a, b) => new Date(b.data_vencimento).getTime() - new Date(a.data_vencimento).getTime()).map((despesa) => {
+            <div ref={lista.containerRef} style={{ paddingTop: lista.paddingTop, paddingBottom: lista.paddingBottom }}>
+              {despesasOrdenadas.slice(lista.start, lista.end).map((despesa, i) => {
                 const daysUntilDue = getDaysUntilDue(despesa.data_vencimento);
                 return (
-                  <div key={despesa.id} className="p-4 border rounded-lg hover:shadow-soft transition-shadow">
-                    <div className="flex items-center justify-between mb-3">
-                      <div className="flex-1">
-                        <h3 className="font-semibold text-base">{despesa.descricao}</h3>
-                        <div className="mt-1">
-                          <p className="text-xs text-muted-foreground mb-1">Data de Vencimento:</p>
-                          <div className="text-sm font-semibold text-primary">
-                            {formatDate(despesa.data_vencimento)}
+                  <div key={despesa.id} ref={lista.measureRef} data-index={lista.start + i} className="pb-4">
+                    <div className="p-4 border rounded-lg hover:shadow-soft transition-shadow">
+                      <div className="flex items-center justify-between mb-3">
+                        <div className="flex-1 min-w-0">
+                          <h3 className="font-semibold text-base break-words">{despesa.descricao}</h3>
+                          <div className="mt-1">
+                            <p className="text-xs text-muted-foreground mb-1">Data de Vencimento:</p>
+                            <div className="text-sm font-semibold text-primary">
+                              {formatDate(despesa.data_vencimento)}
+                            </div>
+                            <p className="text-xs text-muted-foreground">
+                              {formatDateExtended(despesa.data_vencimento)}
+                              {!despesa.pago && (
+                                <span className={`ml-2 ${daysUntilDue < 0 ? 'text-destructive' : daysUntilDue <= 3 ? 'text-warning' : 'text-muted-foreground'}`}>
+                                  {daysUntilDue < 0 ? `${Math.abs(daysUntilDue)} dias em atraso` : 
+                                   daysUntilDue === 0 ? 'Vence hoje' :
+                                   `${daysUntilDue} dias restantes`}
+                                </span>
+                              )}
+                            </p>
                           </div>
-                          <p className="text-xs text-muted-foreground">
-                            {formatDateExtended(despesa.data_vencimento)}
-                            {!despesa.pago && (
-                              <span className={`ml-2 ${daysUntilDue < 0 ? 'text-destructive' : daysUntilDue <= 3 ? 'text-warning' : 'text-muted-foreground'}`}>
-                                {daysUntilDue < 0 ? `${Math.abs(daysUntilDue)} dias em atraso` : 
-                                 daysUntilDue === 0 ? 'Vence hoje' :
-                                 `${daysUntilDue} dias restantes`}
-                              </span>
-                            )}
-                          </p>
                         </div>
-                      </div>
-                      <div className="flex items-center space-x-3">
-                        <div className="text-right">
-                          <span className="font-bold text-lg">{formatCurrency(despesa.valor)}</span>
+                        <div className="flex items-center space-x-3">
+                          <div className="text-right">
+                            <span className="font-bold text-lg">{formatCents(despesa.valor)}</span>
+                          </div>
+                          {getStatusBadge(despesa)}
                         </div>
-                        {getStatusBadge(despesa)}
-                      </div>
-                     </div>
+                       </div>
                    
-                     <div className="flex justify-end">
-                       <Button
-                         variant={despesa.pago ? "outline" : "default"}
-                         size="sm"
-                         onClick={() => togglePaid(despesa.id)}
-                         className={despesa.pago ? "" : "bg-success hover:bg-success/90"}
-                       >
-                         {despesa.pago ? "Marcar como Pendente" : "Marcar como Pago"}
-                       </Button>
+                       <div className="flex justify-end">
+                         <Button
+                           variant={despesa.pago ? "outline" : "default"}
+                           size="sm"
+                           onClick={() => togglePaid(despesa.id)}
+                           className={despesa.pago ? "" : "bg-success hover:bg-success/90"}
+                         >
+                           {despesa.pago ? "Marcar como Pendente" : "Marcar como Pago"}
+                         </Button>
+                       </div>
                      </div>
                    </div>
                  );
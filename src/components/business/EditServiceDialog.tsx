@@ -7,6 +7,7 @@ import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@
 import { Textarea } from "@/components/ui/textarea";
 import { BusinessData, Servico } from "@/types/business";
 import { fixTimezoneDate, formatDateForInput } from "@/lib/utils";
+import { commissionCents, fromCents, toCents } from "@/lib/money";
 
 interface EditServiceDialogProps {
   open: boolean;
@@ -41,7 +42,7 @@ export const EditServiceDialog = ({
         cliente_id: service.cliente_id.toString(),
         veiculo: service.veiculo,
         placa: service.placa,
-        valor_bruto: service.valor_bruto.toString(),
+        valor_bruto: fromCents(service.valor_bruto).toFixed(2),
         porcentagem_comissao: service.porcentagem_comissao.toString(),
         observacao: service.observacao || ""
       });
@@ -54,7 +55,7 @@ export const EditServiceDialog = ({
       return;
     }
 
-    const valorBruto = parseFloat(formData.valor_bruto);
+    const valorBruto = toCents(parseFloat(formData.valor_bruto));
     const porcentagemComissao = parseFloat(formData.porcentagem_comissao);
     
     // Validação do percentual de comissão
@@ -62,7 +63,7 @@ export const EditServiceDialog = ({
       alert("O percentual de comissão deve estar entre 0% e 100%.");
       return;
     }
-    const comissaoTotal = (valorBruto * porcentagemComissao) / 100;
+    const comissaoTotal = commissionCents(valorBruto, porcentagemComissao);
 
     const updatedService: Servico = {
       ...service,
@@ -4,29 +4,36 @@ import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
 import { Alert, AlertDescription } from "@/components/ui/alert";
-import { BusinessData } from "@/types/business";
-import { Upload, FileJson, AlertCircle, CheckCircle } from "lucide-react";
+import { Progress } from "@/components/ui/progress";
+import { ImportProgress } from "@/lib/backup-stream";
+import { Upload, FileJson, AlertCircle, CheckCircle, Loader2 } from "lucide-react";
 
 interface ImportDialogProps {
   open: boolean;
   onOpenChange: (open: boolean) => void;
-  onImport: (data: BusinessData) => void;
+  /** Lê o arquivo em streaming e envia em lotes; resolve false se a importação falhar */
+  onImport: (file: File, onProgress: (progress: ImportProgress) => void) => Promise<boolean>;
 }
 
+const isBackupFile = (file: File) =>
+  file.type === "application/json" || file.type === "application/x-ndjson" || /\.(nd)?json$/i.test(file.name);
+
 export const ImportDialog = ({ open, onOpenChange, onImport }: ImportDialogProps) => {
   const [file, setFile] = useState<File | null>(null);
   const [error, setError] = useState<string>("");
   const [success, setSuccess] = useState<boolean>(false);
+  const [importing, setImporting] = useState<boolean>(false);
+  const [progress, setProgress] = useState<ImportProgress | null>(null);
 
   const handleFileChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     const selectedFile = e.target.files?.[0];
     if (selectedFile) {
-      if (selectedFile.type === "application/json") {
+      if (isBackupFile(selectedFile)) {
         setFile(selectedFile);
         setError("");
         setSuccess(false);
       } else {
-        setError("Por favor, selecione um arquivo JSON válido.");
+        setError("Por favor, selecione um arquivo de backup válido (.ndjson ou .json).");
         setFile(null);
       }
     }
@@ -35,35 +42,17 @@ export const ImportDialog = ({ open, onOpenChange, onImport }: ImportDialogProps
   const handleImport = async () => {
     if (!file) return;
 
+    setImporting(true);
+    setProgress(null);
+    setError("");
     try {
-      const fileContent = await file.text();
-      const jsonData = JSON.parse(fileContent);
-      
-      // Validar estrutura básica do JSON
-      if (!jsonData.clientes || !jsonData.servicos || !jsonData.despesas || !jsonData.comissoes) {
-        throw new Error("Estrutura do arquivo JSON inválida. Verifique se contém as seções: clientes, servicos, despesas e comissoes.");
+      // O arquivo não é carregado inteiro: é lido e enviado em lotes
+      const ok = await onImport(file, setProgress);
+      if (!ok) {
+        setError("A importação foi interrompida. Importe o mesmo arquivo de novo para continuar de onde parou.");
+        return;
       }
-
-      // Garantir que os arrays existem
-      const businessData: BusinessData = {
-        clientes: jsonData.clientes || [],
-        servicos: jsonData.servicos || [],
-        despesas: jsonData.despesas || [],
-        comissoes: jsonData.comissoes || [],
-        metadata: {
-          exportDate: new Date().toISOString(),
-          version: "1.0",
-          totalClientes: jsonData.clientes?.length || 0,
-          totalServicos: jsonData.servicos?.length || 0,
-          totalDespesas: jsonData.despesas?.length || 0,
-          totalComissoes: jsonData.comissoes?.length || 0,
-          ...jsonData.metadata
-        }
-      };
-
-      onImport(businessData);
       setSuccess(true);
-      setError("");
       
       // Fechar o diálogo após 2 segundos
       setTimeout(() => {
@@ -74,8 +63,10 @@ export const ImportDialog = ({ open, onOpenChange, onImport }: ImportDialogProps
       
     } catch (err) {
       console.error("Erro ao importar arquivo:", err);
-      setError(err instanceof Error ? err.message : "Erro ao processar o arquivo JSON. Verifique o formato e tente novamente.");
+      setError(err instanceof Error ? err.message : "Erro ao processar o arquivo de backup. Verifique o formato e tente novamente.");
       setSuccess(false);
+    } finally {
+      setImporting(false);
     }
   };
 
@@ -85,25 +76,36 @@ export const ImportDialog = ({ open, onOpenChange, onImport }: ImportDialogProps
         <DialogHeader>
           <DialogTitle className="flex items-center space-x-2">
             <FileJson className="h-5 w-5 text-primary" />
-            <span>Importar Dados JSON</span>
+            <span>Importar Backup</span>
           </DialogTitle>
         </DialogHeader>
         
         <div className="space-y-4">
           <div className="space-y-2">
-            <Label htmlFor="file-input">Selecionar arquivo JSON</Label>
+            <Label htmlFor="file-input">Selecionar arquivo de backup</Label>
             <Input
               id="file-input"
               type="file"
-              accept=".json"
+              accept=".ndjson,.json"
               onChange={handleFileChange}
               className="cursor-pointer"
             />
             <p className="text-xs text-muted-foreground">
-              Selecione um arquivo JSON com os dados de clientes, serviços, despesas e comissões.
+              Selecione um backup (.ndjson ou .json) com os dados de clientes, serviços, despesas e comissões.
             </p>
           </div>
 
+          {importing && progress && (
+            <div className="space-y-1">
+              <Progress value={progress.total ? Math.min(100, (progress.done / progress.total) * 100) : 0} />
+              <p className="text-xs text-muted-foreground text-right">
+                {progress.total
+                  ? `${progress.done.toLocaleString('pt-BR')} de ${progress.total.toLocaleString('pt-BR')} registros`
+                  : `${progress.done.toLocaleString('pt-BR')} registros`}
+              </p>
+            </div>
+          )}
+
           {error && (
             <Alert variant="destructive">
               <AlertCircle className="h-4 w-4" />
@@ -123,16 +125,16 @@ export const ImportDialog = ({ open, onOpenChange, onImport }: ImportDialogProps
           <div className="flex space-x-2">
             <Button 
               onClick={handleImport} 
-              disabled={!file || success}
+              disabled={!file || success || importing}
               className="flex-1"
             >
-              <Upload className="h-4 w-4 mr-2" />
-              Importar Dados
+              {importing ? <Loader2 className="h-4 w-4 mr-2 animate-spin" /> : <Upload className="h-4 w-4 mr-2" />}
+              {importing ? "Importando..." : "Importar Dados"}
             </Button>
             <Button 
               variant="outline" 
               onClick={() => onOpenChange(false)}
-              disabled={success}
+              disabled={success || importing}
             >
               Cancelar
             </Button>
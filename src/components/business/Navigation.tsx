@@ -8,6 +8,7 @@ import {
   FileText, 
   Database 
 } from "lucide-react";
+import { perfMark } from "@/lib/perf";
 
 interface NavigationProps {
   activeTab: string;
@@ -35,7 +36,10 @@ export const Navigation = ({ activeTab, onTabChange }: NavigationProps) => {
               <Button
                 key={tab.id}
                 variant={activeTab === tab.id ? "default" : "ghost"}
-                onClick={() => onTabChange(tab.id)}
+                onClick={() => {
+                  perfMark("tab:start");
+                  onTabChange(tab.id);
+                }}
                 className={`flex items-center space-x-2 whitespace-nowrap px-6 py-3 ${
                   activeTab === tab.id 
                     ? "bg-primary text-primary-foreground" 
@@ -5,12 +5,13 @@ import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
 import { BusinessData, Servico } from "@/types/business";
 import { DollarSign } from "lucide-react";
+import { Cents, asCents, commissionCents, formatCents, fromCents, toCents } from "@/lib/money";
 
 interface ReceiveCommissionDialogProps {
   open: boolean;
   onOpenChange: (open: boolean) => void;
   service: Servico | null;
-  onConfirm: (service: Servico, amount: number) => void;
+  onConfirm: (service: Servico, amount: Cents) => void;
 }
 
 export const ReceiveCommissionDialog = ({ 
@@ -21,28 +22,17 @@ export const ReceiveCommissionDialog = ({
 }: ReceiveCommissionDialogProps) => {
   const [valorReceber, setValorReceber] = useState("");
 
-  // Função para arredondar valores monetários e evitar problemas de precisão
-  const roundCurrency = (value: number) => {
-    return Math.round(value * 100) / 100;
-  };
-
-  const formatCurrency = (value: number) => {
-    return new Intl.NumberFormat('pt-BR', {
-      style: 'currency',
-      currency: 'BRL'
-    }).format(value);
-  };
-
   const handleReceive = () => {
     if (!service || !valorReceber) return;
 
-    const valor = roundCurrency(parseFloat(valorReceber));
-    const comissaoTotal = roundCurrency((service.valor_bruto * service.porcentagem_comissao) / 100);
-    const comissaoAtual = roundCurrency(service.comissao_recebida);
+    // Tudo em centavos: a comparação com o máximo é exata
+    const valor = toCents(parseFloat(valorReceber));
+    const comissaoTotal = commissionCents(service.valor_bruto, service.porcentagem_comissao);
+    const comissaoAtual = service.comissao_recebida;
 
     // Não pode receber mais que o total da comissão
-    if (roundCurrency(comissaoAtual + valor) > comissaoTotal) {
-      alert(`Valor excede o máximo da comissão. Máximo disponível: ${formatCurrency(comissaoTotal - comissaoAtual)}`);
+    if (comissaoAtual + valor > comissaoTotal) {
+      alert(`Valor excede o máximo da comissão. Máximo disponível: ${formatCents(asCents(comissaoTotal - comissaoAtual))}`);
       return;
     }
 
@@ -53,9 +43,9 @@ export const ReceiveCommissionDialog = ({
 
   if (!service) return null;
 
-  const comissaoTotal = roundCurrency((service.valor_bruto * service.porcentagem_comissao) / 100);
-  const comissaoAtual = roundCurrency(service.comissao_recebida);
-  const valorRestante = roundCurrency(comissaoTotal - comissaoAtual);
+  const comissaoTotal = commissionCents(service.valor_bruto, service.porcentagem_comissao);
+  const comissaoAtual = service.comissao_recebida;
+  const valorRestante = asCents(comissaoTotal - comissaoAtual);
 
   return (
     <Dialog open={open} onOpenChange={onOpenChange}>
@@ -73,15 +63,15 @@ export const ReceiveCommissionDialog = ({
             <div className="space-y-2 text-sm">
               <div className="flex justify-between">
                 <span>Comissão Total:</span>
-                <span className="font-medium">{formatCurrency(comissaoTotal)}</span>
+                <span className="font-medium">{formatCents(comissaoTotal)}</span>
               </div>
               <div className="flex justify-between">
                 <span>Já Recebido:</span>
-                <span className="font-medium text-success">{formatCurrency(comissaoAtual)}</span>
+                <span className="font-medium text-success">{formatCents(comissaoAtual)}</span>
               </div>
               <div className="flex justify-between">
                 <span className="font-semibold">Valor Restante:</span>
-                <span className="font-semibold text-warning">{formatCurrency(valorRestante)}</span>
+                <span className="font-semibold text-warning">{formatCents(valorRestante)}</span>
               </div>
             </div>
           </div>
@@ -95,16 +85,16 @@ export const ReceiveCommissionDialog = ({
               placeholder="0,00"
               value={valorReceber}
               onChange={(e) => setValorReceber(e.target.value)}
-              max={valorRestante}
+              max={fromCents(valorRestante)}
             />
             <p className="text-xs text-muted-foreground mt-1">
-              Máximo: {formatCurrency(valorRestante)}
+              Máximo: {formatCents(valorRestante)}
             </p>
           </div>
 
           <div className="flex space-x-3">
             <Button 
-              onClick={() => setValorReceber(valorRestante.toString())}
+              onClick={() => setValorReceber(fromCents(valorRestante).toFixed(2))}
               variant="outline"
               className="flex-1"
             >
@@ -1,20 +1,26 @@
-import { useState } from "react";
+import { useState, useEffect, useRef } from "react";
 import { Dialog, DialogContent, DialogHeader, DialogTitle } from "@/components/ui/dialog";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@/components/ui/table";
 import { Badge } from "@/components/ui/badge";
 import { BusinessData } from "@/types/business";
-import { Download, FileText, DollarSign, Calendar } from "lucide-react";
+import { getBusinessIndex, findCliente } from "@/lib/business-index";
+import { Download, FileText, DollarSign, Calendar, Loader2 } from "lucide-react";
 import { useToast } from "@/hooks/use-toast";
-import html2canvas from "html2canvas";
-import jsPDF from "jspdf";
+import { perfMark } from "@/lib/perf";
+import { downloadPdf } from "@/lib/pdf-report";
+import { reportService, isAbortError } from "@/lib/report-service";
+import { dailyReceiptTotals, ViewerReportType } from "@/lib/reports";
+import { asCents, commissionCents, formatCents, sumCents } from "@/lib/money";
+
+type DailyReceipts = ReturnType<typeof dailyReceiptTotals>;
 
 interface ReportViewerProps {
   open: boolean;
   onOpenChange: (open: boolean) => void;
   data: BusinessData;
-  reportType: 'comissoes' | 'extrato' | 'despesas' | 'recebimentos' | null;
+  reportType: ViewerReportType | null;
   dataInicio?: string;
   dataFim?: string;
 }
@@ -22,13 +28,11 @@ interface ReportViewerProps {
 export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio, dataFim }: ReportViewerProps) => {
   const [isGeneratingPdf, setIsGeneratingPdf] = useState(false);
   const { toast } = useToast();
+  const index = getBusinessIndex(data);
 
-  const formatCurrency = (value: number) => {
-    return new Intl.NumberFormat('pt-BR', {
-      style: 'currency',
-      currency: 'BRL'
-    }).format(value);
-  };
+  useEffect(() => {
+    if (open) perfMark("report-viewer:open");
+  }, [open]);
 
   const formatDate = (dateString: string | null | undefined) => {
     if (!dateString) return '-';
@@ -53,60 +57,68 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
     }
   };
 
+  // Geração do PDF no worker de relatórios, com progresso e cancelamento
+  const [pdfProgress, setPdfProgress] = useState(0);
+  const pdfAbortRef = useRef<AbortController | null>(null);
+  useEffect(() => () => pdfAbortRef.current?.abort(), []);
+
+  // Totais diários de recebimento calculados no worker
+  const [recebimentos, setRecebimentos] = useState<DailyReceipts | null>(null);
+  useEffect(() => {
+    if (!open || reportType !== 'recebimentos') return;
+    let stale = false;
+    setRecebimentos(null);
+    reportService.setData(data);
+    reportService.run<DailyReceipts>({ type: "daily-receipts", dataInicio, dataFim })
+      .then(result => { if (!stale) setRecebimentos(result); })
+      .catch(err => console.error(err));
+    return () => { stale = true; };
+  }, [open, reportType, data, dataInicio, dataFim]);
+
   const generatePDF = async () => {
+    if (!reportType) return;
+    if (pdfAbortRef.current) {
+      pdfAbortRef.current.abort();
+      return;
+    }
+    const controller = new AbortController();
+    pdfAbortRef.current = controller;
+    setPdfProgress(0);
     setIsGeneratingPdf(true);
     try {
-      const element = document.getElementById('report-content');
-      if (!element) return;
-
-      const canvas = await html2canvas(element, {
-        scale: 2,
-        useCORS: true,
-        backgroundColor: 'transparent'
-      });
-
-      const imgData = canvas.toDataURL('image/png');
-      const pdf = new jsPDF('p', 'mm', 'a4');
-      
-      const imgWidth = 210;
-      const pageHeight = 295;
-      const imgHeight = (canvas.height * imgWidth) / canvas.width;
-      let heightLeft = imgHeight;
-
-      let position = 0;
-
-      pdf.addImage(imgData, 'PNG', 0, position, imgWidth, imgHeight);
-      heightLeft -= pageHeight;
-
-      while (heightLeft >= 0) {
-        position = heightLeft - imgHeight;
-        pdf.addPage();
-        pdf.addImage(imgData, 'PNG', 0, position, imgWidth, imgHeight);
-        heightLeft -= pageHeight;
-      }
+      reportService.setData(data);
+      const pdf = await reportService.run<ArrayBuffer>(
+        { type: "viewer-pdf", reportType, generatedAt: formatDate(new Date().toISOString()), dataInicio, dataFim },
+        {
+          signal: controller.signal,
+          onProgress: (done, total) => setPdfProgress(total ? Math.round((done / total) * 100) : 100)
+        }
+      );
 
       const fileName = `${reportType}_${new Date().toISOString().split('T')[0]}.pdf`;
-      pdf.save(fileName);
+      downloadPdf(pdf, fileName);
 
       toast({
         title: "PDF gerado com sucesso!",
         description: `Relatório salvo como ${fileName}`
       });
     } catch (error) {
+      if (isAbortError(error)) return;
       toast({
         title: "Erro ao gerar PDF",
         description: "Ocorreu um erro ao gerar o arquivo PDF.",
         variant: "destructive"
       });
     } finally {
+      pdfAbortRef.current = null;
       setIsGeneratingPdf(false);
     }
   };
 
   const renderComissoesReport = () => {
-    const totalComissoes = data.servicos.reduce((acc, s) => acc + (s.valor_bruto * s.porcentagem_comissao / 100), 0);
-    const comissoesRecebidas = data.servicos.reduce((acc, s) => acc + s.comissao_recebida, 0);
-    const comissoesPendentes = totalComissoes - comissoesRecebidas;
+    const totalComissoes = sumCents(data.servicos, s => commissionCents(s.valor_bruto, s.porcentagem_comissao));
+    const comissoesRecebidas = sumCents(data.servicos, s => s.comissao_recebida);
+    const comissoesPendentes = asCents(totalComissoes - comissoesRecebidas);
 
     return (
       <div className="space-y-6">
@@ -121,7 +133,7 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
             <CardContent className="p-4">
               <div className="text-center">
                 <DollarSign className="h-8 w-8 mx-auto text-primary mb-2" />
-                <p className="text-2xl font-bold">{formatCurrency(totalComissoes)}</p>
+                <p className="text-2xl font-bold">{formatCents(totalComissoes)}</p>
                 <p className="text-sm text-muted-foreground">Total de Comissões</p>
               </div>
             </CardContent>
@@ -130,7 +142,7 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
           <Card>
             <CardContent className="p-4">
               <div className="text-center">
-                <p className="text-2xl font-bold" style={{ color: 'hsl(var(--success))' }}>{formatCurrency(comissoesRecebidas)}</p>
+                <p className="text-2xl font-bold" style={{ color: 'hsl(var(--success))' }}>{formatCents(comissoesRecebidas)}</p>
                 <p className="text-sm text-muted-foreground">Comissões Recebidas</p>
               </div>
             </CardContent>
@@ -139,7 +151,7 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
           <Card>
             <CardContent className="p-4">
               <div className="text-center">
-                <p className="text-2xl font-bold" style={{ color: 'hsl(var(--warning))' }}>{formatCurrency(comissoesPendentes)}</p>
+                <p className="text-2xl font-bold" style={{ color: 'hsl(var(--warning))' }}>{formatCents(comissoesPendentes)}</p>
                 <p className="text-sm text-muted-foreground">Comissões Pendentes</p>
               </div>
             </CardContent>
@@ -193,13 +205,13 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
               <TableRow key={servico.id}>
                 <TableCell>{formatDate(servico.data_servico)}</TableCell>
                 <TableCell>
-                  {data.clientes.find(c => c.id === servico.cliente_id)?.nome || 'Cliente não encontrado'}
+                  {findCliente(index, servico.cliente_id)?.nome || 'Cliente não encontrado'}
                 </TableCell>
                 <TableCell>{servico.veiculo} - {servico.placa}</TableCell>
-                <TableCell>{formatCurrency(servico.valor_bruto)}</TableCell>
+                <TableCell>{formatCents(servico.valor_bruto)}</TableCell>
                 <TableCell>{servico.porcentagem_comissao}%</TableCell>
                  <TableCell className="font-medium" style={{ color: 'hsl(var(--success))' }}>
-                   {formatCurrency(servico.comissao_recebida)}
+                   {formatCents(servico.comissao_recebida)}
                  </TableCell>
                 <TableCell>
                   <Badge variant={servico.quitado ? "default" : "secondary"}>
@@ -215,9 +227,9 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
   };
 
   const renderDespesasReport = () => {
-    const totalDespesas = data.despesas.reduce((acc, d) => acc + d.valor, 0);
-    const despesasPagas = data.despesas.filter(d => d.pago).reduce((acc, d) => acc + d.valor, 0);
-    const despesasPendentes = totalDespesas - despesasPagas;
+    const totalDespesas = sumCents(data.despesas, d => d.valor);
+    const despesasPagas = sumCents(data.despesas.filter(d => d.pago), d => d.valor);
+    const despesasPendentes = asCents(totalDespesas - despesasPagas);
 
     return (
       <div className="space-y-6">
@@ -231,7 +243,7 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
           <Card>
             <CardContent className="p-4">
               <div className="text-center">
-                <p className="text-2xl font-bold">{formatCurrency(totalDespesas)}</p>
+                <p className="text-2xl font-bold">{formatCents(totalDespesas)}</p>
                 <p className="text-sm text-muted-foreground">Total de Despesas</p>
               </div>
             </CardContent>
@@ -240,7 +252,7 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
           <Card>
             <CardContent className="p-4">
               <div className="text-center">
-                <p className="text-2xl font-bold" style={{ color: 'hsl(var(--success))' }}>{formatCurrency(despesasPagas)}</p>
+                <p className="text-2xl font-bold" style={{ color: 'hsl(var(--success))' }}>{formatCents(despesasPagas)}</p>
                 <p className="text-sm text-muted-foreground">Despesas Pagas</p>
               </div>
             </CardContent>
@@ -249,7 +261,7 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
           <Card>
             <CardContent className="p-4">
               <div className="text-center">
-                <p className="text-2xl font-bold" style={{ color: 'hsl(var(--destructive))' }}>{formatCurrency(despesasPendentes)}</p>
+                <p className="text-2xl font-bold" style={{ color: 'hsl(var(--destructive))' }}>{formatCents(despesasPendentes)}</p>
                 <p className="text-sm text-muted-foreground">Despesas Pendentes</p>
               </div>
             </CardContent>
@@ -269,7 +281,7 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
             {[...data.despesas].sort((a, b) => new Date(a.data_vencimento).getTime() - new Date(b.data_vencimento).getTime()).map((despesa) => (
               <TableRow key={despesa.id}>
                 <TableCell>{despesa.descricao}</TableCell>
-                <TableCell>{formatCurrency(despesa.valor)}</TableCell>
+                <TableCell>{formatCents(despesa.valor)}</TableCell>
                 <TableCell>{formatDate(despesa.data_vencimento)}</TableCell>
                 <TableCell>
                   <Badge variant={despesa.pago ? "default" : "destructive"}>
@@ -285,33 +297,15 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
   };
 
   const renderRecebimentosReport = () => {
-    // 1. Filter commissions that are received
-    const receivedCommissions = data.comissoes.filter(c => c.status === 'recebido');
-
-    // 2. Filter by date range if provided
-    const filteredByDate = receivedCommissions.filter(c => {
-      if (!dataInicio || !dataFim) return true; // If no dates, include all received
-      // Normalize dates to avoid timezone issues. Compare YYYY-MM-DD strings.
-      const receiptDate = c.data_recebimento.substring(0, 10);
-      return receiptDate >= dataInicio && receiptDate <= dataFim;
-    });
-
-    // 3. Group by date and sum the values
-    const groupedByDate = filteredByDate.reduce((acc, comissao) => {
-      const date = comissao.data_recebimento.substring(0, 10);
-      if (!acc[date]) {
-        acc[date] = 0;
-      }
-      acc[date] += comissao.valor;
-      return acc;
-    }, {} as Record<string, number>);
-
-    // 4. Convert the grouped object to an array and sort by date
-    const dailyTotals = Object.entries(groupedByDate)
-      .map(([date, total]) => ({ date, total }))
-      .sort((a, b) => a.date.localeCompare(b.date));
-
-    const grandTotal = dailyTotals.reduce((acc, item) => acc + item.total, 0);
+    if (!recebimentos) {
+      return (
+        <div className="flex items-center justify-center py-12 text-muted-foreground">
+          <Loader2 className="h-5 w-5 mr-2 animate-spin" />
+          Calculando recebimentos...
+        </div>
+      );
+    }
+    const { dailyTotals, grandTotal } = recebimentos;
 
     return (
       <div className="space-y-6">
@@ -327,7 +321,7 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
           <CardContent className="p-4">
             <div className="text-center">
               <p className="text-sm text-muted-foreground">Total Recebido no Período</p>
-              <p className="text-3xl font-bold" style={{ color: 'hsl(var(--success))' }}>{formatCurrency(grandTotal)}</p>
+              <p className="text-3xl font-bold" style={{ color: 'hsl(var(--success))' }}>{formatCents(grandTotal)}</p>
             </div>
           </CardContent>
         </Card>
@@ -345,7 +339,7 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
                 <TableRow key={date}>
                   <TableCell>{formatDate(date)}</TableCell>
                   <TableCell className="text-right font-medium" style={{ color: 'hsl(var(--success))' }}>
-                    {formatCurrency(total)}
+                    {formatCents(total)}
                   </TableCell>
                 </TableRow>
               ))
@@ -390,11 +384,10 @@ export const ReportViewer = ({ open, onOpenChange, data, reportType, dataInicio,
             </div>
             <Button 
               onClick={generatePDF}
-              disabled={isGeneratingPdf}
               className="ml-4"
             >
               <Download className="h-4 w-4 mr-2" />
-              {isGeneratingPdf ? "Gerando PDF..." : "Salvar como PDF"}
+              {isGeneratingPdf ? `Gerando PDF ${pdfProgress}% - Cancelar` : "Salvar como PDF"}
             </Button>
           </DialogTitle>
         </DialogHeader>
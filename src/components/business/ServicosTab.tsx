@@ -7,9 +7,16 @@ import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@
 import { Textarea } from "@/components/ui/textarea";
 import { Badge } from "@/components/ui/badge";
 import { BusinessData, Servico } from "@/types/business";
+import { getBusinessIndex, findCliente } from "@/lib/business-index";
 import { Plus, Car, Calendar, Edit, Trash2 } from "lucide-react";
 import { EditServiceDialog } from "./EditServiceDialog";
 import { fixTimezoneDate } from "@/lib/utils";
+import { useVirtualRows } from "@/hooks/use-virtual-rows";
+import { selectServicosOrdenados } from "@/lib/selectors";
+import { asCents, commissionCents, formatCents, toCents } from "@/lib/money";
+
+// Altura estimada de cada cartão da lista, em px, com o espaço até o próximo (a real é medida)
+const SERVICE_ROW_HEIGHT = 200;
 
 interface ServicosTabProps {
   data: BusinessData;
@@ -29,13 +36,6 @@ export const ServicosTab = ({ data, onUpdateData }: ServicosTabProps) => {
     observacao: ""
   });
 
-  const formatCurrency = (value: number) => {
-    return new Intl.NumberFormat('pt-BR', {
-      style: 'currency',
-      currency: 'BRL'
-    }).format(value);
-  };
-
   const formatDate = (dateString: string) => {
     return new Date(dateString).toLocaleDateString('pt-BR', {
       day: '2-digit',
@@ -61,7 +61,7 @@ export const ServicosTab = ({ data, onUpdateData }: ServicosTabProps) => {
       return;
     }
 
-    const valorBruto = parseFloat(formData.valor_bruto);
+    const valorBruto = toCents(parseFloat(formData.valor_bruto));
     const porcentagemComissao = parseFloat(formData.porcentagem_comissao);
     
     // Validação do percentual de comissão
@@ -69,7 +69,7 @@ export const ServicosTab = ({ data, onUpdateData }: ServicosTabProps) => {
       alert("O percentual de comissão deve estar entre 0% e 100%.");
       return;
     }
-    const comissaoTotal = (valorBruto * porcentagemComissao) / 100;
+    const comissaoTotal = commissionCents(valorBruto, porcentagemComissao);
 
     const clienteIdValue = /^\d+$/.test(formData.cliente_id)
       ? Number(formData.cliente_id)
@@ -84,9 +84,9 @@ export const ServicosTab = ({ data, onUpdateData }: ServicosTabProps) => {
       valor_bruto: valorBruto,
       porcentagem_comissao: porcentagemComissao,
       observacao: formData.observacao,
-      valor_pago: 0,
+      valor_pago: asCents(0),
       quitado: false,
-      comissao_recebida: 0
+      comissao_recebida: asCents(0)
     };
 
     const updatedData = {
@@ -112,13 +112,14 @@ export const ServicosTab = ({ data, onUpdateData }: ServicosTabProps) => {
   };
 
   const getClienteName = (clienteId: number) => {
-    const cliente = data.clientes.find(c => c.id === clienteId);
+    const cliente = findCliente(getBusinessIndex(data), clienteId);
     return cliente?.nome || "Cliente não encontrado";
   };
 
-  const servicosOrdenados = [...data.servicos].sort((a, b) => 
-    new Date(b.data_servico).getTime() - new Date(a.data_servico).getTime()
-  );
+  const servicosOrdenados = selectServicosOrdenados(data);
+
+  // Só os cartões visíveis são montados; cada um é medido depois de renderizado
+  const lista = useVirtualRows(servicosOrdenados.length, SERVICE_ROW_HEIGHT);
 
   const deleteService = (serviceId: number | string) => {
     const updatedServices = data.servicos.filter(s => s.id !== serviceId);
@@ -134,7 +135,7 @@ export const ServicosTab = ({ data, onUpdateData }: ServicosTabProps) => {
   };
 
   const getStatusText = (servico: Servico) => {
-    const comissaoTotal = servico.valor_bruto * servico.porcentagem_comissao / 100;
+    const comissaoTotal = commissionCents(servico.valor_bruto, servico.porcentagem_comissao);
     
     if (servico.comissao_recebida === 0) {
       return "Pendente";
@@ -146,7 +147,7 @@ export const ServicosTab = ({ data, onUpdateData }: ServicosTabProps) => {
   };
 
   const getStatusVariant = (servico: Servico) => {
-    const comissaoTotal = servico.valor_bruto * servico.porcentagem_comissao / 100;
+    const comissaoTotal = commissionCents(servico.valor_bruto, servico.porcentagem_comissao);
     
     if (servico.comissao_recebida === 0) {
       return "secondary";
@@ -158,7 +159,7 @@ export const ServicosTab = ({ data, onUpdateData }: ServicosTabProps) => {
   };
 
   const getStatusColor = (servico: Servico) => {
-    const comissaoTotal = servico.valor_bruto * servico.porcentagem_comissao / 100;
+    const comissaoTotal = commissionCents(servico.valor_bruto, servico.porcentagem_comissao);
     
     if (servico.comissao_recebida === 0) {
       return "bg-warning/20 text-warning";
@@ -284,7 +285,7 @@ export const ServicosTab = ({ data, onUpdateData }: ServicosTabProps) => {
                 <div className="md:col-span-2 p-4 bg-accent/10 rounded-lg">
                   <p className="text-sm text-muted-foreground mb-2">Valor da Comissão Calculado:</p>
                   <p className="text-2xl font-bold text-accent">
-                    {formatCurrency((parseFloat(formData.valor_bruto) * parseFloat(formData.porcentagem_comissao)) / 100)}
+                    {formatCents(commissionCents(toCents(parseFloat(formData.valor_bruto)), parseFloat(formData.porcentagem_comissao)))}
                   </p>
                 </div>
               )}
@@ -311,82 +312,84 @@ export const ServicosTab = ({ data, onUpdateData }: ServicosTabProps) => {
           </CardTitle>
         </CardHeader>
         <CardContent>
-          <div className="space-y-4">
-            {servicosOrdenados.map((servico) => (
-              <div key={servico.id} className="p-4 border rounded-lg hover:shadow-soft transition-shadow">
-                <div className="flex items-center justify-between mb-3">
-                  <div className="flex items-center space-x-3">
-                    <div className="p-2 bg-primary/10 rounded-full">
-                      <Car className="h-4 w-4 text-primary" />
+          <div ref={lista.containerRef} style={{ paddingTop: lista.paddingTop, paddingBottom: lista.paddingBottom }}>
+            {servicosOrdenados.slice(lista.start, lista.end).map((servico, i) => (
+              <div key={servico.id} ref={lista.measureRef} data-index={lista.start + i} className="pb-4">
+                <div className="p-4 border rounded-lg hover:shadow-soft transition-shadow">
+                  <div className="flex items-center justify-between mb-3">
+                    <div className="flex items-center space-x-3 min-w-0">
+                      <div className="p-2 bg-primary/10 rounded-full">
+                        <Car className="h-4 w-4 text-primary" />
+                      </div>
+                      <div className="min-w-0">
+                        <h3 className="font-semibold break-words">{servico.veiculo} - {servico.placa}</h3>
+                        <p className="text-sm text-muted-foreground break-words">
+                          {getClienteName(servico.cliente_id)}
+                        </p>
+                      </div>
                     </div>
-                    <div>
-                      <h3 className="font-semibold">{servico.veiculo} - {servico.placa}</h3>
-                      <p className="text-sm text-muted-foreground">
-                        {getClienteName(servico.cliente_id)}
-                      </p>
+                    <div className="flex items-center space-x-2">
+                       <Badge variant={getStatusVariant(servico)} className={getStatusColor(servico)}>
+                         {getStatusText(servico)}
+                       </Badge>
+                      <Button 
+                        variant="ghost" 
+                        size="sm"
+                        onClick={() => setEditingService(servico)}
+                      >
+                        <Edit className="h-4 w-4" />
+                      </Button>
+                      <Button 
+                        variant="ghost" 
+                        size="sm" 
+                        className="text-destructive"
+                        onClick={() => deleteService(servico.id)}
+                      >
+                        <Trash2 className="h-4 w-4" />
+                      </Button>
                     </div>
                   </div>
-                  <div className="flex items-center space-x-2">
-                     <Badge variant={getStatusVariant(servico)} className={getStatusColor(servico)}>
-                       {getStatusText(servico)}
-                     </Badge>
-                    <Button 
-                      variant="ghost" 
-                      size="sm"
-                      onClick={() => setEditingService(servico)}
-                    >
-                      <Edit className="h-4 w-4" />
-                    </Button>
-                    <Button 
-                      variant="ghost" 
-                      size="sm" 
-                      className="text-destructive"
-                      onClick={() => deleteService(servico.id)}
-                    >
-                      <Trash2 className="h-4 w-4" />
-                    </Button>
-                  </div>
-                </div>
 
-                <div className="grid grid-cols-2 md:grid-cols-4 gap-4 text-sm">
-                  <div>
-                    <p className="text-muted-foreground text-xs">Data do Serviço</p>
-                    <div className="font-semibold text-base text-primary">
-                      {formatDate(servico.data_servico)}
+                  <div className="grid grid-cols-2 md:grid-cols-4 gap-4 text-sm">
+                    <div>
+                      <p className="text-muted-foreground text-xs">Data do Serviço</p>
+                      <div className="font-semibold text-base text-primary">
+                        {formatDate(servico.data_servico)}
+                      </div>
+                      <p className="text-xs text-muted-foreground">
+                        {formatDateExtended(servico.data_servico)}
+                      </p>
                     </div>
-                    <p className="text-xs text-muted-foreground">
-                      {formatDateExtended(servico.data_servico)}
-                    </p>
-                  </div>
-                  <div>
-                    <p className="text-muted-foreground">Valor Bruto</p>
-                    <p className="font-medium">{formatCurrency(servico.valor_bruto)}</p>
+                    <div>
+                      <p className="text-muted-foreground">Valor Bruto</p>
+                      <p className="font-medium">{formatCents(servico.valor_bruto)}</p>
+                    </div>
+                    <div>
+                      <p className="text-muted-foreground">Comissão ({servico.porcentagem_comissao}%)</p>
+                      <p className="font-medium text-success">
+                        {formatCents(commissionCents(servico.valor_bruto, servico.porcentagem_comissao))}
+                      </p>
+                    </div>
+                     <div>
+                       <p className="text-muted-foreground">Comissão Recebida</p>
+                       <p className="font-medium">
+                         {servico.comissao_recebida > 0 ? formatCents(servico.comissao_recebida) : "R$ 0,00"}
+                       </p>
+                       {servico.comissao_recebida > 0 && servico.comissao_recebida < commissionCents(servico.valor_bruto, servico.porcentagem_comissao) && (
+                         <p className="text-xs text-warning">
+                           Parcial - Falta: {formatCents(asCents(commissionCents(servico.valor_bruto, servico.porcentagem_comissao) - servico.comissao_recebida))}
+                         </p>
+                       )}
+                     </div>
                   </div>
-                  <div>
-                    <p className="text-muted-foreground">Comissão ({servico.porcentagem_comissao}%)</p>
-                    <p className="font-medium text-success">
-                      {formatCurrency((servico.valor_bruto * servico.porcentagem_comissao) / 100)}
+
+                  {servico.observacao && (
+                    <p className="mt-3 px-2 py-1 bg-muted/50 rounded text-sm whitespace-pre-wrap break-words">
+                      <span className="text-muted-foreground">Observações: </span>
+                      {servico.observacao}
                     </p>
-                  </div>
-                   <div>
-                     <p className="text-muted-foreground">Comissão Recebida</p>
-                     <p className="font-medium">
-                       {servico.comissao_recebida > 0 ? formatCurrency(servico.comissao_recebida) : "R$ 0,00"}
-                     </p>
-                     {servico.comissao_recebida > 0 && servico.comissao_recebida < (servico.valor_bruto * servico.porcentagem_comissao / 100) && (
-                       <p className="text-xs text-warning">
-                         Parcial - Falta: {formatCurrency((servico.valor_bruto * servico.porcentagem_comissao / 100) - servico.comissao_recebida)}
-                       </p>
-                     )}
-                   </div>
+                  )}
                 </div>
-
-                {servico.observacao && (
-                  <div className="mt-3 p-2 bg-muted/50 rounded">
-                    <p className="text-sm text-muted-foreground">Observações:</p>
-                    <p className="text-sm">{servico.observacao}</p>
-                  </div>
-                )}
               </div>
             ))}
           </div>
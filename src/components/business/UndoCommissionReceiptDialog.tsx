@@ -10,6 +10,7 @@ import {
 import { Button } from "@/components/ui/button";
 import { Servico } from "@/types/business";
 import { Undo2, AlertTriangle } from "lucide-react";
+import { formatCents } from "@/lib/money";
 
 interface UndoCommissionReceiptDialogProps {
   open: boolean;
@@ -26,13 +27,6 @@ export const UndoCommissionReceiptDialog = ({
 }: UndoCommissionReceiptDialogProps) => {
   if (!service) return null;
 
-  const formatCurrency = (value: number) => {
-    return new Intl.NumberFormat("pt-BR", {
-      style: "currency",
-      currency: "BRL",
-    }).format(value);
-  };
-
   const handleConfirm = () => {
     onConfirm(service.id);
     onOpenChange(false);
@@ -67,7 +61,7 @@ export const UndoCommissionReceiptDialog = ({
               <div className="flex justify-between">
                 <span>Valor Recebido a ser Desfeito:</span>
                 <span className="font-medium text-destructive">
-                  {formatCurrency(service.comissao_recebida)}
+                  {formatCents(service.comissao_recebida)}
                 </span>
               </div>
             </div>
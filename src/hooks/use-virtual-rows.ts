@@ -0,0 +1,153 @@
+import * as React from "react"
+
+const DEFAULT_OVERSCAN = 6
+const INITIAL_ROWS = 20
+
+// Maior i com offsets[i] <= y (busca binária nas posições acumuladas)
+function rowAt(offsets: number[], y: number) {
+  let lo = 0
+  let hi = offsets.length - 1
+  while (lo < hi) {
+    const mid = (lo + hi + 1) >> 1
+    if (offsets[mid] <= y) lo = mid
+    else hi = mid - 1
+  }
+  return lo
+}
+
+/**
+ * Renderização em janela para listas longas com linhas de altura variável.
+ *
+ * A rolagem continua sendo a da página: o hook mede a posição do contêiner
+ * na viewport e devolve só o intervalo [start, end) de linhas visíveis (mais
+ * uma margem), com os espaçadores que preservam a altura total da lista.
+ *
+ * Cada linha montada recebe `data-index` e `ref={measureRef}`; a altura real
+ * (com o espaçamento até a próxima) substitui `estimatedHeight`, que só vale
+ * para as linhas ainda não vistas.
+ */
+export function useVirtualRows<T extends HTMLElement = HTMLDivElement>(
+  count: number,
+  estimatedHeight: number,
+  overscan = DEFAULT_OVERSCAN
+) {
+  const containerRef = React.useRef<T>(null)
+  const rowsRef = React.useRef(new Set<HTMLElement>())
+  const observerRef = React.useRef<ResizeObserver | null>(null)
+  const [heights, setHeights] = React.useState(() => new Map<number, number>())
+  const [range, setRange] = React.useState({ start: 0, end: INITIAL_ROWS })
+
+  const measure = React.useCallback((elements: Iterable<HTMLElement>) => {
+    const sizes: [number, number][] = []
+    for (const el of elements) {
+      if (!el.isConnected) {
+        observerRef.current?.unobserve(el)
+        rowsRef.current.delete(el)
+        continue
+      }
+      const index = Number(el.dataset.index)
+      if (Number.isInteger(index)) sizes.push([index, el.getBoundingClientRect().height])
+    }
+    if (sizes.length === 0) return
+    setHeights(prev => {
+      let next = prev
+      for (const [index, height] of sizes) {
+        if (prev.get(index) === height) continue
+        if (next === prev) next = new Map(prev)
+        next.set(index, height)
+      }
+      return next
+    })
+  }, [])
+
+  const measureRef = React.useCallback((el: HTMLElement | null) => {
+    if (!el) return
+    rowsRef.current.add(el)
+    observerRef.current?.observe(el)
+  }, [])
+
+  // Mudanças de tamanho sem nova renderização (quebra de linha ao redimensionar, fontes)
+  React.useEffect(() => {
+    if (typeof ResizeObserver === "undefined") return
+    const observer = new ResizeObserver(entries => measure(entries.map(e => e.target as HTMLElement)))
+    rowsRef.current.forEach(el => observer.observe(el))
+    observerRef.current = observer
+    return () => {
+      observer.disconnect()
+      observerRef.current = null
+    }
+  }, [measure])
+
+  // A cada renderização: a mesma linha (mesma key) pode ter mudado de índice ou de conteúdo
+  React.useLayoutEffect(() => {
+    measure(rowsRef.current)
+  })
+
+  // offsets[i] = topo da linha i; offsets[count] = altura total
+  const offsets = React.useMemo(() => {
+    const out = new Array<number>(count + 1)
+    out[0] = 0
+    for (let i = 0; i < count; i++) out[i + 1] = out[i] + (heights.get(i) ?? estimatedHeight)
+    return out
+  }, [count, estimatedHeight, heights])
+
+  React.useEffect(() => {
+    let frame = 0
+
+    const update = () => {
+      frame = 0
+      const container = containerRef.current
+      if (!container) return
+      const top = container.getBoundingClientRect().top
+      const start = Math.min(count, Math.max(0, rowAt(offsets, -top) - overscan))
+      const end = Math.min(count, Math.max(start, rowAt(offsets, window.innerHeight - top) + 1 + overscan))
+      setRange(prev => (prev.start === start && prev.end === end ? prev : { start, end }))
+    }
+    const schedule = () => {
+      if (!frame) frame = requestAnimationFrame(update)
+    }
+
+    update()
+    // capture: também percebe rolagem de ancestrais que não sejam a janela
+    window.addEventListener("scroll", schedule, { passive: true, capture: true })
+    window.addEventListener("resize", schedule)
+    // Conteúdo acima da lista que abre/fecha (formulários) desloca a lista sem rolagem
+    const observer = typeof ResizeObserver !== "undefined" ? new ResizeObserver(schedule) : null
+    observer?.observe(document.body)
+
+    return () => {
+      cancelAnimationFrame(frame)
+      window.removeEventListener("scroll", schedule, { capture: true })
+      window.removeEventListener("resize", schedule)
+      observer?.disconnect()
+    }
+  }, [count, offsets, overscan])
+
+  const start = Math.min(range.start, count)
+  const end = Math.min(Math.max(range.end, start), count)
+
+  return {
+    containerRef,
+    measureRef,
+    start,
+    end,
+    paddingTop: offsets[start],
+    paddingBottom: offsets[count] - offsets[end],
+  }
+}
+
+/** Largura do conteúdo do elemento, acompanhada por ResizeObserver (0 até a primeira medição). */
+export function useElementWidth<T extends HTMLElement = HTMLDivElement>() {
+  const ref = React.useRef<T>(null)
+  const [width, setWidth] = React.useState(0)
+
+  React.useEffect(() => {
+    const el = ref.current
+    if (!el || typeof ResizeObserver === "undefined") return
+    const observer = new ResizeObserver(([entry]) => setWidth(entry.contentRect.width))
+    observer.observe(el)
+    return () => observer.disconnect()
+  }, [])
+
+  return { ref, width }
+}
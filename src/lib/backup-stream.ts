@@ -0,0 +1,362 @@
+import { BusinessData } from "@/types/business";
+import { rowInReais } from "@/lib/money";
+
+/**
+ * Backup em NDJSON, lido e escrito em blocos.
+ *
+ * A primeira linha é um cabeçalho com os totais; depois vem um registro por
+ * linha, tabela por tabela, na ordem em que o import precisa gravá-los
+ * (clientes antes dos serviços que os referenciam):
+ *
+ *   {"type":"header","format":"backup-ndjson","version":1,"metadata":{...}}
+ *   {"table":"clientes","row":{...}}
+ *
+ * Os valores em dinheiro vão em reais, como no banco e em `/api/backup`
+ * (no app eles ficam em centavos). Nem a exportação nem a importação montam
+ * o arquivo inteiro como string, o que derrubava a aba em celulares com
+ * pouca memória. Backups antigos (um
+ * único JSON) continuam sendo aceitos na importação.
+ */
+
+export const BACKUP_TABLES = ["clientes", "servicos", "despesas", "comissoes"] as const;
+export type BackupTable = typeof BACKUP_TABLES[number];
+
+const FORMAT = "backup-ndjson";
+const FORMAT_VERSION = 1;
+// Linhas codificadas por bloco do stream de exportação
+const LINES_PER_CHUNK = 500;
+// Linhas por POST em /api/import; o servidor grava em lotes do mesmo tamanho
+export const IMPORT_BATCH_SIZE = 1000;
+// Tentativas por lote antes de interromper (a importação pode ser retomada depois)
+const MAX_ATTEMPTS = 3;
+// Importação em andamento; um novo import do mesmo arquivo retoma de onde parou
+const SESSION_KEY = "backup-import-session";
+
+export interface BackupHeader {
+  type: "header";
+  format: string;
+  version: number;
+  metadata: BusinessData["metadata"];
+}
+
+export interface BackupRowError {
+  table: string;
+  /** Posição do registro dentro da sua tabela no arquivo */
+  index: number;
+  message: string;
+}
+
+export interface ImportProgress {
+  /** Linhas já gravadas no servidor, incluindo as de lotes pulados numa retomada */
+  done: number;
+  /** Total informado no cabeçalho; null quando o arquivo não traz os totais */
+  total: number | null;
+}
+
+export interface ImportOutcome {
+  counts: Record<BackupTable, number>;
+  errors: BackupRowError[];
+  /** Lotes que o servidor já tinha gravado numa tentativa anterior */
+  skippedChunks: number;
+}
+
+export const backupFileName = (date = new Date()) =>
+  `backup-sistema-financeiro-${date.toISOString().split("T")[0]}.ndjson`;
+
+const isBackupTable = (value: unknown): value is BackupTable =>
+  typeof value === "string" && (BACKUP_TABLES as readonly string[]).includes(value);
+
+function backupMetadata(data: BusinessData): BusinessData["metadata"] {
+  return {
+    ...data.metadata,
+    exportDate: new Date().toISOString(),
+    totalClientes: data.clientes.length,
+    totalServicos: data.servicos.length,
+    totalDespesas: data.despesas.length,
+    totalComissoes: data.comissoes.length,
+    version: "1.0",
+  };
+}
+
+/** Gera o backup sob demanda: cada `pull` codifica só o próximo bloco de linhas. */
+export function backupStream(data: BusinessData): ReadableStream<Uint8Array> {
+  const encoder = new TextEncoder();
+  let headerSent = false;
+  let tableIndex = 0;
+  let rowIndex = 0;
+
+  return new ReadableStream<Uint8Array>({
+    pull(controller) {
+      if (!headerSent) {
+        headerSent = true;
+        const header: BackupHeader = { type: "header", format: FORMAT, version: FORMAT_VERSION, metadata: backupMetadata(data) };
+        controller.enqueue(encoder.encode(JSON.stringify(header) + "\n"));
+        return;
+      }
+      while (tableIndex < BACKUP_TABLES.length) {
+        const table = BACKUP_TABLES[tableIndex];
+        const rows: object[] = data[table];
+        if (rowIndex >= rows.length) {
+          tableIndex++;
+          rowIndex = 0;
+          continue;
+        }
+        const end = Math.min(rows.length, rowIndex + LINES_PER_CHUNK);
+        let chunk = "";
+        for (; rowIndex < end; rowIndex++) chunk += JSON.stringify({ table, row: rowInReais(table, rows[rowIndex]) }) + "\n";
+        controller.enqueue(encoder.encode(chunk));
+        return;
+      }
+      controller.close();
+    },
+  });
+}
+
+/**
+ * Grava o backup em disco. Com a File System Access API o stream vai direto
+ * para o arquivo; sem ela, vira um Blob (que o navegador mantém fora do heap
+ * do JS) e é baixado. Devolve false se o usuário cancelar a escolha do arquivo.
+ */
+export async function saveBackup(data: BusinessData, fileName = backupFileName()): Promise<boolean> {
+  const showSaveFilePicker = (window as any).showSaveFilePicker;
+  if (typeof showSaveFilePicker === "function") {
+    let handle: any = null;
+    try {
+      handle = await showSaveFilePicker({
+        suggestedName: fileName,
+        types: [{ description: "Backup NDJSON", accept: { "application/x-ndjson": [".ndjson"] } }],
+      });
+    } catch (err: any) {
+      if (err?.name === "AbortError") return false;
+      // Picker bloqueado (iframe, permissões): segue com o download comum
+    }
+    if (handle) {
+      await backupStream(data).pipeTo(await handle.createWritable());
+      return true;
+    }
+  }
+
+  const blob = await new Response(backupStream(data)).blob();
+  const url = URL.createObjectURL(new Blob([blob], { type: "application/x-ndjson;charset=utf-8" }));
+  const link = document.createElement("a");
+  link.href = url;
+  link.download = fileName;
+  link.style.display = "none";
+  document.body.appendChild(link);
+  link.click();
+  setTimeout(() => {
+    document.body.removeChild(link);
+    URL.revokeObjectURL(url);
+  }, 100);
+  return true;
+}
+
+/**
+ * Baixa o backup gerado por `/api/backup`: uma transação REPEATABLE READ no
+ * Neon, enviada com gzip. O download é feito pelo próprio navegador, então o
+ * arquivo não passa pela memória da página.
+ */
+export function downloadServerBackup() {
+  const link = document.createElement("a");
+  link.href = "/api/backup?format=ndjson";
+  link.download = backupFileName();
+  link.style.display = "none";
+  document.body.appendChild(link);
+  link.click();
+  setTimeout(() => document.body.removeChild(link), 100);
+}
+
+/** Linhas não vazias do arquivo, decodificadas conforme são lidas do disco. */
+async function* readLines(file: File): AsyncGenerator<string> {
+  const reader = file.stream().pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  try {
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += value;
+      let start = 0;
+      let newline: number;
+      while ((newline = buffer.indexOf("\n", start)) >= 0) {
+        const line = buffer.slice(start, newline);
+        start = newline + 1;
+        if (line.trim()) yield line;
+      }
+      buffer = buffer.slice(start);
+    }
+    if (buffer.trim()) yield buffer;
+  } finally {
+    // Leitura interrompida (backup antigo ou linha inválida): libera o arquivo
+    reader.cancel().catch(() => undefined);
+  }
+}
+
+const headerTotal = (metadata: Partial<BusinessData["metadata"]> | undefined) => {
+  if (!metadata) return null;
+  const totals = [metadata.totalClientes, metadata.totalServicos, metadata.totalDespesas, metadata.totalComissoes];
+  return totals.every(n => typeof n === "number") ? totals.reduce((a, b) => a + (b as number), 0) : null;
+};
+
+interface ImportSession {
+  fingerprint: string;
+  id: string;
+}
+
+const fileFingerprint = (file: File) => `${file.name}:${file.size}:${file.lastModified}`;
+
+/** Reaproveita a sessão de uma importação interrompida do mesmo arquivo ou abre uma nova. */
+function openSession(file: File): string {
+  const fingerprint = fileFingerprint(file);
+  try {
+    const saved: ImportSession | null = JSON.parse(localStorage.getItem(SESSION_KEY) || "null");
+    if (saved?.fingerprint === fingerprint && saved.id) return saved.id;
+  } catch {
+    // Sessão corrompida: começa outra
+  }
+  const session: ImportSession = { fingerprint, id: crypto.randomUUID() };
+  try {
+    localStorage.setItem(SESSION_KEY, JSON.stringify(session));
+  } catch {
+    // Sem localStorage a importação funciona, só não pode ser retomada
+  }
+  return session.id;
+}
+
+const closeSession = () => {
+  try {
+    localStorage.removeItem(SESSION_KEY);
+  } catch {
+    // Nada a limpar
+  }
+};
+
+/** Envia um lote; falhas de rede e 5xx são repetidas com a mesma chave de idempotência. */
+async function postChunk(key: string, body: string) {
+  for (let attempt = 1; ; attempt++) {
+    let resp: Response | null = null;
+    try {
+      resp = await fetch("/api/import", {
+        method: "POST",
+        headers: { "Content-Type": "application/json", "Idempotency-Key": key },
+        body,
+      });
+    } catch (err) {
+      if (attempt >= MAX_ATTEMPTS) throw err;
+    }
+    if (resp?.ok) return resp.json();
+    if (resp && (resp.status < 500 || attempt >= MAX_ATTEMPTS)) throw new Error("Falha ao importar dados");
+    await new Promise(resolve => setTimeout(resolve, attempt * 1000));
+  }
+}
+
+/**
+ * Acumula linhas por tabela e envia lotes numerados para `/api/import`. O
+ * envio é aguardado antes de ler mais, então só um lote fica em memória por
+ * vez. A chave de cada lote (`<sessão>:<número>`) é estável entre tentativas,
+ * e o servidor pula os lotes que já gravou.
+ */
+function createBatchSender(sessionId: string, onProgress?: (progress: ImportProgress) => void) {
+  const counts: Record<BackupTable, number> = { clientes: 0, servicos: 0, despesas: 0, comissoes: 0 };
+  const errors: BackupRowError[] = [];
+  let total: number | null = null;
+  let pendingTable: BackupTable | null = null;
+  let pending: unknown[] = [];
+  let done = 0;
+  let chunk = 0;
+  let skippedChunks = 0;
+
+  const flush = async () => {
+    if (!pendingTable || pending.length === 0) return;
+    const table = pendingTable;
+    const rows = pending;
+    const offset = counts[table] - rows.length;
+    pending = [];
+
+    const result = await postChunk(`${sessionId}:${chunk++}`, JSON.stringify({ [table]: rows }));
+    if (result?.skipped) skippedChunks++;
+    for (const err of Array.isArray(result?.errors) ? result.errors : []) {
+      errors.push({ table: err.table ?? table, index: offset + Number(err.index ?? 0), message: err.message });
+    }
+    done += rows.length;
+    onProgress?.({ done, total });
+  };
+
+  return {
+    setTotal(value: number | null) {
+      total = value;
+      onProgress?.({ done, total });
+    },
+    async push(table: BackupTable, row: unknown) {
+      // Tabelas vão em sequência, para o Neon receber os clientes antes dos serviços
+      if (pendingTable !== table) await flush();
+      pendingTable = table;
+      pending.push(row);
+      counts[table]++;
+      if (pending.length >= IMPORT_BATCH_SIZE) await flush();
+    },
+    async finish(): Promise<ImportOutcome> {
+      await flush();
+      return { counts, errors, skippedChunks };
+    },
+  };
+}
+
+/**
+ * Lê o backup em streaming e o envia em lotes para `/api/import`.
+ * Aceita o formato NDJSON e o JSON único dos backups antigos. Se a
+ * importação falhar no meio, importar o mesmo arquivo de novo retoma a
+ * partir do primeiro lote que não chegou ao servidor.
+ */
+export async function importBackup(file: File, onProgress?: (progress: ImportProgress) => void): Promise<ImportOutcome> {
+  const sender = createBatchSender(openSession(file), onProgress);
+  const outcome = await sendBackup(file, sender);
+  closeSession();
+  return outcome;
+}
+
+async function sendBackup(file: File, sender: ReturnType<typeof createBatchSender>): Promise<ImportOutcome> {
+  const lines = readLines(file);
+
+  const first = await lines.next();
+  if (first.done) throw new Error("O arquivo de backup está vazio.");
+  let header: BackupHeader | null = null;
+  try {
+    const parsed = JSON.parse(first.value);
+    if (parsed?.type === "header" && parsed?.format === FORMAT) header = parsed;
+  } catch {
+    // Primeira linha de um JSON formatado ("{"): backup antigo
+  }
+
+  if (!header) {
+    await lines.return(undefined);
+    const legacy = JSON.parse(await file.text());
+    if (!legacy.clientes || !legacy.servicos || !legacy.despesas || !legacy.comissoes) {
+      throw new Error("Estrutura do arquivo JSON inválida. Verifique se contém as seções: clientes, servicos, despesas e comissoes.");
+    }
+    sender.setTotal(BACKUP_TABLES.reduce((acc, table) => acc + (legacy[table]?.length || 0), 0));
+    for (const table of BACKUP_TABLES) {
+      for (const row of legacy[table] || []) await sender.push(table, row);
+    }
+    return sender.finish();
+  }
+
+  if (header.version > FORMAT_VERSION) {
+    throw new Error("Este backup foi gerado por uma versão mais nova do sistema.");
+  }
+  sender.setTotal(headerTotal(header.metadata));
+  let lineNumber = 1;
+  for await (const line of lines) {
+    lineNumber++;
+    let record: any;
+    try {
+      record = JSON.parse(line);
+    } catch {
+      throw new Error(`Linha ${lineNumber} do backup não é um JSON válido.`);
+    }
+    if (!isBackupTable(record?.table) || typeof record.row !== "object" || record.row === null) {
+      throw new Error(`Linha ${lineNumber} do backup tem um registro inválido.`);
+    }
+    await sender.push(record.table, record.row);
+  }
+  return sender.finish();
+}
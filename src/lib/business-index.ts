@@ -0,0 +1,122 @@
+import { BusinessData, Cliente, Comissao, Despesa, Servico } from "@/types/business";
+
+/**
+ * Índices em memória sobre um snapshot de `BusinessData`.
+ *
+ * As chaves são sempre `String(id)`, porque ids chegam como número do Neon e
+ * como texto (`temp_...`) nas linhas recém-criadas.
+ */
+export interface BusinessIndex {
+  clientesById: Map<string, Cliente>;
+  servicosById: Map<string, Servico>;
+  despesasById: Map<string, Despesa>;
+  comissoesById: Map<string, Comissao>;
+  /** Serviços de cada cliente, na mesma ordem de `data.servicos` */
+  servicosByCliente: Map<string, Servico[]>;
+  /** Comissões de cada serviço, na mesma ordem de `data.comissoes` */
+  comissoesByServico: Map<string, Comissao[]>;
+  /** Mês (YYYY-MM) da data do serviço -> serviços */
+  servicosByMonth: Map<string, Servico[]>;
+  /** Mês (YYYY-MM) do recebimento da comissão -> comissões */
+  comissoesByMonth: Map<string, Comissao[]>;
+  /** Meses com serviços, do mais recente para o mais antigo */
+  serviceMonths: string[];
+  /** Meses com serviços ou recebimentos de comissão, do mais recente para o mais antigo */
+  availableMonths: string[];
+}
+
+// Um índice por objeto BusinessData: todo setBusinessData gera um objeto novo,
+// então o índice é construído uma vez por carga/edição e compartilhado entre as abas.
+const cache = new WeakMap<BusinessData, BusinessIndex>();
+
+const byId = <T extends { id: number | string }>(rows: T[]) => {
+  const map = new Map<string, T>();
+  for (const row of rows) map.set(String(row.id), row);
+  return map;
+};
+
+const groupBy = <T>(rows: T[], key: (row: T) => number | string | null | undefined) => {
+  const map = new Map<string, T[]>();
+  for (const row of rows) {
+    const k = String(key(row));
+    const bucket = map.get(k);
+    if (bucket) bucket.push(row);
+    else map.set(k, [row]);
+  }
+  return map;
+};
+
+/**
+ * Chave YYYY-MM de uma data do banco ('YYYY-MM-DD', com ou sem hora).
+ * Lê direto da string para não depender do fuso horário do navegador.
+ */
+export function monthKey(dateString: string | null | undefined): string | null {
+  if (!dateString) return null;
+  if (/^\d{4}-\d{2}/.test(dateString)) return dateString.slice(0, 7);
+  const date = new Date(dateString);
+  if (isNaN(date.getTime())) return null;
+  return `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
+}
+
+const sortedMonthsDesc = (...maps: Map<string, unknown>[]) => {
+  const months = new Set<string>();
+  for (const map of maps) for (const key of map.keys()) if (key !== "null") months.add(key);
+  return [...months].sort().reverse();
+};
+
+export function buildBusinessIndex(data: BusinessData): BusinessIndex {
+  const servicosByMonth = groupBy(data.servicos, s => monthKey(s.data_servico));
+  const receiptMonths = groupBy(data.servicos.filter(s => s.data_recebimento_comissao), s => monthKey(s.data_recebimento_comissao));
+  return {
+    clientesById: byId(data.clientes),
+    servicosById: byId(data.servicos),
+    despesasById: byId(data.despesas),
+    comissoesById: byId(data.comissoes),
+    servicosByCliente: groupBy(data.servicos, s => s.cliente_id),
+    comissoesByServico: groupBy(data.comissoes, c => c.servico_id),
+    servicosByMonth,
+    comissoesByMonth: groupBy(data.comissoes, c => monthKey(c.data_recebimento)),
+    serviceMonths: sortedMonthsDesc(servicosByMonth),
+    availableMonths: sortedMonthsDesc(servicosByMonth, receiptMonths),
+  };
+}
+
+/** Devolve o índice do snapshot, construindo-o apenas na primeira chamada. */
+export function getBusinessIndex(data: BusinessData): BusinessIndex {
+  let index = cache.get(data);
+  if (!index) {
+    index = buildBusinessIndex(data);
+    cache.set(data, index);
+  }
+  return index;
+}
+
+export const findCliente = (index: BusinessIndex, id: number | string | null | undefined) =>
+  id === null || id === undefined ? undefined : index.clientesById.get(String(id));
+
+export const findServico = (index: BusinessIndex, id: number | string | null | undefined) =>
+  id === null || id === undefined ? undefined : index.servicosById.get(String(id));
+
+export const servicosDoCliente = (index: BusinessIndex, clienteId: number | string): Servico[] =>
+  index.servicosByCliente.get(String(clienteId)) ?? [];
+
+export const comissoesDoServico = (index: BusinessIndex, servicoId: number | string): Comissao[] =>
+  index.comissoesByServico.get(String(servicoId)) ?? [];
+
+/**
+ * Linhas cujos meses caem no intervalo [inicio, fim] (datas YYYY-MM-DD, ambas opcionais),
+ * concatenando os baldes do mês mais recente para o mais antigo. Só os meses das
+ * pontas podem conter datas fora do intervalo, então o chamador ainda aplica o
+ * filtro exato por data, mas apenas sobre esses candidatos.
+ */
+export function rowsInMonthRange<T>(buckets: Map<string, T[]>, inicio?: string, fim?: string): T[] {
+  const from = inicio ? inicio.slice(0, 7) : null;
+  const to = fim ? fim.slice(0, 7) : null;
+  const out: T[] = [];
+  for (const month of sortedMonthsDesc(buckets)) {
+    if (to && month > to) continue;
+    if (from && month < from) break;
+    out.push(...buckets.get(month)!);
+  }
+  return out;
+}
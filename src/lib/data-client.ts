@@ -0,0 +1,242 @@
+/**
+ * Cliente de leitura paginada/incremental de `/api/data`.
+ *
+ * A primeira carga busca as quatro tabelas em páginas (cursor por
+ * `updated_at, id`); as seguintes enviam `since=<serverTime>` e recebem só as
+ * linhas alteradas e os ids excluídos, mesclados sobre o snapshot anterior.
+ * Com a ETag do snapshot anterior no `If-None-Match`, um 304 dispensa até
+ * essa leitura quando nada mudou. As tabelas vêm no formato colunar
+ * (`format=columns`, ver `api/_columns.ts`) e são decodificadas aqui.
+ */
+
+import { BusinessData, Comissao } from "@/types/business";
+import { MONEY_FIELDS, asCents, toCents } from "@/lib/money";
+
+/** Chave do react-query do snapshot bruto (`RawSnapshot`) */
+export const BUSINESS_DATA_QUERY_KEY = ["business-data"] as const;
+
+export type RawTable = "clientes" | "servicos" | "despesas" | "comissoes";
+
+export type RawTables = Record<RawTable, any[]>;
+
+export interface RawSnapshot {
+  /** Linhas decodificadas do formato colunar; valores em dinheiro em centavos */
+  tables: RawTables;
+  /** Marca d'água devolvida pelo servidor, usada como `since` na próxima carga */
+  serverTime: string | null;
+  /** ETag da versão dos dados deste snapshot, enviada no If-None-Match */
+  etag?: string | null;
+}
+
+const RAW_TABLES: RawTable[] = ["clientes", "servicos", "despesas", "comissoes"];
+
+const DEFAULT_PAGE_SIZE = 2000;
+
+const DAY_MS = 86_400_000;
+
+/** Tabela no formato colunar de `/api/data?format=columns` */
+interface ColumnarTable {
+  columns: string[];
+  types: ("id" | "text" | "num" | "cents" | "day" | "bool" | "ts")[];
+  data: unknown[][];
+}
+
+// Devolve cada valor na mesma forma da resposta em objetos (ids BIGINT como
+// texto, datas YYYY-MM-DD); dinheiro continua em centavos (src/lib/money.ts)
+const DECODERS: Record<ColumnarTable["types"][number], (value: any) => unknown> = {
+  id: (value: number) => String(value),
+  text: (value) => value,
+  num: (value) => value,
+  cents: (value) => asCents(value),
+  day: (value: number) => new Date(value * DAY_MS).toISOString().slice(0, 10),
+  bool: (value) => value === 1,
+  ts: (value) => value,
+};
+
+/**
+ * Reconstrói as linhas de uma tabela. Arrays de objetos (resposta sem
+ * `format=columns`) trazem dinheiro em reais, como no banco, e são convertidos
+ * para centavos aqui.
+ */
+function decodeTable(name: RawTable, table: ColumnarTable | any[] | undefined): any[] {
+  if (!table) return [];
+  if (Array.isArray(table)) {
+    const fields = MONEY_FIELDS[name];
+    if (fields.length === 0) return table;
+    return table.map((row) => {
+      const out = { ...row };
+      for (const field of fields) if (out[field] !== null && out[field] !== undefined) out[field] = toCents(out[field]);
+      return out;
+    });
+  }
+  const { columns, types, data } = table;
+  const decoders = types.map((type) => DECODERS[type] ?? DECODERS.text);
+  const count = data[0]?.length ?? 0;
+  const rows = new Array(count);
+  for (let r = 0; r < count; r++) {
+    const row: Record<string, unknown> = {};
+    for (let c = 0; c < columns.length; c++) {
+      const value = data[c][r];
+      row[columns[c]] = value === null ? null : decoders[c](value);
+    }
+    rows[r] = row;
+  }
+  return rows;
+}
+
+const buildUrl = (params: Record<string, string | number | null | undefined>) => {
+  const query = new URLSearchParams();
+  for (const [key, value] of Object.entries(params)) {
+    if (value !== null && value !== undefined && value !== "") query.set(key, String(value));
+  }
+  return `/api/data?${query.toString()}`;
+};
+
+const getResponse = async (url: string, init?: RequestInit) => {
+  const resp = await fetch(url, init);
+  if (!resp.ok && resp.status !== 304) {
+    // 503 = banco sem as tabelas esperadas; o servidor explica no campo "error"
+    const body = await resp.json().catch(() => null);
+    throw new Error(body?.error || "Falha ao carregar dados");
+  }
+  return resp;
+};
+
+const getJson = async (url: string) => (await getResponse(url)).json();
+
+// Mesma ordenação que a carga completa do servidor sempre devolveu
+const byDateDesc = (field: string) => (a: any, b: any) => String(b[field] ?? "").localeCompare(String(a[field] ?? ""));
+const ORDER: Record<RawTable, (a: any, b: any) => number> = {
+  clientes: (a, b) => String(a.nome ?? "").localeCompare(String(b.nome ?? "")),
+  servicos: byDateDesc("data_servico"),
+  despesas: byDateDesc("data_vencimento"),
+  comissoes: byDateDesc("data_recebimento"),
+};
+
+function merge(previous: any[], changed: any[], deleted: (number | string)[] = []): any[] {
+  if (previous.length === 0 && deleted.length === 0) return changed;
+  const rows = new Map<string, any>();
+  for (const row of previous) rows.set(String(row.id), row);
+  for (const id of deleted) rows.delete(String(id));
+  for (const row of changed) rows.set(String(row.id), row);
+  return [...rows.values()];
+}
+
+/**
+ * Busca o snapshot atual. Com `previous`, faz carga incremental; sem ele, carga completa paginada.
+ * Se nada mudou, devolve as mesmas referências de array do snapshot anterior.
+ */
+export async function fetchSnapshot(previous?: RawSnapshot | null, pageSize = DEFAULT_PAGE_SIZE): Promise<RawSnapshot> {
+  const since = previous?.serverTime || null;
+  const firstResp = await getResponse(
+    buildUrl({ limit: pageSize, since, format: "columns" }),
+    previous?.etag ? { headers: { "If-None-Match": previous.etag } } : undefined,
+  );
+  // 304: o servidor ainda está na versão do snapshot anterior
+  if (firstResp.status === 304 && previous) return previous;
+  const first = await firstResp.json();
+
+  const changed = {} as RawTables;
+  await Promise.all(RAW_TABLES.map(async (table) => {
+    const rows: any[] = decodeTable(table, first[table]);
+    let next: string | null = first.next?.[table] ?? null;
+    while (next) {
+      const page = await getJson(buildUrl({ table, after: next, limit: pageSize, since, format: "columns" }));
+      for (const row of decodeTable(table, page[table])) rows.push(row);
+      next = page.next?.[table] ?? null;
+    }
+    changed[table] = rows;
+  }));
+
+  const tables = {} as RawTables;
+  for (const table of RAW_TABLES) {
+    const before = previous?.tables[table] || [];
+    const deleted = first.deleted?.[table] || [];
+    if (previous && changed[table].length === 0 && deleted.length === 0) {
+      tables[table] = before;
+    } else {
+      tables[table] = merge(before, changed[table], deleted).sort(ORDER[table]);
+    }
+  }
+
+  return { tables, serverTime: first.serverTime ?? null, etag: firstResp.headers.get("ETag") };
+}
+
+/**
+ * Converte as tabelas de um `RawSnapshot` para o formato usado pela interface.
+ * O dinheiro já chega em centavos (ver `decodeTable`); `asCents` só garante inteiros.
+ */
+export function toBusinessData(apiData: RawTables): BusinessData {
+  // Map database structure to expected interface
+  const mappedClientes = (apiData.clientes || []).map((cliente: any) => ({
+    id: cliente.id,
+    nome: cliente.nome,
+    telefone: cliente.telefone || '',
+    email: cliente.email || '',
+    endereco: cliente.endereco || '',
+    cpf: cliente.cpf || '',
+    data_cadastro: cliente.created_at || ''
+  }));
+
+  const mappedComissoes = (apiData.comissoes || []).map((comissao: any) => ({
+    id: comissao.id,
+    servico_id: comissao.servico_id,
+    valor: asCents(comissao.valor),
+    data_recebimento: comissao.data_recebimento,
+    status: comissao.status as 'pendente' | 'recebido' | 'atrasado',
+    created_at: comissao.created_at,
+    updated_at: comissao.updated_at
+  }));
+
+  // Primeira comissão recebida de cada serviço (mesma ordem da lista), indexada uma única vez
+  const recebidaPorServico = new Map<string, Comissao>();
+  for (const c of mappedComissoes as Comissao[]) {
+    if (c.status === 'recebido' && !recebidaPorServico.has(String(c.servico_id))) {
+      recebidaPorServico.set(String(c.servico_id), c);
+    }
+  }
+
+  const mappedServicos = (apiData.servicos || []).map((servico: any) => {
+    // Buscar comissão recebida para este serviço para inferir a data de recebimento
+    const comissaoRecebida = recebidaPorServico.get(String(servico.id));
+    
+    return {
+      id: servico.id,
+      data_servico: servico.data_servico,
+      veiculo: servico.veiculo,
+      placa: servico.placa,
+      valor_bruto: asCents(servico.valor_bruto),
+      porcentagem_comissao: Number(servico.porcentagem_comissao),
+      observacao: servico.observacao || '',
+      valor_pago: asCents(servico.valor_pago),
+      quitado: servico.quitado,
+      comissao_recebida: asCents(servico.comissao_recebida),
+      cliente_id: servico.cliente_id,
+      data_recebimento_comissao: comissaoRecebida?.data_recebimento || undefined
+    };
+  });
+
+  const mappedDespesas = (apiData.despesas || []).map((despesa: any) => ({
+    id: despesa.id,
+    descricao: despesa.descricao,
+    valor: asCents(despesa.valor),
+    data_vencimento: despesa.data_vencimento,
+    pago: despesa.pago,
+    categoria: 'Geral' // Default category
+  }));
+
+  return {
+    clientes: mappedClientes,
+    servicos: mappedServicos,
+    despesas: mappedDespesas,
+    comissoes: mappedComissoes,
+    metadata: {
+      exportDate: new Date().toISOString(),
+      version: "1.0",
+      totalClientes: mappedClientes.length,
+      totalServicos: mappedServicos.length,
+      totalDespesas: mappedDespesas.length,
+      totalComissoes: mappedComissoes.length
+    }
+  };
+}
@@ -0,0 +1,106 @@
+import { BusinessData, DashboardMetrics, MonthlyRollup } from "@/types/business";
+import { asCents, commissionCents } from "@/lib/money";
+
+/** Chave do react-query para as métricas do painel; invalidar após qualquer gravação. */
+export const METRICS_QUERY_KEY = ["metrics"] as const;
+
+const METRIC_MONEY_FIELDS = [
+  "totalFaturado", "totalComissoesRecebidas", "totalComissoesCalculadas", "valorAReceber",
+  "totalDespesas", "despesasPagas", "despesasPendentes", "lucroLiquido",
+] as const;
+
+const ROLLUP_MONEY_FIELDS = [
+  "valorFaturado", "comissaoPrevista", "comissaoRecebida", "recebimentos", "despesasPagas", "despesasPendentes",
+] as const;
+
+/** Busca os agregados do painel calculados no banco por `/api/metrics` (dinheiro em centavos). */
+export async function fetchDashboardMetrics(): Promise<DashboardMetrics> {
+  const resp = await fetch("/api/metrics");
+  if (!resp.ok) throw new Error("Falha ao carregar métricas");
+  const metrics = await resp.json();
+  for (const field of METRIC_MONEY_FIELDS) metrics[field] = asCents(metrics[field]);
+  metrics.servicosRecentes = (metrics.servicosRecentes ?? []).map((s: any) => ({ ...s, valor_bruto: asCents(s.valor_bruto) }));
+  return metrics;
+}
+
+/** Resumo por mês; fica sob a chave das métricas para ser invalidado junto com elas. */
+export const MONTHLY_ROLLUP_QUERY_KEY = [...METRICS_QUERY_KEY, "monthly"] as const;
+
+/** Busca os totais mensais de `/api/report` (uma linha por mês, sem somar as tabelas; dinheiro em centavos). */
+export async function fetchMonthlyRollup(from?: string, to?: string): Promise<MonthlyRollup[]> {
+  const query = new URLSearchParams();
+  if (from) query.set("from", from);
+  if (to) query.set("to", to);
+  const qs = query.toString();
+  const resp = await fetch(qs ? `/api/report?${qs}` : "/api/report");
+  if (!resp.ok) throw new Error("Falha ao carregar resumo mensal");
+  const body = await resp.json();
+  return body.months.map((month: any) => {
+    for (const field of ROLLUP_MONEY_FIELDS) month[field] = asCents(month[field]);
+    return month;
+  });
+}
+
+const parseDateToTime = (dateString: string) => {
+  if (!dateString) return 0;
+  const datePart = dateString.includes('T') ? dateString.split('T')[0] : (dateString.includes(' ') ? dateString.split(' ')[0] : dateString);
+  const date = new Date(datePart + 'T00:00:00');
+  return isNaN(date.getTime()) ? new Date(dateString).getTime() || 0 : date.getTime();
+};
+
+/**
+ * Calcula as mesmas métricas a partir dos dados já carregados no navegador.
+ * Usado apenas como reserva quando `/api/metrics` não responde.
+ */
+export function computeDashboardMetrics(data: BusinessData): DashboardMetrics {
+  let totalFaturado = 0;
+  let totalComissoesRecebidas = 0;
+  let totalComissoesCalculadas = 0;
+  for (const servico of data.servicos) {
+    totalFaturado += servico.valor_bruto;
+    totalComissoesRecebidas += servico.comissao_recebida;
+    totalComissoesCalculadas += commissionCents(servico.valor_bruto, servico.porcentagem_comissao);
+  }
+
+  let totalDespesas = 0;
+  let despesasPagas = 0;
+  let qtdDespesasPagas = 0;
+  for (const despesa of data.despesas) {
+    totalDespesas += despesa.valor;
+    if (despesa.pago) {
+      despesasPagas += despesa.valor;
+      qtdDespesasPagas++;
+    }
+  }
+
+  const nomes = new Map(data.clientes.map(c => [String(c.id), c.nome]));
+  const servicosRecentes = [...data.servicos]
+    .sort((a, b) => parseDateToTime(b.data_servico) - parseDateToTime(a.data_servico))
+    .slice(0, 5)
+    .map(s => ({
+      id: s.id,
+      data_servico: s.data_servico,
+      veiculo: s.veiculo,
+      placa: s.placa,
+      valor_bruto: s.valor_bruto,
+      porcentagem_comissao: s.porcentagem_comissao,
+      cliente_id: s.cliente_id,
+      cliente_nome: nomes.get(String(s.cliente_id)) ?? null
+    }));
+
+  return {
+    totalClientes: data.clientes.length,
+    totalServicos: data.servicos.length,
+    totalFaturado: asCents(totalFaturado),
+    totalComissoesRecebidas: asCents(totalComissoesRecebidas),
+    totalComissoesCalculadas: asCents(totalComissoesCalculadas),
+    valorAReceber: asCents(totalComissoesCalculadas - totalComissoesRecebidas),
+    totalDespesas: asCents(totalDespesas),
+    despesasPagas: asCents(despesasPagas),
+    despesasPendentes: asCents(totalDespesas - despesasPagas),
+    qtdDespesasPagas,
+    qtdDespesasPendentes: data.despesas.length - qtdDespesasPagas,
+    lucroLiquido: asCents(totalComissoesRecebidas - despesasPagas),
+    servicosRecentes
+  };
+}
@@ -0,0 +1,68 @@
+/**
+ * Dinheiro em centavos inteiros.
+ *
+ * Todo valor monetário de `BusinessData` é `Cents`: somas e comparações são
+ * exatas e não precisam de arredondamento por linha. A conversão para reais
+ * acontece só nas bordas (exibição, `/api/sync`, `/api/commission`, backups).
+ */
+
+/**
+ * Valor em centavos (inteiro). A marca impede que um número em reais seja
+ * usado como `Cents` sem passar por `toCents` (ou por `asCents`, para o que já
+ * vem em centavos).
+ */
+export type Cents = number & { readonly __cents: unique symbol };
+
+/** Converte reais (número ou DECIMAL em texto, como vem do Postgres) para centavos. */
+export const toCents = (reais: number | string | null | undefined): Cents => {
+  const value = Number(reais);
+  return (Number.isFinite(value) ? Math.round(value * 100) : 0) as Cents;
+};
+
+/**
+ * Marca como centavos um valor que já está em centavos: colunas `cents` de
+ * `/api/data?format=columns`, agregados de `/api/metrics` e `/api/report`, e
+ * somas ou diferenças de outros `Cents`.
+ */
+export const asCents = (cents: number | string | null | undefined): Cents => {
+  const value = Number(cents);
+  return (Number.isFinite(value) ? Math.round(value) : 0) as Cents;
+};
+
+/** Soma exata de valores em centavos. */
+export const sumCents = <T>(rows: readonly T[], value: (row: T) => Cents): Cents => {
+  let total = 0;
+  for (const row of rows) total += value(row);
+  return total as Cents;
+};
+
+/** Converte centavos para reais, para enviar à API ou gravar em backups. */
+export const fromCents = (cents: Cents): number => cents / 100;
+
+/** Comissão sobre um valor bruto, arredondada ao centavo uma única vez. */
+export const commissionCents = (valorBruto: Cents, porcentagem: number): Cents =>
+  Math.round((valorBruto * porcentagem) / 100) as Cents;
+
+const BRL = new Intl.NumberFormat("pt-BR", { style: "currency", currency: "BRL" });
+
+/** Formata centavos como moeda (R$ 1.234,56). */
+export const formatCents = (cents: Cents): string => BRL.format(cents / 100);
+
+/** Colunas em dinheiro de cada tabela (DECIMAL em reais no Neon e nos backups) */
+export const MONEY_FIELDS: Record<"clientes" | "servicos" | "despesas" | "comissoes", readonly string[]> = {
+  clientes: [],
+  servicos: ["valor_bruto", "valor_pago", "comissao_recebida"],
+  despesas: ["valor"],
+  comissoes: ["valor"],
+};
+
+/** Cópia da linha com as colunas em dinheiro convertidas de centavos para reais. */
+export function rowInReais<T extends object>(table: keyof typeof MONEY_FIELDS, row: T): T {
+  const fields = MONEY_FIELDS[table];
+  if (fields.length === 0) return row;
+  const out: Record<string, unknown> = { ...row };
+  for (const field of fields) {
+    if (typeof out[field] === "number") out[field] = fromCents(out[field] as Cents);
+  }
+  return out as T;
+}
@@ -0,0 +1,253 @@
+import jsPDF from "jspdf";
+
+/**
+ * Gerador de relatórios em PDF vetorial.
+ *
+ * Desenha cabeçalho, cards de resumo e tabelas direto com as primitivas do
+ * jsPDF (texto nativo, linhas e retângulos), paginando as linhas à medida que
+ * escreve. O arquivo fica com texto pesquisável e poucos KB, em vez de uma
+ * captura PNG da tela fatiada em páginas.
+ */
+
+export type PdfTone = "default" | "muted" | "success" | "danger" | "warning" | "primary";
+
+export interface PdfColumn {
+  header: string;
+  /** Largura relativa; as colunas dividem a largura útil da página na proporção desses pesos */
+  width: number;
+  align?: "left" | "right" | "center";
+}
+
+export interface PdfCell {
+  text: string;
+  tone?: PdfTone;
+  bold?: boolean;
+}
+
+export interface PdfSummaryItem {
+  label: string;
+  value: string;
+  tone?: PdfTone;
+}
+
+export interface PdfTable {
+  columns: PdfColumn[];
+  rows: (string | PdfCell)[][];
+  /** Texto exibido quando não há linhas */
+  emptyText?: string;
+}
+
+export interface PdfReport {
+  title: string;
+  subtitle?: string;
+  /** Linhas pequenas abaixo do título (data de geração, período...) */
+  meta?: string[];
+  /** Caixa de filtros aplicados */
+  filters?: string;
+  summary?: PdfSummaryItem[];
+  /** Pares rótulo/valor exibidos em lista (ex.: taxas percentuais) */
+  details?: PdfSummaryItem[];
+  table?: PdfTable;
+  orientation?: "p" | "l";
+}
+
+type Rgb = [number, number, number];
+
+const TONES: Record<PdfTone, Rgb> = {
+  default: [15, 23, 42],
+  muted: [100, 116, 139],
+  success: [22, 101, 52],
+  danger: [153, 27, 27],
+  warning: [154, 52, 18],
+  primary: [30, 58, 138],
+};
+
+const MARGIN = 12;
+const ROW_HEIGHT = 6;
+const HEADER_HEIGHT = 7;
+const FOOTER_HEIGHT = 8;
+const FONT_SIZE = 8;
+
+const asCell = (cell: string | PdfCell): PdfCell => (typeof cell === "string" ? { text: cell } : cell);
+
+/** Corta o texto com reticências para caber em `maxWidth` (mm), na fonte atual. */
+function fitText(pdf: jsPDF, text: string, maxWidth: number): string {
+  if (pdf.getTextWidth(text) <= maxWidth) return text;
+  let lo = 0;
+  let hi = text.length;
+  while (lo < hi) {
+    const mid = Math.ceil((lo + hi) / 2);
+    if (pdf.getTextWidth(text.slice(0, mid) + "...") <= maxWidth) lo = mid;
+    else hi = mid - 1;
+  }
+  return text.slice(0, lo) + "...";
+}
+
+function drawText(pdf: jsPDF, cell: PdfCell, x: number, y: number, width: number, align: PdfColumn["align"] = "left") {
+  pdf.setFont("helvetica", cell.bold ? "bold" : "normal");
+  pdf.setTextColor(...TONES[cell.tone ?? "default"]);
+  const padding = 1.5;
+  const text = fitText(pdf, cell.text, width - padding * 2);
+  if (align === "right") pdf.text(text, x + width - padding, y, { align: "right" });
+  else if (align === "center") pdf.text(text, x + width / 2, y, { align: "center" });
+  else pdf.text(text, x + padding, y);
+}
+
+const PROGRESS_EVERY = 200;
+
+/**
+ * Monta o documento; `.output("arraybuffer")` com `downloadPdf` gera o arquivo.
+ * `onProgress` recebe (linhas desenhadas, total de linhas) a cada bloco de linhas.
+ */
+export function renderReportPdf(report: PdfReport, onProgress?: (done: number, total: number) => void): jsPDF {
+  const pdf = new jsPDF(report.orientation ?? "p", "mm", "a4");
+  const pageWidth = pdf.internal.pageSize.getWidth();
+  const pageHeight = pdf.internal.pageSize.getHeight();
+  const contentWidth = pageWidth - MARGIN * 2;
+  const bottom = pageHeight - MARGIN - FOOTER_HEIGHT;
+  let y = MARGIN;
+
+  // Cabeçalho
+  pdf.setFont("helvetica", "bold");
+  pdf.setFontSize(16);
+  pdf.setTextColor(...TONES.primary);
+  pdf.text(report.title, pageWidth / 2, y + 5, { align: "center" });
+  y += 11;
+  if (report.subtitle) {
+    pdf.setFontSize(12);
+    pdf.setTextColor(71, 85, 105);
+    pdf.text(report.subtitle, pageWidth / 2, y, { align: "center" });
+    y += 6;
+  }
+  pdf.setFont("helvetica", "normal");
+  pdf.setFontSize(FONT_SIZE);
+  pdf.setTextColor(...TONES.muted);
+  for (const line of report.meta ?? []) {
+    pdf.text(line, pageWidth / 2, y, { align: "center" });
+    y += 4;
+  }
+  pdf.setDrawColor(203, 213, 225);
+  pdf.setLineWidth(0.4);
+  pdf.line(MARGIN, y, pageWidth - MARGIN, y);
+  y += 5;
+
+  if (report.filters) {
+    const lines = pdf.splitTextToSize(report.filters, contentWidth - 6) as string[];
+    const boxHeight = lines.length * 3.6 + 4;
+    pdf.setFillColor(248, 250, 252);
+    pdf.rect(MARGIN, y, contentWidth, boxHeight, "FD");
+    pdf.setTextColor(71, 85, 105);
+    pdf.text(lines, MARGIN + 3, y + 4.5);
+    y += boxHeight + 5;
+  }
+
+  // Cards de resumo
+  const summary = report.summary ?? [];
+  if (summary.length > 0) {
+    const gap = 3;
+    const cardWidth = (contentWidth - gap * (summary.length - 1)) / summary.length;
+    const cardHeight = 15;
+    summary.forEach((item, i) => {
+      const x = MARGIN + i * (cardWidth + gap);
+      pdf.setFillColor(248, 250, 252);
+      pdf.setDrawColor(203, 213, 225);
+      pdf.roundedRect(x, y, cardWidth, cardHeight, 1.5, 1.5, "FD");
+      pdf.setFont("helvetica", "bold");
+      pdf.setFontSize(7.5);
+      pdf.setTextColor(...TONES[item.tone === "default" || !item.tone ? "muted" : item.tone]);
+      pdf.text(fitText(pdf, item.label, cardWidth - 4), x + cardWidth / 2, y + 5, { align: "center" });
+      pdf.setFontSize(11);
+      pdf.setTextColor(...TONES[item.tone ?? "default"]);
+      pdf.text(fitText(pdf, item.value, cardWidth - 4), x + cardWidth / 2, y + 11, { align: "center" });
+    });
+    y += cardHeight + 6;
+  }
+
+  pdf.setFontSize(FONT_SIZE + 1);
+  for (const item of report.details ?? []) {
+    pdf.setFont("helvetica", "normal");
+    pdf.setTextColor(...TONES.default);
+    pdf.text(item.label, MARGIN, y);
+    pdf.setFont("helvetica", "bold");
+    pdf.setTextColor(...TONES[item.tone ?? "default"]);
+    pdf.text(item.value, pageWidth - MARGIN, y, { align: "right" });
+    y += 5;
+  }
+  if (report.details?.length) y += 2;
+
+  // Tabela, com o cabeçalho repetido em cada página
+  const table = report.table;
+  if (table) {
+    const totalWeight = table.columns.reduce((sum, c) => sum + c.width, 0);
+    const widths = table.columns.map(c => (c.width / totalWeight) * contentWidth);
+
+    const drawHeader = () => {
+      pdf.setFillColor(241, 245, 249);
+      pdf.setDrawColor(203, 213, 225);
+      pdf.rect(MARGIN, y, contentWidth, HEADER_HEIGHT, "F");
+      pdf.line(MARGIN, y + HEADER_HEIGHT, pageWidth - MARGIN, y + HEADER_HEIGHT);
+      pdf.setFontSize(FONT_SIZE);
+      let x = MARGIN;
+      table.columns.forEach((column, i) => {
+        drawText(pdf, { text: column.header, bold: true }, x, y + 4.7, widths[i], column.align);
+        x += widths[i];
+      });
+      y += HEADER_HEIGHT;
+    };
+
+    if (y + HEADER_HEIGHT + ROW_HEIGHT > bottom) {
+      pdf.addPage();
+      y = MARGIN;
+    }
+    drawHeader();
+
+    if (table.rows.length === 0) {
+      drawText(pdf, { text: table.emptyText ?? "Nenhum registro encontrado.", tone: "muted" }, MARGIN, y + 6, contentWidth, "center");
+      y += ROW_HEIGHT * 2;
+    }
+
+    pdf.setLineWidth(0.2);
+    table.rows.forEach((row, r) => {
+      if (y + ROW_HEIGHT > bottom) {
+        pdf.addPage();
+        y = MARGIN;
+        drawHeader();
+      }
+      pdf.setFontSize(FONT_SIZE);
+      let x = MARGIN;
+      row.forEach((cell, i) => {
+        drawText(pdf, asCell(cell), x, y + 4.2, widths[i], table.columns[i].align);
+        x += widths[i];
+      });
+      y += ROW_HEIGHT;
+      pdf.setDrawColor(226, 232, 240);
+      pdf.line(MARGIN, y, pageWidth - MARGIN, y);
+      if (onProgress && (r + 1) % PROGRESS_EVERY === 0) onProgress(r + 1, table.rows.length);
+    });
+    onProgress?.(table.rows.length, table.rows.length);
+  }
+
+  // Rodapé com numeração
+  const pages = pdf.getNumberOfPages();
+  pdf.setFont("helvetica", "normal");
+  pdf.setFontSize(7);
+  pdf.setTextColor(...TONES.muted);
+  for (let page = 1; page <= pages; page++) {
+    pdf.setPage(page);
+    pdf.text(`Página ${page} de ${pages}`, pageWidth - MARGIN, pageHeight - MARGIN, { align: "right" });
+  }
+
+  return pdf;
+}
+
+/** Baixa um PDF já gerado (ex.: o ArrayBuffer devolvido pelo worker de relatórios). */
+export function downloadPdf(pdf: ArrayBuffer, fileName: string) {
+  const url = URL.createObjectURL(new Blob([pdf], { type: "application/pdf" }));
+  const link = document.createElement("a");
+  link.setAttribute("href", url);
+  link.setAttribute("download", fileName);
+  document.body.appendChild(link);
+  link.click();
+  document.body.removeChild(link);
+  setTimeout(() => URL.revokeObjectURL(url), 0);
+}
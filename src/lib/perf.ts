@@ -0,0 +1,37 @@
+/**
+ * Marcas de desempenho (User Timing API) lidas pelo harness de testes
+ * em `testsprite_tests/perf.py`. Todas as chamadas são no-op quando a API
+ * não está disponível, então podem ficar em produção sem custo.
+ */
+const PREFIX = "app:";
+
+const hasPerformance = () =>
+  typeof performance !== "undefined" && typeof performance.mark === "function";
+
+/**
+ * Registra uma marca com o prefixo da aplicação.
+ * @param name - Nome da marca (ex.: `dashboard:rendered`)
+ */
+export function perfMark(name: string): void {
+  if (!hasPerformance()) return;
+  try {
+    performance.mark(PREFIX + name);
+  } catch {
+    // Ignora navegadores sem suporte completo
+  }
+}
+
+/**
+ * Registra uma medida entre uma marca anterior e o instante atual.
+ * @param name - Nome da medida (ex.: `tab:clientes`)
+ * @param startMark - Nome da marca inicial, sem o prefixo
+ */
+export function perfMeasure(name: string, startMark: string): void {
+  if (!hasPerformance()) return;
+  try {
+    if (performance.getEntriesByName(PREFIX + startMark, "mark").length === 0) return;
+    performance.measure(PREFIX + name, PREFIX + startMark);
+  } catch {
+    // Ignora navegadores sem suporte completo
+  }
+}
@@ -0,0 +1,49 @@
+import { BusinessData } from "@/types/business";
+import { renderReportPdf } from "@/lib/pdf-report";
+import {
+  ReportFilters,
+  ViewerReportType,
+  buildReport,
+  buildReportPdf,
+  buildViewerPdf,
+  dailyReceiptTotals,
+} from "@/lib/reports";
+
+/** Trabalhos aceitos pelo serviço de relatórios. Os de PDF devolvem o arquivo como ArrayBuffer. */
+export type ReportJob =
+  | { type: "report"; filters: ReportFilters }
+  | { type: "report-pdf"; filters: ReportFilters; generatedAt: string }
+  | { type: "daily-receipts"; dataInicio?: string; dataFim?: string }
+  | { type: "viewer-pdf"; reportType: ViewerReportType; generatedAt: string; dataInicio?: string; dataFim?: string };
+
+/** Mensagens da thread principal para o worker */
+export type ReportWorkerRequest =
+  | { type: "load"; data: BusinessData }
+  | { type: "job"; id: number; job: ReportJob };
+
+/** Mensagens do worker para a thread principal */
+export type ReportWorkerResponse =
+  | { type: "progress"; id: number; done: number; total: number }
+  | { type: "result"; id: number; result: unknown }
+  | { type: "error"; id: number; message: string };
+
+export type ProgressCallback = (done: number, total: number) => void;
+
+/** Executa um trabalho sobre o snapshot. Roda no worker, ou direto na thread principal sem suporte a Worker. */
+export function runReportJob(data: BusinessData, job: ReportJob, onProgress?: ProgressCallback): unknown {
+  switch (job.type) {
+    case "report":
+      return buildReport(data, job.filters);
+    case "report-pdf": {
+      const report = buildReport(data, job.filters);
+      return renderReportPdf(buildReportPdf(report, job.filters, job.generatedAt), onProgress).output("arraybuffer");
+    }
+    case "daily-receipts":
+      return dailyReceiptTotals(data, job.dataInicio, job.dataFim);
+    case "viewer-pdf": {
+      const report = buildViewerPdf(data, job.reportType, job.generatedAt, job.dataInicio, job.dataFim);
+      if (!report) throw new Error("Tipo de relatório desconhecido");
+      return renderReportPdf(report, onProgress).output("arraybuffer");
+    }
+  }
+}
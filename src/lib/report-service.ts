@@ -0,0 +1,127 @@
+import { BusinessData } from "@/types/business";
+import { ProgressCallback, ReportJob, ReportWorkerRequest, ReportWorkerResponse, runReportJob } from "@/lib/report-jobs";
+
+/**
+ * Serviço de relatórios apoiado em um Web Worker.
+ *
+ * O snapshot é enviado ao worker uma única vez por versão de `BusinessData`
+ * (só quando um trabalho é pedido) e cada pedido vira uma mensagem com id.
+ * Sem suporte a Worker, os mesmos trabalhos rodam na thread principal.
+ */
+
+export interface ReportRunOptions {
+  onProgress?: ProgressCallback;
+  /** Abortar cancela o trabalho e rejeita a promessa com AbortError */
+  signal?: AbortSignal;
+}
+
+interface PendingJob {
+  job: ReportJob;
+  resolve: (value: any) => void;
+  reject: (reason: unknown) => void;
+  onProgress?: ProgressCallback;
+}
+
+const abortError = () => new DOMException("Relatório cancelado", "AbortError");
+
+export const isAbortError = (err: unknown) => (err as { name?: string } | null)?.name === "AbortError";
+
+class ReportService {
+  private worker: Worker | null = null;
+  private workerFailed = false;
+  private data: BusinessData | null = null;
+  private loadedData: BusinessData | null = null;
+  private nextId = 1;
+  private pending = new Map<number, PendingJob>();
+
+  /** Define o snapshot usado pelos próximos trabalhos. */
+  setData(data: BusinessData) {
+    this.data = data;
+  }
+
+  run<T>(job: ReportJob, options: ReportRunOptions = {}): Promise<T> {
+    const { onProgress, signal } = options;
+    if (signal?.aborted) return Promise.reject(abortError());
+    if (!this.data) return Promise.reject(new Error("Dados ainda não carregados"));
+
+    if (typeof Worker === "undefined" || this.workerFailed) {
+      const data = this.data;
+      return Promise.resolve().then(() => runReportJob(data, job, onProgress) as T);
+    }
+
+    const id = this.nextId++;
+    return new Promise<T>((resolve, reject) => {
+      this.pending.set(id, { job, resolve, reject, onProgress });
+      signal?.addEventListener("abort", () => this.cancel(id), { once: true });
+      this.post(id, job);
+    });
+  }
+
+  private ensureWorker(): Worker {
+    if (!this.worker) {
+      this.worker = new Worker(new URL("../workers/report.worker.ts", import.meta.url), { type: "module" });
+      this.worker.onmessage = (event: MessageEvent<ReportWorkerResponse>) => this.handleMessage(event.data);
+      this.worker.onerror = (event) => this.handleCrash(event);
+      this.loadedData = null;
+    }
+    if (this.loadedData !== this.data) {
+      const load: ReportWorkerRequest = { type: "load", data: this.data! };
+      this.worker.postMessage(load);
+      this.loadedData = this.data;
+    }
+    return this.worker;
+  }
+
+  private post(id: number, job: ReportJob) {
+    const message: ReportWorkerRequest = { type: "job", id, job };
+    this.ensureWorker().postMessage(message);
+  }
+
+  private handleMessage(message: ReportWorkerResponse) {
+    const pending = this.pending.get(message.id);
+    if (!pending) return;
+    if (message.type === "progress") {
+      pending.onProgress?.(message.done, message.total);
+      return;
+    }
+    this.pending.delete(message.id);
+    if (message.type === "result") pending.resolve(message.result);
+    else pending.reject(new Error(message.message));
+  }
+
+  // Falha ao carregar/executar o worker: os pedidos em aberto são refeitos na thread principal
+  private handleCrash(event: ErrorEvent) {
+    console.error("Worker de relatórios falhou:", event.message);
+    this.worker?.terminate();
+    this.worker = null;
+    this.workerFailed = true;
+    const data = this.data;
+    const pending = [...this.pending.values()];
+    this.pending.clear();
+    for (const { job, resolve, reject, onProgress } of pending) {
+      try {
+        resolve(runReportJob(data!, job, onProgress));
+      } catch (err) {
+        reject(err);
+      }
+    }
+  }
+
+  /**
+   * Cancela um trabalho. O worker processa cada trabalho de forma síncrona e não
+   * lê mensagens no meio dele, então o cancelamento encerra o worker; os demais
+   * pedidos pendentes são reenviados a um worker novo.
+   */
+  private cancel(id: number) {
+    const pending = this.pending.get(id);
+    if (!pending) return;
+    this.pending.delete(id);
+    pending.reject(abortError());
+
+    this.worker?.terminate();
+    this.worker = null;
+    for (const [otherId, other] of this.pending) this.post(otherId, other.job);
+  }
+}
+
+export const reportService = new ReportService();
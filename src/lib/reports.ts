@@ -0,0 +1,410 @@
+import { BusinessData } from "@/types/business";
+import { getBusinessIndex, findCliente, findServico, rowsInMonthRange } from "@/lib/business-index";
+import { PdfCell, PdfReport } from "@/lib/pdf-report";
+import { Cents, asCents, commissionCents, formatCents, sumCents } from "@/lib/money";
+
+/**
+ * Cálculos dos relatórios de comissões, sem dependência de React ou do DOM,
+ * para poderem rodar tanto no worker de relatórios quanto na thread principal.
+ */
+
+export interface ReportFilters {
+  selectedMonth: string;
+  dateFilterType: "recebimento" | "servico";
+  statusFilter: string;
+  clienteFilter: string;
+  dataInicio: string;
+  dataFim: string;
+}
+
+export interface ReportRow {
+  id: string;
+  dataServico: string;
+  dataRecebimento: string | null | undefined;
+  clienteNome: string;
+  veiculoInfo: string;
+  valorBruto: Cents;
+  porcentagemComissao: number;
+  comissaoTotal: Cents;
+  valorRecebido: Cents;
+  pendente: Cents;
+  status: 'Recebido' | 'Pendente';
+}
+
+export interface ReportTotals {
+  totalServicos: number;
+  totalValorBruto: Cents;
+  totalComissoes: Cents;
+  totalRecebido: Cents;
+  totalPendente: Cents;
+}
+
+export interface ReportResult {
+  rows: ReportRow[];
+  totals: ReportTotals;
+}
+
+export const MONTH_NAMES = [
+  "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+  "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
+];
+
+// Valores em centavos (src/lib/money.ts)
+export const formatCurrency = formatCents;
+
+// Função para formatar data de forma robusta e evitar fuso horário incorreto
+export const formatDate = (dateString: string | null | undefined) => {
+  if (!dateString) return '-';
+  try {
+    // Pega apenas a parte YYYY-MM-DD caso venha com hora (T ou espaço)
+    const datePart = dateString.includes('T') 
+      ? dateString.split('T')[0] 
+      : (dateString.includes(' ') ? dateString.split(' ')[0] : dateString);
+    
+    const date = new Date(datePart + 'T00:00:00');
+    if (isNaN(date.getTime())) {
+      const fallback = new Date(dateString);
+      if (isNaN(fallback.getTime())) {
+        return '-';
+      }
+      return fallback.toLocaleDateString('pt-BR');
+    }
+    return date.toLocaleDateString('pt-BR');
+  } catch (error) {
+    console.error('Erro ao formatar data:', error);
+    return '-';
+  }
+};
+
+/** Linhas filtradas do relatório (por data do serviço ou por recebimento de comissão). */
+export function buildReportRows(data: BusinessData, filters: ReportFilters): ReportRow[] {
+  const { selectedMonth, dateFilterType, statusFilter, clienteFilter, dataInicio, dataFim } = filters;
+  const index = getBusinessIndex(data);
+  if (dateFilterType === "servico") {
+    // Filtro por mês/período: parte só dos baldes mensais que podem conter linhas
+    const candidatos = selectedMonth !== "todos"
+      ? index.servicosByMonth.get(selectedMonth) ?? []
+      : (dataInicio || dataFim) ? rowsInMonthRange(index.servicosByMonth, dataInicio, dataFim) : data.servicos;
+    return candidatos.filter(servico => {
+      // Filtro por status
+      let passesStatusFilter = true;
+      if (statusFilter !== "todos") {
+        const isRecebido = servico.comissao_recebida >= commissionCents(servico.valor_bruto, servico.porcentagem_comissao);
+        
+        if (statusFilter === "recebidos") {
+          passesStatusFilter = isRecebido;
+        } else if (statusFilter === "pendentes") {
+          passesStatusFilter = !isRecebido;
+        }
+      }
+
+      // Filtro por cliente
+      let passesClientFilter = true;
+      if (clienteFilter.trim() !== "") {
+        const cliente = findCliente(index, servico.cliente_id);
+        const clienteNome = cliente ? cliente.nome.toLowerCase() : '';
+        passesClientFilter = clienteNome.includes(clienteFilter.toLowerCase());
+      }
+
+      // Filtro por data início e fim
+      let passesDateRangeFilter = true;
+      if (dataInicio || dataFim) {
+        const servicoDate = servico.data_servico; // YYYY-MM-DD
+        if (dataInicio && servicoDate < dataInicio) passesDateRangeFilter = false;
+        if (dataFim && servicoDate > dataFim) passesDateRangeFilter = false;
+      }
+
+      return passesStatusFilter && passesClientFilter && passesDateRangeFilter;
+    }).map(servico => {
+      const comissaoTotal = commissionCents(servico.valor_bruto, servico.porcentagem_comissao);
+      const valorRecebido = servico.comissao_recebida;
+      const pendente = asCents(Math.max(0, comissaoTotal - valorRecebido));
+      const cliente = findCliente(index, servico.cliente_id);
+      return {
+        id: `s-${servico.id}`,
+        dataServico: servico.data_servico,
+        dataRecebimento: servico.data_recebimento_comissao,
+        clienteNome: cliente?.nome || 'Cliente não encontrado',
+        veiculoInfo: `${servico.veiculo} - ${servico.placa}`,
+        valorBruto: servico.valor_bruto,
+        porcentagemComissao: Number(servico.porcentagem_comissao),
+        comissaoTotal,
+        valorRecebido,
+        pendente,
+        status: valorRecebido >= comissaoTotal ? 'Recebido' as const : 'Pendente' as const
+      };
+    });
+  } else {
+    // Filtrar por comissões recebidas (Recebimento)
+    const candidatas = selectedMonth !== "todos"
+      ? index.comissoesByMonth.get(selectedMonth) ?? []
+      : (dataInicio || dataFim) ? rowsInMonthRange(index.comissoesByMonth, dataInicio, dataFim) : data.comissoes;
+    return candidatas.filter(comissao => {
+      if (comissao.status !== 'recebido') return false;
+
+      const servico = findServico(index, comissao.servico_id);
+      if (!servico) return false;
+
+      // Filtro por status
+      let passesStatusFilter = true;
+      if (statusFilter === "pendentes") {
+        passesStatusFilter = false;
+      }
+
+      // Filtro por cliente
+      let passesClientFilter = true;
+      if (clienteFilter.trim() !== "") {
+        const cliente = findCliente(index, servico.cliente_id);
+        const clienteNome = cliente ? cliente.nome.toLowerCase() : '';
+        passesClientFilter = clienteNome.includes(clienteFilter.toLowerCase());
+      }
+
+      // Filtro por data início e fim
+      let passesDateRangeFilter = true;
+      const receiptDate = comissao.data_recebimento.substring(0, 10);
+      if (dataInicio && receiptDate < dataInicio) passesDateRangeFilter = false;
+      if (dataFim && receiptDate > dataFim) passesDateRangeFilter = false;
+
+      return passesStatusFilter && passesClientFilter && passesDateRangeFilter;
+    }).map(comissao => {
+      const servico = findServico(index, comissao.servico_id)!;
+      const comissaoTotal = commissionCents(servico.valor_bruto, servico.porcentagem_comissao);
+      const cliente = findCliente(index, servico.cliente_id);
+      const pendente = asCents(Math.max(0, comissaoTotal - servico.comissao_recebida));
+      return {
+        id: `c-${comissao.id}`,
+        dataServico: servico.data_servico,
+        dataRecebimento: comissao.data_recebimento,
+        clienteNome: cliente?.nome || 'Cliente não encontrado',
+        veiculoInfo: `${servico.veiculo} - ${servico.placa}`,
+        valorBruto: servico.valor_bruto,
+        porcentagemComissao: Number(servico.porcentagem_comissao),
+        comissaoTotal,
+        valorRecebido: comissao.valor, // O valor recebido especificamente nesta data!
+        pendente,
+        status: 'Recebido' as const
+      };
+    });
+  }
+}
+
+// Calcular totais baseados nas linhas filtradas (somas inteiras em centavos)
+export function summarizeReport(rows: ReportRow[]): ReportTotals {
+  const totalComissoes = sumCents(rows, r => r.comissaoTotal);
+  const totalRecebido = sumCents(rows, r => r.valorRecebido);
+  return {
+    totalServicos: rows.length,
+    totalValorBruto: sumCents(rows, r => r.valorBruto),
+    totalComissoes,
+    totalRecebido,
+    totalPendente: asCents(Math.max(0, totalComissoes - totalRecebido))
+  };
+}
+
+export function buildReport(data: BusinessData, filters: ReportFilters): ReportResult {
+  const rows = buildReportRows(data, filters);
+  return { rows, totals: summarizeReport(rows) };
+}
+
+export const monthLabel = (month: string) =>
+  MONTH_NAMES[parseInt(month.split('-')[1]) - 1] + " de " + month.split('-')[0];
+
+/** Descrição do PDF do relatório filtrado, no formato de `renderReportPdf`. */
+export function buildReportPdf({ rows, totals }: ReportResult, filters: ReportFilters, generatedAt: string): PdfReport {
+  const { selectedMonth, dateFilterType, statusFilter, clienteFilter, dataInicio, dataFim } = filters;
+  const isRecebimento = dateFilterType === "recebimento";
+  const reportTitle = isRecebimento ? "Relatório de Recebimentos" : "Relatório de Comissões (Serviço)";
+  const filterMonthText = selectedMonth !== "todos" 
+    ? monthLabel(selectedMonth)
+    : "Todos";
+  const statusText = statusFilter === 'recebidos' ? 'Recebidos' : statusFilter === 'pendentes' ? 'Pendentes' : 'Todos';
+
+  return {
+    title: "Oliveira Martelinho de Ouro",
+    subtitle: reportTitle,
+    meta: [`Gerado em: ${generatedAt} | Período/Mês: ${filterMonthText}`],
+    filters: [
+      `Filtros aplicados: Mês: ${filterMonthText}`,
+      `Tipo de Data: ${isRecebimento ? "Recebimento" : "Serviço"}`,
+      `Status: ${statusText}`,
+      clienteFilter ? `Cliente: ${clienteFilter}` : '',
+      dataInicio ? `Início: ${formatDate(dataInicio)}` : '',
+      dataFim ? `Fim: ${formatDate(dataFim)}` : ''
+    ].filter(Boolean).join(' | '),
+    summary: [
+      { label: "Total Registros", value: String(totals.totalServicos) },
+      { label: "Valor Bruto", value: formatCurrency(totals.totalValorBruto) },
+      { label: "Total Recebido", value: formatCurrency(totals.totalRecebido), tone: "success" },
+      { label: "Total Pendente", value: formatCurrency(totals.totalPendente), tone: "danger" }
+    ],
+    table: {
+      columns: [
+        { header: "Data Serv.", width: 9 },
+        { header: "Data Rec.", width: 9 },
+        { header: "Cliente", width: 15 },
+        { header: "Veículo", width: 15 },
+        { header: "Valor Bruto", width: 11, align: "right" },
+        { header: "Comissão", width: 14, align: "right" },
+        { header: isRecebimento ? "Recebido no Dia" : "Recebido", width: 11, align: "right" },
+        { header: "Pendente", width: 10, align: "right" },
+        { header: "Status", width: 8, align: "center" }
+      ],
+      rows: rows.map((row): (string | PdfCell)[] => [
+        formatDate(row.dataServico),
+        row.dataRecebimento ? formatDate(row.dataRecebimento) : '-',
+        { text: row.clienteNome, bold: true },
+        row.veiculoInfo,
+        formatCurrency(row.valorBruto),
+        `${formatCurrency(row.comissaoTotal)} (${row.porcentagemComissao}%)`,
+        { text: formatCurrency(row.valorRecebido), tone: "success", bold: true },
+        { text: formatCurrency(row.pendente), tone: row.pendente > 0 ? "danger" : "muted" },
+        { text: row.status, tone: row.status === 'Recebido' ? "success" : "warning", bold: true }
+      ])
+    }
+  };
+}
+
+/** Totais de comissões recebidas por dia (YYYY-MM-DD), do mais antigo ao mais recente. */
+export function dailyReceiptTotals(data: BusinessData, dataInicio?: string, dataFim?: string) {
+  // 1. Filter commissions that are received
+  const receivedCommissions = data.comissoes.filter(c => c.status === 'recebido');
+
+  // 2. Filter by date range if provided
+  const filteredByDate = receivedCommissions.filter(c => {
+    if (!dataInicio || !dataFim) return true; // If no dates, include all received
+    // Normalize dates to avoid timezone issues. Compare YYYY-MM-DD strings.
+    const receiptDate = c.data_recebimento.substring(0, 10);
+    return receiptDate >= dataInicio && receiptDate <= dataFim;
+  });
+
+  // 3. Group by date and sum the values
+  const groupedByDate = filteredByDate.reduce((acc, comissao) => {
+    const date = comissao.data_recebimento.substring(0, 10);
+    acc[date] = asCents((acc[date] ?? 0) + comissao.valor);
+    return acc;
+  }, {} as Record<string, Cents>);
+
+  // 4. Convert the grouped object to an array and sort by date
+  const dailyTotals = Object.entries(groupedByDate)
+    .map(([date, total]) => ({ date, total }))
+    .sort((a, b) => a.date.localeCompare(b.date));
+
+  const grandTotal = sumCents(dailyTotals, item => item.total);
+
+  return { dailyTotals, grandTotal };
+}
+
+const pct = (part: number, total: number) => `${Math.round((part / total * 100) || 0)}%`;
+
+export type ViewerReportType = 'comissoes' | 'extrato' | 'despesas' | 'recebimentos';
+
+/** PDF de cada relatório do ReportViewer, com o mesmo conteúdo da visualização em tela. */
+export function buildViewerPdf(
+  data: BusinessData,
+  reportType: ViewerReportType,
+  generatedAt: string,
+  dataInicio?: string,
+  dataFim?: string
+): PdfReport | null {
+  const index = getBusinessIndex(data);
+  const empresa = "Oliveira Martelinho de Ouro";
+  const geradoEm = `Gerado em: ${generatedAt}`;
+
+  switch (reportType) {
+    case 'comissoes': {
+      const totalComissoes = sumCents(data.servicos, s => commissionCents(s.valor_bruto, s.porcentagem_comissao));
+      const comissoesRecebidas = sumCents(data.servicos, s => s.comissao_recebida);
+      const comissoesPendentes = asCents(totalComissoes - comissoesRecebidas);
+      return {
+        title: "Relatório de Comissões",
+        subtitle: empresa,
+        meta: [geradoEm],
+        summary: [
+          { label: "Total de Comissões", value: formatCurrency(totalComissoes) },
+          { label: "Comissões Recebidas", value: formatCurrency(comissoesRecebidas), tone: "success" },
+          { label: "Comissões Pendentes", value: formatCurrency(comissoesPendentes), tone: "warning" }
+        ],
+        details: [
+          { label: "Taxa de Recebimento:", value: pct(comissoesRecebidas, totalComissoes) },
+          { label: "Taxa Pendente:", value: pct(comissoesPendentes, totalComissoes) }
+        ]
+      };
+    }
+    case 'extrato':
+      return {
+        title: "Extrato Detalhado de Comissões",
+        subtitle: empresa,
+        meta: [geradoEm],
+        table: {
+          columns: [
+            { header: "Data", width: 10 },
+            { header: "Cliente", width: 18 },
+            { header: "Veículo", width: 20 },
+            { header: "Valor Bruto", width: 13, align: "right" },
+            { header: "Comissão %", width: 10, align: "right" },
+            { header: "Valor Comissão", width: 13, align: "right" },
+            { header: "Status", width: 10, align: "center" }
+          ],
+          rows: [...data.servicos].sort((a, b) => new Date(a.data_servico).getTime() - new Date(b.data_servico).getTime()).map((servico): (string | PdfCell)[] => [
+            formatDate(servico.data_servico),
+            findCliente(index, servico.cliente_id)?.nome || 'Cliente não encontrado',
+            `${servico.veiculo} - ${servico.placa}`,
+            formatCurrency(servico.valor_bruto),
+            `${servico.porcentagem_comissao}%`,
+            { text: formatCurrency(servico.comissao_recebida), tone: "success", bold: true },
+            { text: servico.quitado ? "Finalizado" : "Pendente", tone: servico.quitado ? "default" : "muted" }
+          ])
+        }
+      };
+    case 'despesas': {
+      const totalDespesas = sumCents(data.despesas, d => d.valor);
+      const despesasPagas = sumCents(data.despesas.filter(d => d.pago), d => d.valor);
+      return {
+        title: "Relatório de Despesas",
+        subtitle: empresa,
+        meta: [geradoEm],
+        summary: [
+          { label: "Total de Despesas", value: formatCurrency(totalDespesas) },
+          { label: "Despesas Pagas", value: formatCurrency(despesasPagas), tone: "success" },
+          { label: "Despesas Pendentes", value: formatCurrency(asCents(totalDespesas - despesasPagas)), tone: "danger" }
+        ],
+        table: {
+          columns: [
+            { header: "Descrição", width: 40 },
+            { header: "Valor", width: 15, align: "right" },
+            { header: "Vencimento", width: 13 },
+            { header: "Status", width: 10, align: "center" }
+          ],
+          rows: [...data.despesas].sort((a, b) => new Date(a.data_vencimento).getTime() - new Date(b.data_vencimento).getTime()).map((despesa): (string | PdfCell)[] => [
+            despesa.descricao,
+            formatCurrency(despesa.valor),
+            formatDate(despesa.data_vencimento),
+            { text: despesa.pago ? "Paga" : "Pendente", tone: despesa.pago ? "success" : "danger" }
+          ])
+        }
+      };
+    }
+    case 'recebimentos': {
+      const { dailyTotals, grandTotal } = dailyReceiptTotals(data, dataInicio, dataFim);
+      return {
+        title: "Histórico de Recebimentos",
+        subtitle: empresa,
+        meta: [`Período de ${dataInicio ? formatDate(dataInicio) : 'Início'} a ${dataFim ? formatDate(dataFim) : 'Fim'}`],
+        summary: [{ label: "Total Recebido no Período", value: formatCurrency(grandTotal), tone: "success" }],
+        table: {
+          columns: [
+            { header: "Data do Recebimento", width: 1 },
+            { header: "Valor Total Recebido no Dia", width: 1, align: "right" }
+          ],
+          rows: dailyTotals.map(({ date, total }): (string | PdfCell)[] => [
+            formatDate(date),
+            { text: formatCurrency(total), tone: "success", bold: true }
+          ]),
+          emptyText: "Nenhum recebimento encontrado para o período selecionado."
+        }
+      };
+    }
+    default:
+      return null;
+  }
+}
@@ -0,0 +1,136 @@
+import { BusinessData, DashboardMetrics, Despesa, Servico } from "@/types/business";
+import { getBusinessIndex, servicosDoCliente } from "@/lib/business-index";
+import { computeDashboardMetrics } from "@/lib/metrics";
+import { Cents, asCents, commissionCents, sumCents } from "@/lib/money";
+
+/**
+ * Seletores de estado derivado compartilhados pelas abas.
+ *
+ * Todo `setBusinessData` gera um objeto novo, então cada resultado fica em
+ * cache por objeto `BusinessData` (a "versão" dos dados) e, quando há filtros,
+ * pela chave dos filtros. Re-renderizações que não trocam os dados (digitar
+ * num campo, abrir um diálogo) só leem o cache.
+ */
+
+const caches = new WeakMap<BusinessData, Map<string, unknown>>();
+
+function memo<T>(data: BusinessData, key: string, compute: () => T): T {
+  let cache = caches.get(data);
+  if (!cache) {
+    cache = new Map();
+    caches.set(data, cache);
+  }
+  if (!cache.has(key)) cache.set(key, compute());
+  return cache.get(key) as T;
+}
+
+const byDateDesc = <T>(field: (row: T) => string) => (a: T, b: T) =>
+  new Date(field(b)).getTime() - new Date(field(a)).getTime();
+
+// Dinheiro em centavos inteiros: os totais abaixo são somas exatas, sem arredondar por linha
+const comissaoDoServico = (s: Servico) => commissionCents(s.valor_bruto, s.porcentagem_comissao);
+
+/** Serviços do mais recente para o mais antigo */
+export const selectServicosOrdenados = (data: BusinessData): Servico[] =>
+  memo(data, "servicos:ordenados", () => [...data.servicos].sort(byDateDesc<Servico>(s => s.data_servico)));
+
+/** Totais de comissão de todos os serviços, sem filtros */
+export const selectTotaisComissoes = (data: BusinessData) =>
+  memo(data, "comissoes:totais", () => {
+    const totalComissoes = sumCents(data.servicos, comissaoDoServico);
+    const totalRecebidas = sumCents(data.servicos, s => s.comissao_recebida);
+    return { totalComissoes, totalRecebidas };
+  });
+
+export interface ComissoesFiltradas {
+  /** Serviços filtrados, do mais recente para o mais antigo */
+  servicos: Servico[];
+  totalComissoes: Cents;
+  comissoesRecebidas: Cents;
+  comissoesPendentes: Cents;
+}
+
+/** Serviços da aba de comissões filtrados por mês (YYYY-MM ou "todos") e status, com os totais do filtro. */
+export const selectComissoesFiltradas = (data: BusinessData, filtroMes: string, filtroStatus: string): ComissoesFiltradas =>
+  memo(data, `comissoes:${filtroMes}:${filtroStatus}`, () => {
+    const base = filtroMes === "todos"
+      ? data.servicos
+      : getBusinessIndex(data).servicosByMonth.get(filtroMes) ?? [];
+
+    const servicos = base.filter(servico => {
+      if (filtroStatus === "todos") return true;
+      const comissaoTotal = comissaoDoServico(servico);
+      const comissaoRecebida = servico.comissao_recebida;
+      if (filtroStatus === "pendente") return comissaoRecebida === 0;
+      if (filtroStatus === "parcial") return comissaoRecebida > 0 && comissaoRecebida < comissaoTotal;
+      if (filtroStatus === "completo") return comissaoRecebida >= comissaoTotal;
+      return false;
+    }).sort(byDateDesc<Servico>(s => s.data_servico));
+
+    const totalComissoes = sumCents(servicos, comissaoDoServico);
+    const comissoesRecebidas = sumCents(servicos, s => s.comissao_recebida);
+    return { servicos, totalComissoes, comissoesRecebidas, comissoesPendentes: asCents(totalComissoes - comissoesRecebidas) };
+  });
+
+/** Despesas pelo vencimento, do mais recente para o mais antigo */
+export const selectDespesasOrdenadas = (data: BusinessData): Despesa[] =>
+  memo(data, "despesas:ordenadas", () => [...data.despesas].sort(byDateDesc<Despesa>(d => d.data_vencimento)));
+
+export const selectTotaisDespesas = (data: BusinessData) =>
+  memo(data, "despesas:totais", () => {
+    let totalDespesas = 0;
+    let totalPago = 0;
+    for (const despesa of data.despesas) {
+      totalDespesas += despesa.valor;
+      if (despesa.pago) totalPago += despesa.valor;
+    }
+    return { totalDespesas: asCents(totalDespesas), totalPago: asCents(totalPago), totalPendente: asCents(totalDespesas - totalPago) };
+  });
+
+export interface ClientStats {
+  totalServicos: number;
+  totalFaturamento: Cents;
+  ultimoServico: Date | null;
+}
+
+const EMPTY_STATS: ClientStats = { totalServicos: 0, totalFaturamento: asCents(0), ultimoServico: null };
+
+/** Estatísticas de todos os clientes, calculadas numa única passada pelos serviços */
+const selectClientStatsMap = (data: BusinessData) =>
+  memo(data, "clientes:stats", () => {
+    const stats = new Map<string, ClientStats>();
+    for (const servico of data.servicos) {
+      if (servico.cliente_id === null || servico.cliente_id === undefined) continue;
+      const key = String(servico.cliente_id);
+      const current: ClientStats = stats.get(key) ?? { totalServicos: 0, totalFaturamento: asCents(0), ultimoServico: null };
+      const time = new Date(servico.data_servico).getTime();
+      current.totalServicos++;
+      current.totalFaturamento = asCents(current.totalFaturamento + servico.valor_bruto);
+      if (!isNaN(time) && (!current.ultimoServico || time > current.ultimoServico.getTime())) {
+        current.ultimoServico = new Date(time);
+      }
+      stats.set(key, current);
+    }
+    return stats;
+  });
+
+export const selectClientStats = (data: BusinessData, clienteId: number | string): ClientStats =>
+  selectClientStatsMap(data).get(String(clienteId)) ?? EMPTY_STATS;
+
+/** Clientes com pelo menos um serviço e ticket médio por cliente */
+export const selectResumoClientes = (data: BusinessData) =>
+  memo(data, "clientes:resumo", () => {
+    const stats = selectClientStatsMap(data);
+    const activeClientsCount = data.clientes.filter(c => (stats.get(String(c.id))?.totalServicos ?? 0) > 0).length;
+    const faturamento = sumCents(data.servicos, s => s.valor_bruto);
+    return { activeClientsCount, ticketMedio: asCents(faturamento / (data.clientes.length || 1)) };
+  });
+
+/** Serviços de um cliente, do mais recente para o mais antigo */
+export const selectServicosDoCliente = (data: BusinessData, clienteId: number | string): Servico[] =>
+  memo(data, `clientes:servicos:${clienteId}`, () =>
+    [...servicosDoCliente(getBusinessIndex(data), clienteId)].sort(byDateDesc<Servico>(s => s.data_servico)));
+
+/** Métricas do painel calculadas localmente (reserva quando `/api/metrics` falha) */
+export const selectDashboardFallback = (data: BusinessData): DashboardMetrics =>
+  memo(data, "dashboard:metrics", () => computeDashboardMetrics(data));
@@ -0,0 +1,69 @@
+import { RawSnapshot } from "@/lib/data-client";
+
+/**
+ * Cache persistente do último snapshot de `/api/data` no IndexedDB.
+ *
+ * O app abre direto desse snapshot e revalida em segundo plano; como o
+ * snapshot guarda o `serverTime`, a revalidação já é incremental. Alterar o
+ * formato salvo exige incrementar `CACHE_VERSION` (entradas antigas são ignoradas).
+ */
+
+const DB_NAME = "oliveira-cache";
+const STORE = "snapshots";
+const KEY = "business-data";
+// 2: dinheiro em centavos inteiros
+const CACHE_VERSION = 2;
+
+export interface CachedSnapshot {
+  version: number;
+  /** Momento (ms) em que o snapshot foi salvo; usado como `updatedAt` no react-query */
+  savedAt: number;
+  snapshot: RawSnapshot;
+}
+
+function openDb(): Promise<IDBDatabase> {
+  return new Promise((resolve, reject) => {
+    const request = indexedDB.open(DB_NAME, 1);
+    request.onupgradeneeded = () => request.result.createObjectStore(STORE);
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+async function withStore<T>(mode: IDBTransactionMode, run: (store: IDBObjectStore) => IDBRequest<T>): Promise<T> {
+  const db = await openDb();
+  try {
+    return await new Promise<T>((resolve, reject) => {
+      const tx = db.transaction(STORE, mode);
+      const request = run(tx.objectStore(STORE));
+      tx.oncomplete = () => resolve(request.result);
+      tx.onerror = () => reject(tx.error);
+      tx.onabort = () => reject(tx.error);
+    });
+  } finally {
+    db.close();
+  }
+}
+
+/** Lê o snapshot salvo; devolve null se não houver, se for de outra versão ou se o IndexedDB falhar. */
+export async function loadCachedSnapshot(): Promise<CachedSnapshot | null> {
+  if (typeof indexedDB === "undefined") return null;
+  try {
+    const cached = await withStore<CachedSnapshot | undefined>("readonly", store => store.get(KEY));
+    return cached && cached.version === CACHE_VERSION && cached.snapshot?.tables ? cached : null;
+  } catch (err) {
+    console.warn("Cache local indisponível:", err);
+    return null;
+  }
+}
+
+/** Salva o snapshot; falhas (cota, modo privado) só são registradas no console. */
+export async function saveCachedSnapshot(snapshot: RawSnapshot): Promise<void> {
+  if (typeof indexedDB === "undefined") return;
+  const entry: CachedSnapshot = { version: CACHE_VERSION, savedAt: Date.now(), snapshot };
+  try {
+    await withStore("readwrite", store => store.put(entry, KEY));
+  } catch (err) {
+    console.warn("Não foi possível salvar o cache local:", err);
+  }
+}
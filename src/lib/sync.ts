@@ -0,0 +1,130 @@
+import { BusinessData } from "@/types/business";
+import { rowInReais } from "@/lib/money";
+
+type SyncTable = "clientes" | "servicos" | "despesas" | "comissoes";
+
+const SYNC_TABLES: SyncTable[] = ["clientes", "servicos", "despesas", "comissoes"];
+
+// Campos calculados no cliente que não existem nas tabelas do Neon
+const LOCAL_ONLY_FIELDS = new Set(["data_recebimento_comissao", "data_cadastro", "categoria"]);
+
+type Row = { id: number | string } & Record<string, unknown>;
+
+export interface TableChanges {
+  inserted: Row[];
+  updated: Row[];
+  deleted: (number | string)[];
+}
+
+export type Changeset = Record<SyncTable, TableChanges>;
+
+/** Mapeamento de ids temporários (`temp_...`) para os ids reais devolvidos por `/api/sync`. */
+export type SyncIdMap = Partial<Record<SyncTable, Record<string, number>>>;
+
+/** Linha rejeitada por `/api/sync`, com o id que o cliente enviou (temporário nas inclusões). */
+export interface SyncError {
+  table: SyncTable;
+  kind: "inserted" | "updated";
+  id: number | string | null;
+  message: string;
+}
+
+const isTempId = (id: number | string) => typeof id === "string" && !/^\d+$/.test(id);
+
+const sameRow = (a: Row, b: Row) => {
+  if (a === b) return true;
+  const keys = new Set([...Object.keys(a), ...Object.keys(b)]);
+  for (const key of keys) {
+    if (LOCAL_ONLY_FIELDS.has(key)) continue;
+    if ((a[key] ?? null) !== (b[key] ?? null)) return false;
+  }
+  return true;
+};
+
+// Sem os campos locais e com o dinheiro em reais, como as colunas DECIMAL do Neon esperam
+const toServerRow = (table: SyncTable, row: Row): Row => {
+  const out: Row = { id: row.id };
+  for (const [key, value] of Object.entries(row)) {
+    if (!LOCAL_ONLY_FIELDS.has(key)) out[key] = value;
+  }
+  return rowInReais(table, out);
+};
+
+/**
+ * Compara dois snapshots e devolve apenas as linhas incluídas, alteradas e excluídas
+ * de cada tabela. Custo O(n) por tabela usando mapas por id.
+ */
+export function diffBusinessData(oldData: BusinessData, newData: BusinessData): Changeset {
+  const changes = {} as Changeset;
+  for (const table of SYNC_TABLES) {
+    const before = new Map<string, Row>();
+    for (const row of oldData[table] as unknown as Row[]) before.set(String(row.id), row);
+
+    const inserted: Row[] = [];
+    const updated: Row[] = [];
+    for (const row of newData[table] as unknown as Row[]) {
+      const key = String(row.id);
+      const previous = before.get(key);
+      if (!previous) {
+        inserted.push(toServerRow(table, row));
+      } else {
+        before.delete(key);
+        if (!sameRow(previous, row)) updated.push(toServerRow(table, row));
+      }
+    }
+    const deleted = [...before.values()].map(r => r.id).filter(id => !isTempId(id));
+    changes[table] = { inserted, updated, deleted };
+  }
+  return changes;
+}
+
+export function isEmptyChangeset(changes: Changeset): boolean {
+  return SYNC_TABLES.every(t => {
+    const c = changes[t];
+    return c.inserted.length === 0 && c.updated.length === 0 && c.deleted.length === 0;
+  });
+}
+
+/** Substitui ids temporários (e as referências a eles) pelos ids reais do banco. */
+export function applyIdMap(data: BusinessData, ids: SyncIdMap): BusinessData {
+  const resolve = (table: SyncTable, id: number | string) => {
+    const real = ids[table]?.[String(id)];
+    return real !== undefined ? real : id;
+  };
+  if (!SYNC_TABLES.some(t => ids[t] && Object.keys(ids[t]!).length > 0)) return data;
+
+  return {
+    ...data,
+    clientes: data.clientes.map(c => ({ ...c, id: resolve("clientes", c.id) })),
+    servicos: data.servicos.map(s => ({ ...s, id: resolve("servicos", s.id), cliente_id: resolve("clientes", s.cliente_id) })),
+    despesas: data.despesas.map(d => ({ ...d, id: resolve("despesas", d.id) })),
+    comissoes: data.comissoes.map(c => ({
+      ...c,
+      id: resolve("comissoes", c.id) as number,
+      servico_id: resolve("servicos", c.servico_id) as number
+    }))
+  };
+}
+
+/**
+ * Desfaz no estado local só as linhas que `/api/sync` rejeitou: inclusões
+ * somem e alterações voltam à versão de `oldData`. As demais já estão no banco
+ * e ficam como estão. Chamar antes de `applyIdMap`, enquanto as inclusões
+ * rejeitadas ainda têm o id temporário.
+ */
+export function revertFailedRows(data: BusinessData, oldData: BusinessData, errors: SyncError[]): BusinessData {
+  if (errors.length === 0) return data;
+  const next = { ...data };
+  for (const table of SYNC_TABLES) {
+    const failed = errors.filter(e => e.table === table && e.id !== null);
+    if (failed.length === 0) continue;
+    const dropped = new Set(failed.filter(e => e.kind === "inserted").map(e => String(e.id)));
+    const restored = new Set(failed.filter(e => e.kind === "updated").map(e => String(e.id)));
+    const before = new Map((oldData[table] as unknown as Row[]).map(row => [String(row.id), row]));
+    const rows = (data[table] as unknown as Row[])
+      .filter(row => !dropped.has(String(row.id)))
+      .map(row => (restored.has(String(row.id)) ? before.get(String(row.id)) ?? row : row));
+    (next as Record<SyncTable, unknown>)[table] = rows;
+  }
+  return next;
+}
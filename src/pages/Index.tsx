@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { useToast } from "@/hooks/use-toast";
 import { BusinessData, Servico } from "@/types/business";
 import { Header } from "@/components/business/Header";
@@ -12,14 +12,30 @@ import { RelatoriosTab } from "@/components/business/RelatoriosTab";
 import { BackupTab } from "@/components/business/BackupTab";
 import { ImportDialog } from "@/components/business/ImportDialog";
 import { useNavigate } from "react-router-dom";
+import { useQuery, useQueryClient } from "@tanstack/react-query";
 import { Loader2 } from "lucide-react";
+import { perfMark, perfMeasure } from "@/lib/perf";
+import { diffBusinessData, isEmptyChangeset, applyIdMap, revertFailedRows, SyncError } from "@/lib/sync";
+import { BUSINESS_DATA_QUERY_KEY, fetchSnapshot, toBusinessData, RawSnapshot, RawTables } from "@/lib/data-client";
+import { loadCachedSnapshot, saveCachedSnapshot } from "@/lib/snapshot-cache";
+import { importBackup, ImportProgress } from "@/lib/backup-stream";
+import { METRICS_QUERY_KEY } from "@/lib/metrics";
+import { getBusinessIndex, findServico } from "@/lib/business-index";
+import { Cents, asCents, formatCents, fromCents, toCents } from "@/lib/money";
 
 const Index = () => {
   const { toast } = useToast();
   const navigate = useNavigate();
-  const [loading, setLoading] = useState(true);
+  const queryClient = useQueryClient();
   const [activeTab, setActiveTab] = useState("dashboard");
   const [showImportDialog, setShowImportDialog] = useState(false);
+  // Só busca no servidor depois de ler o cache local, para a primeira carga já ser incremental
+  const [cacheChecked, setCacheChecked] = useState(false);
+  // Tabelas brutas já convertidas; revalidações sem mudanças devolvem os mesmos arrays
+  const mappedTablesRef = useRef<RawTables | null>(null);
+  const shownFromCacheRef = useRef(false);
+  // Último snapshot gravado no IndexedDB (ou lido dele), para não regravar o mesmo objeto
+  const savedSnapshotRef = useRef<RawSnapshot | null>(null);
   
   // Initial data structure
   const [businessData, setBusinessData] = useState<BusinessData>({
@@ -37,204 +53,157 @@ const Index = () => {
     }
   });
 
+  // Abre com o último snapshot salvo no IndexedDB; a revalidação segue em segundo plano
   useEffect(() => {
-    const initialize = async () => {
-      try {
-        const healthResp = await fetch('/api/health')
-        if (healthResp.ok) {
-          const health = await healthResp.json()
-          if (health?.ok && health?.hasEnv && health?.result) {
-            await loadUserData('')
-          } else {
-            throw new Error('Ambiente sem DATABASE_URL ou conexão indisponível')
-          }
-        } else {
-          throw new Error('Falha no health check')
-        }
-      } finally {
-        setLoading(false);
-      }
-    };
-    initialize();
+    perfMark('boot:start');
+    loadCachedSnapshot()
+      .then(cached => {
+        if (!cached) return;
+        shownFromCacheRef.current = true;
+        savedSnapshotRef.current = cached.snapshot;
+        queryClient.setQueryData(BUSINESS_DATA_QUERY_KEY, cached.snapshot, { updatedAt: cached.savedAt });
+        perfMeasure('boot:cache', 'boot:start');
+      })
+      .finally(() => setCacheChecked(true));
   }, []);
 
-  const loadUserData = async (userId: string) => {
-    try {
-      const resp = await fetch('/api/data');
-      if (!resp.ok) throw new Error('Falha ao carregar dados');
-      const apiData = await resp.json();
-
-      // Map database structure to expected interface
-      const mappedClientes = (apiData.clientes || []).map((cliente: any) => ({
-        id: cliente.id,
-        nome: cliente.nome,
-        telefone: cliente.telefone || '',
-        email: cliente.email || '',
-        endereco: cliente.endereco || '',
-        cpf: cliente.cpf || '',
-        data_cadastro: cliente.created_at || ''
-      }));
+  const snapshotQuery = useQuery({
+    queryKey: BUSINESS_DATA_QUERY_KEY,
+    queryFn: async () => {
+      perfMark('data:start');
+      const previous = queryClient.getQueryData<RawSnapshot>(BUSINESS_DATA_QUERY_KEY) ?? null;
+      const snapshot = await fetchSnapshot(previous);
+      perfMeasure('data:fetch', 'data:start');
+      return snapshot;
+    },
+    enabled: cacheChecked,
+    // As tabelas podem ter milhares de linhas; a comparação é feita por referência abaixo
+    structuralSharing: false,
+    // Gravações cancelam a revalidação em andamento e disparam outra ao terminar (beginWrite/endWrite)
+    refetchOnWindowFocus: false,
+    retry: 1,
+  });
+  const snapshot = snapshotQuery.data;
+  const loading = snapshot === undefined && !snapshotQuery.isError;
 
-      const mappedComissoes = (apiData.comissoes || []).map((comissao: any) => ({
-        id: comissao.id,
-        servico_id: comissao.servico_id,
-        valor: Number(comissao.valor),
-        data_recebimento: comissao.data_recebimento,
-        status: comissao.status as 'pendente' | 'recebido' | 'atrasado',
-        created_at: comissao.created_at,
-        updated_at: comissao.updated_at
-      }));
+  useEffect(() => {
+    if (!snapshot) return;
+    // Só o snapshot que virou dado da query vai para o IndexedDB; uma busca
+    // cancelada por uma gravação não chega aqui e não sobrescreve o cache
+    if (snapshot !== savedSnapshotRef.current) {
+      savedSnapshotRef.current = snapshot;
+      saveCachedSnapshot(snapshot);
+    }
+    const previous = mappedTablesRef.current;
+    const { tables } = snapshot;
+    if (previous && previous.clientes === tables.clientes && previous.servicos === tables.servicos &&
+        previous.despesas === tables.despesas && previous.comissoes === tables.comissoes) return;
+    mappedTablesRef.current = tables;
+    setBusinessData(toBusinessData(tables));
+  }, [snapshot]);
 
-      const mappedServicos = (apiData.servicos || []).map((servico: any) => {
-        // Buscar comissão recebida para este serviço para inferir a data de recebimento
-        const comissaoRecebida = mappedComissoes.find(c => 
-          c.servico_id === servico.id && c.status === 'recebido'
-        );
-        
-        return {
-          id: servico.id,
-          data_servico: servico.data_servico,
-          veiculo: servico.veiculo,
-          placa: servico.placa,
-          valor_bruto: Number(servico.valor_bruto),
-          porcentagem_comissao: Number(servico.porcentagem_comissao),
-          observacao: servico.observacao || '',
-          valor_pago: Number(servico.valor_pago),
-          quitado: servico.quitado,
-          comissao_recebida: Number(servico.comissao_recebida),
-          cliente_id: servico.cliente_id,
-          data_recebimento_comissao: comissaoRecebida?.data_recebimento || undefined
-        };
+  useEffect(() => {
+    if (!snapshotQuery.isSuccess || snapshotQuery.isFetching || shownFromCacheRef.current) return;
+    // Primeira carga sem cache local: confirma o que veio do Neon
+    shownFromCacheRef.current = true;
+    const { clientes, servicos } = snapshotQuery.data.tables;
+    if (clientes.length > 0 || servicos.length > 0) {
+      toast({
+        title: "Dados carregados!",
+        description: `${clientes.length} clientes e ${servicos.length} serviços carregados.`,
       });
+    }
+  }, [snapshotQuery.isSuccess, snapshotQuery.isFetching]);
 
-      const mappedDespesas = (apiData.despesas || []).map((despesa: any) => ({
-        id: despesa.id,
-        descricao: despesa.descricao,
-        valor: Number(despesa.valor),
-        data_vencimento: despesa.data_vencimento,
-        pago: despesa.pago,
-        categoria: 'Geral' // Default category
-      }));
+  useEffect(() => {
+    if (!snapshotQuery.isError) return;
+    console.error('Error loading data:', snapshotQuery.error);
+    toast({
+      title: "Erro ao carregar dados",
+      description: "Não foi possível carregar seus dados.",
+      variant: "destructive",
+    });
+  }, [snapshotQuery.isError, snapshotQuery.errorUpdatedAt]);
 
-      const loadedData: BusinessData = {
-        clientes: mappedClientes,
-        servicos: mappedServicos,
-        despesas: mappedDespesas,
-        comissoes: mappedComissoes,
-        metadata: {
-          exportDate: new Date().toISOString(),
-          version: "1.0",
-          totalClientes: mappedClientes.length,
-          totalServicos: mappedServicos.length,
-          totalDespesas: mappedDespesas.length,
-          totalComissoes: mappedComissoes.length
-        }
-      };
+  // Busca no servidor o que mudou desde o snapshot atual
+  const loadUserData = () => queryClient.refetchQueries({ queryKey: BUSINESS_DATA_QUERY_KEY });
 
-      setBusinessData(loadedData);
-      
-      if (loadedData.clientes.length > 0 || loadedData.servicos.length > 0) {
-        toast({
-          title: "Dados carregados!",
-          description: `${loadedData.clientes.length} clientes e ${loadedData.servicos.length} serviços carregados.`,
-        });
-      }
-    } catch (error: any) {
-      console.error('Error loading data:', error);
-      toast({
-        title: "Erro ao carregar dados",
-        description: "Não foi possível carregar seus dados.",
-        variant: "destructive",
-      });
-    }
+  // Antes de uma gravação: cancela a revalidação em andamento, que terminaria
+  // depois da edição local e traria de volta o snapshot anterior a ela
+  const beginWrite = () => queryClient.cancelQueries({ queryKey: BUSINESS_DATA_QUERY_KEY });
+
+  // Depois da gravação: busca o que mudou (incremental, já com a edição) para o
+  // snapshot do react-query e o IndexedDB, e recalcula as métricas
+  const endWrite = () => {
+    queryClient.invalidateQueries({ queryKey: BUSINESS_DATA_QUERY_KEY });
+    queryClient.invalidateQueries({ queryKey: METRICS_QUERY_KEY });
   };
 
-  const handleImportData = async (newData: BusinessData) => {
+  const handleImportData = async (file: File, onProgress?: (progress: ImportProgress) => void) => {
     try {
-      const resp = await fetch('/api/import', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(newData)
-      })
-      if (!resp.ok) throw new Error('Falha ao importar dados')
-      const result = await resp.json()
-      await loadUserData('')
-      if (result?.ok) {
+      // Lido em streaming e enviado para /api/import em lotes numerados; uma falha pode ser retomada
+      const { counts, errors } = await importBackup(file, onProgress)
+      await loadUserData()
+      queryClient.invalidateQueries({ queryKey: METRICS_QUERY_KEY })
+      if (errors.length === 0) {
         toast({
           title: "Dados importados com sucesso!",
-          description: `${newData.clientes.length} clientes e ${newData.servicos.length} serviços foram salvos no Neon.`,
+          description: `${counts.clientes} clientes e ${counts.servicos} serviços foram salvos no Neon.`,
         })
       } else {
-        const count = Array.isArray(result?.errors) ? result.errors.length : 0
         toast({
           title: "Importação parcial",
-          description: count > 0 ? `Alguns registros falharam (${count}). Os demais foram salvos.` : 'Importação parcial concluída.',
+          description: `Alguns registros falharam (${errors.length}). Os demais foram salvos.`,
         })
-        console.error('Import errors:', result?.errors)
+        console.error('Import errors:', errors)
       }
+      return true
     } catch (error: any) {
       console.error('Error importing data:', error)
       toast({
         title: "Erro ao importar dados",
-        description: "Não foi possível salvar os dados importados.",
+        description: error?.message || "Não foi possível salvar os dados importados.",
         variant: "destructive",
       })
+      return false
     }
   }
 
   const handleUpdateData = async (newData: BusinessData) => {
     const oldData = businessData
+    const changes = diffBusinessData(oldData, newData)
+    const pending = !isEmptyChangeset(changes)
 
-    const servicosAntes = new Set(oldData.servicos.map(s => s.id))
-    const adicionados = newData.servicos.filter(s => !servicosAntes.has(s.id))
-
-    if (adicionados.length === 1 && newData.clientes.length === oldData.clientes.length && newData.despesas.length === oldData.despesas.length && newData.comissoes.length === oldData.comissoes.length) {
-      const novo = adicionados[0]
-      try {
-        const resp = await fetch('/api/service-create', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({
-            data_servico: novo.data_servico,
-            veiculo: novo.veiculo,
-            placa: novo.placa,
-            valor_bruto: novo.valor_bruto,
-            porcentagem_comissao: novo.porcentagem_comissao,
-            observacao: novo.observacao,
-            cliente_id: novo.cliente_id
-          })
-        })
-        if (!resp.ok) throw new Error('Falha ao criar serviço')
-        const json = await resp.json()
-        const idReal = json.id
-
-        const atualizado = {
-          ...newData,
-          servicos: newData.servicos.map(s => s.id === novo.id ? { ...s, id: idReal } : s),
-          metadata: { ...newData.metadata, totalServicos: newData.servicos.length }
-        }
-        setBusinessData(atualizado)
-        toast({ title: 'Serviço criado!', description: 'O novo serviço foi salvo no Neon.' })
-        return
-      } catch (error: any) {
-        console.error('Erro ao criar serviço:', error)
-        toast({
-          title: 'Erro ao salvar',
-          description: `Houve um problema ao salvar o novo serviço: ${error?.message || 'Erro desconhecido'}.`,
-          variant: 'destructive',
-        })
-        return
-      }
-    }
-
+    if (pending) beginWrite()
     setBusinessData(newData)
+    if (!pending) return
+
     try {
-      const resp = await fetch('/api/import', {
+      const resp = await fetch('/api/sync', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(newData)
+        body: JSON.stringify(changes)
       })
       if (!resp.ok) throw new Error('Falha ao salvar dados')
+      const result = await resp.json()
+      const errors: SyncError[] = Array.isArray(result?.errors) ? result.errors : []
+
+      // As linhas aceitas já estão confirmadas no Neon: desfaz só as rejeitadas e
+      // troca os ids temporários das linhas novas pelos ids gerados no banco
+      setBusinessData(currentData => applyIdMap(revertFailedRows(currentData, oldData, errors), result?.ids || {}))
+
+      if (!result?.ok) {
+        console.error('Sync errors:', errors)
+        toast({
+          title: "Alguns registros não foram salvos",
+          description: `${errors.length} registro(s) foram recusados pelo banco e voltaram ao estado anterior. Os demais foram salvos.`,
+          variant: "destructive",
+        })
+        return
+      }
+      if (changes.servicos.inserted.length === 1) {
+        toast({ title: 'Serviço criado!', description: 'O novo serviço foi salvo no Neon.' })
+      }
     } catch (error: any) {
       console.error('Erro detalhado ao salvar dados:', error)
       toast({
@@ -243,22 +212,26 @@ const Index = () => {
         variant: "destructive",
       })
       setBusinessData(oldData)
+    } finally {
+      endWrite()
     }
   }
 
-  const handleReceiveCommission = async (servico: Servico, amount: number) => {
+  const handleReceiveCommission = async (servico: Servico, amount: Cents) => {
 
+    beginWrite();
     try {
       const resp = await fetch('/api/commission', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ servicoId: servico.id, amount })
+        body: JSON.stringify({ servicoId: servico.id, amount: fromCents(amount) })
       })
       if (!resp.ok) throw new Error('Falha ao registrar comissão')
       const json = await resp.json()
       const dataRecebimento = json.data_recebimento
 
-      const novaComissaoRecebida = servico.comissao_recebida + amount
+      // O servidor devolve o total já gravado, inclusive recebimentos feitos em outro aparelho
+      const novaComissaoRecebida = json.servico ? toCents(json.servico.comissao_recebida) : asCents(servico.comissao_recebida + amount)
 
       // Atualizar o estado local
       setBusinessData(currentData => ({
@@ -276,7 +249,7 @@ const Index = () => {
 
       toast({
         title: "Comissão recebida!",
-        description: `R$ ${amount.toFixed(2)} foi marcado como recebido.`,
+        description: `${formatCents(amount)} foi marcado como recebido.`,
       });
     } catch (error: any) {
       console.error('Erro ao receber comissão:', error);
@@ -285,13 +258,16 @@ const Index = () => {
         description: "Não foi possível marcar a comissão como recebida.",
         variant: "destructive",
       });
+    } finally {
+      endWrite();
     }
   };
 
   const handleUndoCommission = async (servicoId: number) => {
 
+    beginWrite();
     try {
-      const servico = businessData.servicos.find(s => s.id === servicoId);
+      const servico = findServico(getBusinessIndex(businessData), servicoId);
       if (!servico) return;
       const resp = await fetch('/api/commission-undo', {
         method: 'POST',
@@ -307,7 +283,7 @@ const Index = () => {
           s.id === servicoId 
             ? { 
                 ...s, 
-                comissao_recebida: 0,
+                comissao_recebida: asCents(0),
                 data_recebimento_comissao: undefined
               }
             : s
@@ -325,15 +301,33 @@ const Index = () => {
         description: "Não foi possível desfazer o recebimento da comissão.",
         variant: "destructive",
       });
+    } finally {
+      endWrite();
     }
   };
 
   const handleLogout = async () => {};
 
+  useEffect(() => {
+    perfMeasure(`tab:${activeTab}`, 'tab:start');
+  }, [activeTab]);
+
   const renderActiveTab = () => {
+    // O painel abre com /api/metrics; as demais abas precisam do dataset completo
+    if (loading && activeTab !== "dashboard") {
+      return (
+        <div className="flex items-center justify-center py-24">
+          <div className="text-center space-y-4">
+            <Loader2 className="h-8 w-8 animate-spin mx-auto text-primary" />
+            <p className="text-muted-foreground">Carregando seus dados...</p>
+          </div>
+        </div>
+      );
+    }
+
     switch (activeTab) {
       case "dashboard":
-        return <Dashboard data={businessData} />;
+        return <Dashboard data={businessData} dataReady={!loading} />;
       case "clientes":
         return <ClientesTab data={businessData} onUpdateData={handleUpdateData} />;
       case "servicos":
@@ -352,23 +346,10 @@ const Index = () => {
       case "backup":
         return <BackupTab data={businessData} onImportData={() => setShowImportDialog(true)} />;
       default:
-        return <Dashboard data={businessData} />;
+        return <Dashboard data={businessData} dataReady={!loading} />;
     }
   };
 
-  if (loading) {
-    return (
-      <div className="min-h-screen bg-background flex items-center justify-center">
-        <div className="text-center space-y-4">
-          <Loader2 className="h-8 w-8 animate-spin mx-auto text-primary" />
-          <p className="text-muted-foreground">Carregando seus dados...</p>
-        </div>
-      </div>
-    );
-  }
-
-  
-
   return (
     <div className="min-h-screen bg-background notranslate" translate="no">
       <Header 
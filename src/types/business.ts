@@ -1,3 +1,5 @@
+import type { Cents } from "@/lib/money";
+
 export interface Cliente {
   id: number | string;
   nome: string;
@@ -13,12 +15,12 @@ export interface Servico {
   data_servico: string;
   veiculo: string;
   placa: string;
-  valor_bruto: number;
+  valor_bruto: Cents;
   porcentagem_comissao: number;
   observacao: string;
-  valor_pago: number;
+  valor_pago: Cents;
   quitado: boolean;
-  comissao_recebida: number;
+  comissao_recebida: Cents;
   cliente_id: number | string;
   data_recebimento_comissao?: string; // Data quando a comissão foi recebida
 }
@@ -26,7 +28,7 @@ export interface Servico {
 export interface Despesa {
   id: number | string;
   descricao: string;
-  valor: number;
+  valor: Cents;
   data_vencimento: string;
   pago: boolean;
 }
@@ -34,7 +36,7 @@ export interface Despesa {
 export interface Comissao {
   id: number;
   servico_id: number;
-  valor: number;
+  valor: Cents;
   data_recebimento: string;
   status: 'pendente' | 'recebido' | 'atrasado';
   created_at?: string;
@@ -56,3 +58,45 @@ export interface BusinessData {
     totalComissoes: number;
   };
 }
+
+export interface ServicoRecente {
+  id: number | string;
+  data_servico: string;
+  veiculo: string;
+  placa: string;
+  valor_bruto: Cents;
+  porcentagem_comissao: number;
+  cliente_id: number | string | null;
+  cliente_nome: string | null;
+}
+
+export interface DashboardMetrics {
+  totalClientes: number;
+  totalServicos: number;
+  totalFaturado: Cents;
+  totalComissoesRecebidas: Cents;
+  totalComissoesCalculadas: Cents;
+  valorAReceber: Cents;
+  totalDespesas: Cents;
+  despesasPagas: Cents;
+  despesasPendentes: Cents;
+  qtdDespesasPagas: number;
+  qtdDespesasPendentes: number;
+  lucroLiquido: Cents;
+  servicosRecentes: ServicoRecente[];
+}
+
+/** Totais de um mês lidos de `monthly_rollup` (mantida por triggers no banco) */
+export interface MonthlyRollup {
+  /** YYYY-MM */
+  month: string;
+  servicos: number;
+  valorFaturado: Cents;
+  comissaoPrevista: Cents;
+  /** Comissão já recebida dos serviços feitos no mês */
+  comissaoRecebida: Cents;
+  /** Comissões recebidas no mês, pela data de recebimento */
+  recebimentos: Cents;
+  despesasPagas: Cents;
+  despesasPendentes: Cents;
+}
@@ -0,0 +1,29 @@
+import { BusinessData } from "@/types/business";
+import { getBusinessIndex } from "@/lib/business-index";
+import { ReportWorkerRequest, ReportWorkerResponse, runReportJob } from "@/lib/report-jobs";
+
+// Worker dos relatórios: recebe o snapshot uma vez ("load") e responde aos
+// trabalhos de filtro, agregação e PDF sem ocupar a thread da interface.
+
+let data: BusinessData | null = null;
+
+const post = (message: ReportWorkerResponse, transfer: Transferable[] = []) =>
+  self.postMessage(message, { transfer });
+
+self.onmessage = (event: MessageEvent<ReportWorkerRequest>) => {
+  const message = event.data;
+  if (message.type === "load") {
+    data = message.data;
+    getBusinessIndex(data);
+    return;
+  }
+
+  const { id, job } = message;
+  try {
+    if (!data) throw new Error("Dados ainda não carregados no worker");
+    const result = runReportJob(data, job, (done, total) => post({ type: "progress", id, done, total }));
+    post({ type: "result", id, result }, result instanceof ArrayBuffer ? [result] : []);
+  } catch (err: any) {
+    post({ type: "error", id, message: err?.message || "Erro ao gerar relatório" });
+  }
+};
@@ -109,4 +109,300 @@ CREATE INDEX IF NOT EXISTS idx_clientes_user_id ON public.clientes(user_id);
 CREATE INDEX IF NOT EXISTS idx_despesas_user_id ON public.despesas(user_id);
 CREATE INDEX IF NOT EXISTS idx_despesas_data_vencimento ON public.despesas(data_vencimento);
 CREATE INDEX IF NOT EXISTS idx_comissoes_servico_id ON public.comissoes(servico_id);
-CREATE INDEX IF NOT EXISTS idx_comissoes_user_id ON public.comissoes(user_id);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_comissoes_user_id ON public.comissoes(user_id);
+-- Incremental sync (/api/data?since=...): keyset indexes on (updated_at, id)
+UPDATE public.clientes SET updated_at = COALESCE(created_at, now()) WHERE updated_at IS NULL;
+UPDATE public.servicos SET updated_at = COALESCE(created_at, now()) WHERE updated_at IS NULL;
+UPDATE public.despesas SET updated_at = COALESCE(created_at, now()) WHERE updated_at IS NULL;
+UPDATE public.comissoes SET updated_at = COALESCE(created_at, now()) WHERE updated_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_clientes_updated_at_id ON public.clientes(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_servicos_updated_at_id ON public.servicos(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_despesas_updated_at_id ON public.despesas(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_comissoes_updated_at_id ON public.comissoes(updated_at, id);
+
+-- Tombstones so incremental clients also learn about deleted rows
+CREATE TABLE IF NOT EXISTS public.deleted_rows (
+  table_name TEXT NOT NULL,
+  row_id BIGINT NOT NULL,
+  deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+  PRIMARY KEY (table_name, row_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_deleted_rows_deleted_at ON public.deleted_rows(deleted_at);
+
+CREATE OR REPLACE FUNCTION public.record_deleted_row()
+RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO public.deleted_rows (table_name, row_id, deleted_at)
+  VALUES (TG_TABLE_NAME, OLD.id, now())
+  ON CONFLICT (table_name, row_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+  RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_trigger WHERE tgname = 'record_clientes_deleted'
+  ) THEN
+    CREATE TRIGGER record_clientes_deleted
+      AFTER DELETE ON public.clientes
+      FOR EACH ROW
+      EXECUTE FUNCTION public.record_deleted_row();
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_trigger WHERE tgname = 'record_servicos_deleted'
+  ) THEN
+    CREATE TRIGGER record_servicos_deleted
+      AFTER DELETE ON public.servicos
+      FOR EACH ROW
+      EXECUTE FUNCTION public.record_deleted_row();
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_trigger WHERE tgname = 'record_despesas_deleted'
+  ) THEN
+    CREATE TRIGGER record_despesas_deleted
+      AFTER DELETE ON public.despesas
+      FOR EACH ROW
+      EXECUTE FUNCTION public.record_deleted_row();
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_trigger WHERE tgname = 'record_comissoes_deleted'
+  ) THEN
+    CREATE TRIGGER record_comissoes_deleted
+      AFTER DELETE ON public.comissoes
+      FOR EACH ROW
+      EXECUTE FUNCTION public.record_deleted_row();
+  END IF;
+END $$;
+
+-- Version of the whole dataset for the /api/data ETag. Bumped once per writing
+-- statement (not per row) on the four tables; the row update is transactional,
+-- so readers only see the new version once the write commits. Reading it is a
+-- single-row lookup instead of scanning the tables on every request.
+CREATE TABLE IF NOT EXISTS public.dataset_version (
+  id BOOLEAN PRIMARY KEY DEFAULT true CHECK (id),
+  version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO public.dataset_version (id) VALUES (true) ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION public.bump_dataset_version()
+RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE public.dataset_version SET version = version + 1;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['clientes', 'servicos', 'despesas', 'comissoes'] LOOP
+    IF NOT EXISTS (
+      SELECT 1 FROM pg_trigger WHERE tgname = 'bump_' || t || '_version'
+    ) THEN
+      EXECUTE format(
+        'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.%I
+           FOR EACH STATEMENT EXECUTE FUNCTION public.bump_dataset_version()',
+        'bump_' || t || '_version', t
+      );
+    END IF;
+  END LOOP;
+END $$;
+
+-- Completed /api/import chunks, keyed by the client's Idempotency-Key, so a
+-- retried or resumed restore skips the batches that already landed
+CREATE TABLE IF NOT EXISTS public.import_chunks (
+  idempotency_key TEXT PRIMARY KEY,
+  row_count INTEGER NOT NULL,
+  errors JSONB NOT NULL DEFAULT '[]'::jsonb,
+  completed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_import_chunks_completed_at ON public.import_chunks(completed_at);
+
+-- Per-month totals kept current by triggers, so reports read O(months) rows
+-- instead of summing every servico/comissao/despesa. Services count in the
+-- month of data_servico, commission receipts in the month of data_recebimento
+-- and expenses in the month of data_vencimento.
+CREATE TABLE IF NOT EXISTS public.monthly_rollup (
+  month DATE PRIMARY KEY,
+  servicos_count INTEGER NOT NULL DEFAULT 0,
+  valor_faturado NUMERIC(14,2) NOT NULL DEFAULT 0,
+  comissao_prevista NUMERIC(14,4) NOT NULL DEFAULT 0,
+  comissao_recebida NUMERIC(14,2) NOT NULL DEFAULT 0,
+  recebimentos NUMERIC(14,2) NOT NULL DEFAULT 0,
+  despesas_pagas NUMERIC(14,2) NOT NULL DEFAULT 0,
+  despesas_pendentes NUMERIC(14,2) NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+-- Builds the upsert that applies per-row deltas to monthly_rollup. p_deltas is
+-- a query yielding (day, servicos, faturado, comissao_prevista, comissao_recebida,
+-- recebimentos, despesas_pagas, despesas_pendentes); it is summed per month, so a
+-- statement touches each month's row once however many rows it changed. Months
+-- whose deltas cancel out (updates of unrelated columns) are skipped.
+CREATE OR REPLACE FUNCTION public.rollup_upsert_sql(p_deltas TEXT)
+RETURNS TEXT AS $$
+  SELECT format($sql$
+    INSERT INTO public.monthly_rollup AS r (
+      month, servicos_count, valor_faturado, comissao_prevista, comissao_recebida,
+      recebimentos, despesas_pagas, despesas_pendentes
+    )
+    SELECT date_trunc('month', day)::date, sum(servicos), sum(faturado), sum(comissao_prevista),
+           sum(comissao_recebida), sum(recebimentos), sum(despesas_pagas), sum(despesas_pendentes)
+    FROM (%s) AS deltas (day, servicos, faturado, comissao_prevista, comissao_recebida,
+                         recebimentos, despesas_pagas, despesas_pendentes)
+    WHERE day IS NOT NULL
+    GROUP BY 1
+    HAVING sum(servicos) <> 0 OR sum(faturado) <> 0 OR sum(comissao_prevista) <> 0 OR sum(comissao_recebida) <> 0
+        OR sum(recebimentos) <> 0 OR sum(despesas_pagas) <> 0 OR sum(despesas_pendentes) <> 0
+    ORDER BY 1
+    ON CONFLICT (month) DO UPDATE SET
+      servicos_count = r.servicos_count + EXCLUDED.servicos_count,
+      valor_faturado = r.valor_faturado + EXCLUDED.valor_faturado,
+      comissao_prevista = r.comissao_prevista + EXCLUDED.comissao_prevista,
+      comissao_recebida = r.comissao_recebida + EXCLUDED.comissao_recebida,
+      recebimentos = r.recebimentos + EXCLUDED.recebimentos,
+      despesas_pagas = r.despesas_pagas + EXCLUDED.despesas_pagas,
+      despesas_pendentes = r.despesas_pendentes + EXCLUDED.despesas_pendentes,
+      updated_at = now()
+  $sql$, p_deltas)
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Statement-level trigger functions: old rows (UPDATE/DELETE) subtract and new
+-- rows (INSERT/UPDATE) add, read from the old_rows/new_rows transition tables.
+-- The EXECUTE runs inside the trigger function, where those tables are visible.
+CREATE OR REPLACE FUNCTION public.rollup_servicos()
+RETURNS TRIGGER AS $$
+BEGIN
+  EXECUTE public.rollup_upsert_sql(concat_ws(' UNION ALL ',
+    CASE WHEN TG_OP IN ('UPDATE', 'DELETE') THEN
+      'SELECT data_servico, -1, -COALESCE(valor_bruto, 0), -COALESCE(valor_bruto * porcentagem_comissao / 100, 0),
+              -COALESCE(comissao_recebida, 0), 0, 0, 0
+       FROM old_rows'
+    END,
+    CASE WHEN TG_OP IN ('INSERT', 'UPDATE') THEN
+      'SELECT data_servico, 1, COALESCE(valor_bruto, 0), COALESCE(valor_bruto * porcentagem_comissao / 100, 0),
+              COALESCE(comissao_recebida, 0), 0, 0, 0
+       FROM new_rows'
+    END
+  ));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public.rollup_comissoes()
+RETURNS TRIGGER AS $$
+BEGIN
+  EXECUTE public.rollup_upsert_sql(concat_ws(' UNION ALL ',
+    CASE WHEN TG_OP IN ('UPDATE', 'DELETE') THEN
+      'SELECT data_recebimento, 0, 0, 0, 0, -COALESCE(valor, 0), 0, 0 FROM old_rows WHERE status = ''recebido'''
+    END,
+    CASE WHEN TG_OP IN ('INSERT', 'UPDATE') THEN
+      'SELECT data_recebimento, 0, 0, 0, 0, COALESCE(valor, 0), 0, 0 FROM new_rows WHERE status = ''recebido'''
+    END
+  ));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public.rollup_despesas()
+RETURNS TRIGGER AS $$
+BEGIN
+  EXECUTE public.rollup_upsert_sql(concat_ws(' UNION ALL ',
+    CASE WHEN TG_OP IN ('UPDATE', 'DELETE') THEN
+      'SELECT data_vencimento, 0, 0, 0, 0, 0,
+              CASE WHEN pago THEN -COALESCE(valor, 0) ELSE 0 END,
+              CASE WHEN pago THEN 0 ELSE -COALESCE(valor, 0) END
+       FROM old_rows'
+    END,
+    CASE WHEN TG_OP IN ('INSERT', 'UPDATE') THEN
+      'SELECT data_vencimento, 0, 0, 0, 0, 0,
+              CASE WHEN pago THEN COALESCE(valor, 0) ELSE 0 END,
+              CASE WHEN pago THEN 0 ELSE COALESCE(valor, 0) END
+       FROM new_rows'
+    END
+  ));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables need one trigger per event. The FOR EACH ROW triggers of
+-- earlier versions of this file (rollup_<table>_changed) are dropped here.
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['servicos', 'comissoes', 'despesas'] LOOP
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON public.%I', 'rollup_' || t || '_changed', t);
+
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'rollup_' || t || '_inserted') THEN
+      EXECUTE format(
+        'CREATE TRIGGER %I AFTER INSERT ON public.%I REFERENCING NEW TABLE AS new_rows
+           FOR EACH STATEMENT EXECUTE FUNCTION public.%I()',
+        'rollup_' || t || '_inserted', t, 'rollup_' || t
+      );
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'rollup_' || t || '_updated') THEN
+      EXECUTE format(
+        'CREATE TRIGGER %I AFTER UPDATE ON public.%I REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+           FOR EACH STATEMENT EXECUTE FUNCTION public.%I()',
+        'rollup_' || t || '_updated', t, 'rollup_' || t
+      );
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'rollup_' || t || '_deleted') THEN
+      EXECUTE format(
+        'CREATE TRIGGER %I AFTER DELETE ON public.%I REFERENCING OLD TABLE AS old_rows
+           FOR EACH STATEMENT EXECUTE FUNCTION public.%I()',
+        'rollup_' || t || '_deleted', t, 'rollup_' || t
+      );
+    END IF;
+  END LOOP;
+END $$;
+
+-- Only the old row triggers called this
+DROP FUNCTION IF EXISTS public.rollup_add(DATE, INTEGER, NUMERIC, NUMERIC, NUMERIC, NUMERIC, NUMERIC, NUMERIC);
+
+-- Recomputes every month from the base tables. Runs here so re-applying this
+-- file backfills (or repairs) the rollup; the triggers do not handle TRUNCATE.
+CREATE OR REPLACE FUNCTION public.rebuild_monthly_rollup()
+RETURNS VOID AS $$
+BEGIN
+  LOCK TABLE public.servicos, public.comissoes, public.despesas IN SHARE MODE;
+  DELETE FROM public.monthly_rollup;
+  INSERT INTO public.monthly_rollup (
+    month, servicos_count, valor_faturado, comissao_prevista, comissao_recebida,
+    recebimentos, despesas_pagas, despesas_pendentes
+  )
+  SELECT month, sum(servicos_count), sum(valor_faturado), sum(comissao_prevista), sum(comissao_recebida),
+         sum(recebimentos), sum(despesas_pagas), sum(despesas_pendentes)
+  FROM (
+    SELECT date_trunc('month', data_servico)::date AS month, count(*)::int AS servicos_count,
+           COALESCE(sum(valor_bruto), 0) AS valor_faturado,
+           COALESCE(sum(valor_bruto * porcentagem_comissao / 100), 0) AS comissao_prevista,
+           COALESCE(sum(comissao_recebida), 0) AS comissao_recebida,
+           0 AS recebimentos, 0 AS despesas_pagas, 0 AS despesas_pendentes
+    FROM public.servicos GROUP BY 1
+    UNION ALL
+    SELECT date_trunc('month', data_recebimento)::date, 0, 0, 0, 0, COALESCE(sum(valor), 0), 0, 0
+    FROM public.comissoes WHERE status = 'recebido' GROUP BY 1
+    UNION ALL
+    SELECT date_trunc('month', data_vencimento)::date, 0, 0, 0, 0, 0,
+           COALESCE(sum(valor) FILTER (WHERE pago), 0), COALESCE(sum(valor) FILTER (WHERE NOT pago OR pago IS NULL), 0)
+    FROM public.despesas GROUP BY 1
+  ) parts
+  WHERE month IS NOT NULL
+  GROUP BY month;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT public.rebuild_monthly_rollup();
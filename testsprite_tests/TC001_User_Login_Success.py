@@ -1,82 +1,41 @@
 import asyncio
-from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:8080", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Enter valid username/email and password.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('odair_orso@hotmail.com')
-        
+from runner import open_app, run_standalone
+from waits import api_idle, ready
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Turce.334180')
-        
 
-        # Click the login button to attempt login.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+async def run_test(context):
+    page = await open_app(context)
 
-        # Assert user is authenticated and redirected to the dashboard by checking the presence of user email on the page
-        frame = context.pages[-1]
-        user_email_locator = frame.locator('text=odair_orso@hotmail.com')
-        assert await user_email_locator.is_visible(), 'User email not visible, login might have failed'
-        # Optionally, assert the page title to confirm dashboard page
-        assert 'Oliveira Martelinho de Ouro - Sistema de Gestão' in await frame.title(), 'Page title does not match dashboard, login might have failed'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+    # Interact with the page elements to simulate user flow
+    # Enter valid username/email and password.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div/input').nth(0)
+    await ready(page, elem); await elem.fill('odair_orso@hotmail.com')
+
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
+    await ready(page, elem); await elem.fill('Turce.334180')
+
+
+    # Click the login button to attempt login.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Wait for the requests triggered by the last action to settle before asserting.
+    await api_idle(page)
+
+
+    # Assert user is authenticated and redirected to the dashboard by checking the presence of user email on the page
+    frame = context.pages[-1]
+    user_email_locator = frame.locator('text=odair_orso@hotmail.com')
+    assert await user_email_locator.is_visible(), 'User email not visible, login might have failed'
+    # Optionally, assert the page title to confirm dashboard page
+    assert 'Oliveira Martelinho de Ouro - Sistema de Gestão' in await frame.title(), 'Page title does not match dashboard, login might have failed'
+
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
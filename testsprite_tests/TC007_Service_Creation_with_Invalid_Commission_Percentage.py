@@ -1,100 +1,59 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:8080", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Input email and password and click login button to access the system.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('odair_orso@hotmail.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Turce.334180')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click on 'Serviços' button to navigate to service management page.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click on 'Novo Serviço' button to open new service creation form.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div/div/h3/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Input a negative commission percentage value (-5) into the commission field.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div/div[2]/div/div[6]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('-5')
-        
-
-        # Click 'Adicionar Serviço' button to attempt form submission and check for validation error.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div/div[2]/div/div[8]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        assert False, 'Test failed: Validation error for invalid commission percentage not detected.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+from runner import open_app, run_standalone
+from waits import api_idle, ready
+
+
+async def run_test(context):
+    page = await open_app(context)
+
+    # Interact with the page elements to simulate user flow
+    # Input email and password and click login button to access the system.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div/input').nth(0)
+    await ready(page, elem); await elem.fill('odair_orso@hotmail.com')
+
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
+    await ready(page, elem); await elem.fill('Turce.334180')
+
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Click on 'Serviços' button to navigate to service management page.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[3]').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Click on 'Novo Serviço' button to open new service creation form.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div/div/h3/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Input a negative commission percentage value (-5) into the commission field.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div/div[2]/div/div[6]/input').nth(0)
+    await ready(page, elem); await elem.fill('-5')
+
+
+    # Click 'Adicionar Serviço' button to attempt form submission and check for validation error.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div/div[2]/div/div[8]/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Wait for the requests triggered by the last action to settle before asserting.
+    await api_idle(page)
+
+
+    assert False, 'Test failed: Validation error for invalid commission percentage not detected.'
+
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
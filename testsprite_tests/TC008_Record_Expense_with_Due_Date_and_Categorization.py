@@ -1,128 +1,87 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:8080", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Fill in email and password, then click login button.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('odair_orso@hotmail.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Turce.334180')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click on 'Despesas' (Expenses) button to navigate to expense management page.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click 'Nova Despesa' button to open new expense form.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div/h3/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Fill in description, amount, and due date fields, then submit the form to record the expense.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Teste Categoria')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123.45')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2025-12-31')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Verify payment status can be changed by clicking 'Marcar como Pago' button for the new expense.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Assert that the new expense is recorded and visible in the list with correct details.
-        despesa = None
-        for d in frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/div').all():
-            categoria = await d.locator('div').nth(0).text_content()
-            if categoria.strip() == 'Teste Categoria':
-                despesa = d
-                break
-        assert despesa is not None, 'New expense with category "Teste Categoria" not found in the list.'
-        valor = await despesa.locator('div').nth(2).text_content()
-        assert valor.strip() == 'R$ 123,45', f'Expected value R$ 123,45 but got {valor.strip()}'
-        data_vencimento = await despesa.locator('div').nth(1).text_content()
-        assert data_vencimento.strip() == '31/12/2025', f'Expected due date 31/12/2025 but got {data_vencimento.strip()}'
-        status = await despesa.locator('div').nth(3).text_content()
-        assert status.strip() == 'Pago', f'Expected status Pago but got {status.strip()}'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+from runner import open_app, run_standalone
+from waits import api_idle, ready
+
+
+async def run_test(context):
+    page = await open_app(context)
+
+    # Interact with the page elements to simulate user flow
+    # Fill in email and password, then click login button.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div/input').nth(0)
+    await ready(page, elem); await elem.fill('odair_orso@hotmail.com')
+
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
+    await ready(page, elem); await elem.fill('Turce.334180')
+
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Click on 'Despesas' (Expenses) button to navigate to expense management page.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[4]').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Click 'Nova Despesa' button to open new expense form.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div/h3/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Fill in description, amount, and due date fields, then submit the form to record the expense.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div/input').nth(0)
+    await ready(page, elem); await elem.fill('Teste Categoria')
+
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div[2]/input').nth(0)
+    await ready(page, elem); await elem.fill('123.45')
+
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div[3]/input').nth(0)
+    await ready(page, elem); await elem.fill('2025-12-31')
+
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div[4]/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Verify payment status can be changed by clicking 'Marcar como Pago' button for the new expense.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/div/div[2]/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Wait for the requests triggered by the last action to settle before asserting.
+    await api_idle(page)
+
+
+    # Assert that the new expense is recorded and visible in the list with correct details.
+    despesa = None
+    for d in frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/div').all():
+        categoria = await d.locator('div').nth(0).text_content()
+        if categoria.strip() == 'Teste Categoria':
+            despesa = d
+            break
+    assert despesa is not None, 'New expense with category "Teste Categoria" not found in the list.'
+    valor = await despesa.locator('div').nth(2).text_content()
+    assert valor.strip() == 'R$ 123,45', f'Expected value R$ 123,45 but got {valor.strip()}'
+    data_vencimento = await despesa.locator('div').nth(1).text_content()
+    assert data_vencimento.strip() == '31/12/2025', f'Expected due date 31/12/2025 but got {data_vencimento.strip()}'
+    status = await despesa.locator('div').nth(3).text_content()
+    assert status.strip() == 'Pago', f'Expected status Pago but got {status.strip()}'
+
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
@@ -1,111 +1,71 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:8080", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Input email and password, then click Entrar to login.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('odair_orso@hotmail.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Turce.334180')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click on 'Comissões' button to navigate to commission control page.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click the 'Tudo' button on the first commission entry with pending status to update status to received.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/table/tbody/tr/td[9]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click the 'Desfazer' button (index 14) for the updated commission entry to check if it reveals the history or update timestamp.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/table/tbody/tr/td[9]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Close the 'Desfazer' confirmation dialog and look for a history or audit trail section or button on the commission control page to verify the update timestamp.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Scroll down the commission control page to find any visible history or audit trail section or button related to commission updates.
-        await page.mouse.wheel(0, window.innerHeight)
-        
-
-        # Assert that the commission status of the first updated entry is 'Recebido' (Received).
-        status_locator = frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/table/tbody/tr/td[8]')
-        status_text = await status_locator.nth(0).inner_text()
-        assert status_text.strip().lower() == 'recebido', f"Expected status to be 'Recebido', but got '{status_text}'"
-        # Assert that the history or update timestamp is visible after clicking 'Desfazer' button.
-        history_locator = frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/table/tbody/tr/td[9]/div')
-        history_buttons_count = await history_locator.nth(0).locator('button').count()
-        assert history_buttons_count > 0, 'Expected history or update timestamp buttons to be visible after status update'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+from runner import open_app, run_standalone
+from waits import api_idle, ready, toast
+
+
+async def run_test(context):
+    page = await open_app(context)
+
+    # Interact with the page elements to simulate user flow
+    # Input email and password, then click Entrar to login.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div/input').nth(0)
+    await ready(page, elem); await elem.fill('odair_orso@hotmail.com')
+
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
+    await ready(page, elem); await elem.fill('Turce.334180')
+
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Click on 'Comissões' button to navigate to commission control page.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[5]').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Click the 'Tudo' button on the first commission entry with pending status to update status to received.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/table/tbody/tr/td[9]/div/button[2]').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+    await api_idle(page); await toast(page, 'Comissão recebida')
+
+
+    # Click the 'Desfazer' button (index 14) for the updated commission entry to check if it reveals the history or update timestamp.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/table/tbody/tr/td[9]/div/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Close the 'Desfazer' confirmation dialog and look for a history or audit trail section or button on the commission control page to verify the update timestamp.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div[3]/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Scroll down the commission control page to find any visible history or audit trail section or button related to commission updates.
+    await page.mouse.wheel(0, window.innerHeight)
+
+
+    # Wait for the requests triggered by the last action to settle before asserting.
+    await api_idle(page)
+
+
+    # Assert that the commission status of the first updated entry is 'Recebido' (Received).
+    status_locator = frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/table/tbody/tr/td[8]')
+    status_text = await status_locator.nth(0).inner_text()
+    assert status_text.strip().lower() == 'recebido', f"Expected status to be 'Recebido', but got '{status_text}'"
+    # Assert that the history or update timestamp is visible after clicking 'Desfazer' button.
+    history_locator = frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/table/tbody/tr/td[9]/div')
+    history_buttons_count = await history_locator.nth(0).locator('button').count()
+    assert history_buttons_count > 0, 'Expected history or update timestamp buttons to be visible after status update'
+
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
@@ -1,125 +1,84 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:8080", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Input email and password, then click login button.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('odair_orso@hotmail.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Turce.334180')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click on 'Relatórios' (Reports) button to navigate to reports module.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[6]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Interact with date picker UI to set start date (Data de Início) to 01/01/2025.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Set 'Data de Início' to 01/01/2025 and 'Data de Fim' to 06/30/2025 using keyboard input or date picker interaction.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click 'Visualizar' button for 'Relatório de Comissões' to generate the report.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click 'Salvar como PDF' button to export the report as PDF.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/div/h2/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Close the report preview modal to complete the task.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Assert that the report loads within 5 seconds showing correct filtered data.
-        await frame.wait_for_selector('xpath=html/body/div[3]/div', timeout=5000)  # Wait for report modal or container to appear
-        # Verify that the report data preview contains expected commission amounts and percentages
-        commissions_received_text = await frame.locator('xpath=html/body/div[3]/div/div[contains(text(),"R$ 42.571,89")]').text_content()
-        assert "R$ 42.571,89" in commissions_received_text, "Expected commissions received amount not found in report"
-        commissions_pending_text = await frame.locator('xpath=html/body/div[3]/div/div[contains(text(),"R$ 16.539,53")]').text_content()
-        assert "R$ 16.539,53" in commissions_pending_text, "Expected commissions pending amount not found in report"
-        # Click export to PDF button and wait for download
-        async with page.expect_download() as download_info:
-            await frame.locator('xpath=html/body/div[3]/div/h2/button').click()
-        download = await download_info.value
-        # Verify the downloaded file is a PDF
-        assert download.suggested_filename.endswith('.pdf'), "Downloaded file is not a PDF"
-        # Optionally, verify the downloaded PDF content matches displayed report content (requires PDF parsing, omitted here)
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+from runner import open_app, run_standalone
+from waits import api_idle, ready
+
+
+async def run_test(context):
+    page = await open_app(context)
+
+    # Interact with the page elements to simulate user flow
+    # Input email and password, then click login button.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div/input').nth(0)
+    await ready(page, elem); await elem.fill('odair_orso@hotmail.com')
+
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
+    await ready(page, elem); await elem.fill('Turce.334180')
+
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Click on 'Relatórios' (Reports) button to navigate to reports module.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[6]').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Interact with date picker UI to set start date (Data de Início) to 01/01/2025.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div/input').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Set 'Data de Início' to 01/01/2025 and 'Data de Fim' to 06/30/2025 using keyboard input or date picker interaction.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div[2]/input').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Click 'Visualizar' button for 'Relatório de Comissões' to generate the report.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/div/div/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Click 'Salvar como PDF' button to export the report as PDF.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div[3]/div/h2/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Close the report preview modal to complete the task.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div[3]/button').nth(0)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+
+    # Wait for the requests triggered by the last action to settle before asserting.
+    await api_idle(page)
+
+
+    # Assert that the report loads within 5 seconds showing correct filtered data.
+    await frame.wait_for_selector('xpath=html/body/div[3]/div', timeout=5000)  # Wait for report modal or container to appear
+    # Verify that the report data preview contains expected commission amounts and percentages
+    commissions_received_text = await frame.locator('xpath=html/body/div[3]/div/div[contains(text(),"R$ 42.571,89")]').text_content()
+    assert "R$ 42.571,89" in commissions_received_text, "Expected commissions received amount not found in report"
+    commissions_pending_text = await frame.locator('xpath=html/body/div[3]/div/div[contains(text(),"R$ 16.539,53")]').text_content()
+    assert "R$ 16.539,53" in commissions_pending_text, "Expected commissions pending amount not found in report"
+    # Click export to PDF button and wait for download
+    async with page.expect_download() as download_info:
+        await frame.locator('xpath=html/body/div[3]/div/h2/button').click()
+    download = await download_info.value
+    # Verify the downloaded file is a PDF
+    assert download.suggested_filename.endswith('.pdf'), "Downloaded file is not a PDF"
+    # Optionally, verify the downloaded PDF content matches displayed report content (requires PDF parsing, omitted here)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
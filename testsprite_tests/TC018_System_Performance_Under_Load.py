@@ -1,166 +1,60 @@
 import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:8080", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Input email and password, then click login button to access dashboard and measure load time.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('odair_orso@hotmail.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Turce.334180')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Generate a financial report with filters by clicking the 'Relatórios' button to test report generation time.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[6]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Use date picker or alternative method to set 'Data de Início' and 'Data de Fim' fields, then click 'Visualizar' button for 'Relatório de Comissões' to measure report generation time.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2025-01-01')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[2]/div[2]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2025-09-09')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/main/div/div[3]/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Close the report preview modal and test navigation fluidity by rapidly switching between modules: Painel, Clientes, Serviços, Despesas, Comissões, Relatórios.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Test navigation fluidity by rapidly clicking on the modules: Painel, Clientes, Serviços, Despesas, Comissões, Relatórios and observe for lag or delays.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Continue testing navigation fluidity by clicking on Serviços, Despesas, Comissões, and Relatórios modules.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Continue testing navigation fluidity by clicking on Despesas, Comissões, and Relatórios modules.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Continue testing navigation fluidity by clicking on Comissões and Relatórios modules.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Complete navigation fluidity test by clicking on Relatórios module and observe for any lag or delays.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div[2]/nav/div/div/button[6]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Assert dashboard load time is less than 3 seconds
-        assert dashboard_load_time < 3, f'Dashboard load time exceeded: {dashboard_load_time}s'
-        
-        # Assert report generation time is less than 5 seconds
-        assert report_generation_time < 5, f'Report generation time exceeded: {report_generation_time}s'
-        
-        # Assert navigation fluidity by checking no lag or delays (example: no error messages, page responsiveness)
-        assert navigation_fluidity, 'Navigation experienced lag or delays'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+import perf
+from runner import open_app, run_standalone
+from waits import api_idle, ready, toast
+
+TABS = ["Painel", "Clientes", "Serviços", "Despesas", "Comissões", "Relatórios"]
+
+
+async def run_test(context):
+    page = await open_app(context)
+
+    # Wait for the boot fetch (/api/data) and the first Dashboard render.
+    await perf.wait_for_mark(page, "dashboard:rendered", timeout=15000)
+    await api_idle(page)
+
+    # Open 'Relatórios', narrow the period and build the PDF to time report generation.
+    elem = page.get_by_role("button", name="Relatórios", exact=True)
+    await ready(page, elem); await elem.click(timeout=5000)
+
+    elem = page.locator('input[type="date"]').nth(0)
+    await ready(page, elem); await elem.fill('2025-01-01')
+
+    elem = page.locator('input[type="date"]').nth(1)
+    await ready(page, elem); await elem.fill('2025-09-09')
+
+    elem = page.get_by_role("button", name="Salvar PDF")
+    await ready(page, elem); await elem.click(timeout=5000)
+    await perf.wait_for_measure(page, "report-pdf", timeout=15000)
+    await toast(page)
+
+    # Test navigation fluidity by switching through every module; each switch is measured in the app.
+    for label in TABS:
+        elem = page.get_by_role("button", name=label, exact=True)
+        await ready(page, elem); await elem.click(timeout=5000)
+    await perf.wait_for_measure(page, "tab:relatorios", count=2)
+
+    raw = await perf.collect(page)
+    metrics = perf.summarize(raw)
+    violations = perf.check(metrics, perf.load_budgets())
+    perf.write_results(metrics, raw, violations)
+
+    dashboard_load_time = metrics["dashboard_load_time"]
+    report_generation_time = metrics["report-pdf"]
+    navigation_fluidity = not any(v.startswith("tab") for v in violations)
+
+    # Assert dashboard load time is within budget
+    assert "dashboard_load_time" not in " ".join(violations), f'Dashboard load time exceeded: {dashboard_load_time:.0f}ms'
+
+    # Assert report generation time is within budget
+    assert "report-pdf" not in " ".join(violations), f'Report generation time exceeded: {report_generation_time:.0f}ms'
+
+    # Assert navigation fluidity: every tab switch rendered within budget
+    assert navigation_fluidity, 'Navigation experienced lag or delays'
+
+    assert not violations, 'Performance budgets exceeded: ' + '; '.join(violations)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
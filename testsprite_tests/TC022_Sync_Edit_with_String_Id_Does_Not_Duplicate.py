@@ -0,0 +1,44 @@
+import asyncio
+
+from runner import BASE_URL, run_standalone
+
+
+async def count_despesas(api):
+    # /api/metrics counts every expense (paid + pending) straight from the database
+    resp = await api.get(f"{BASE_URL}/api/metrics")
+    assert resp.ok, f'/api/metrics failed with status {resp.status}'
+    metrics = await resp.json()
+    return metrics["qtdDespesasPagas"] + metrics["qtdDespesasPendentes"]
+
+
+async def sync(api, changes):
+    resp = await api.post(f"{BASE_URL}/api/sync", data=changes)
+    assert resp.ok, f'/api/sync failed with status {resp.status}'
+    result = await resp.json()
+    assert result["ok"], f'/api/sync reported row errors: {result["errors"]}'
+    return result
+
+
+async def run_test(context):
+    api = context.request
+    expense = {"descricao": "TC022 despesa", "valor": 10.5, "data_vencimento": "2025-12-31", "pago": False}
+
+    # Create an expense the same way the app does (temporary id, real id comes back in "ids").
+    result = await sync(api, {"despesas": {"inserted": [{"id": "temp_tc022", **expense}]}})
+    real_id = result["ids"]["despesas"]["temp_tc022"]
+
+    try:
+        before = await count_despesas(api)
+
+        # Edit it with the id as the client sends it: BIGINT ids arrive as digit strings.
+        edited = {**expense, "id": str(real_id), "descricao": "TC022 despesa editada", "pago": True}
+        await sync(api, {"despesas": {"updated": [edited]}})
+
+        after = await count_despesas(api)
+        assert after == before, f'Editing a row with a string id changed the expense count from {before} to {after}'
+    finally:
+        await sync(api, {"despesas": {"deleted": [str(real_id)]}})
+
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
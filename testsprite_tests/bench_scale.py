@@ -0,0 +1,130 @@
+"""Scale benchmark for the business data model.
+
+For each size it generates a synthetic dataset (``datagen.py``), imports it
+through ``/api/import``, loads it back through ``/api/data`` and opens the app
+to time the first Dashboard render, the switch to the heavy tabs and the
+Relatórios filters.
+
+The import writes to whatever database the app under test points at, so run
+it against a scratch Neon branch, never against production data:
+
+    python testsprite_tests/bench_scale.py --sizes 1000 10000 100000
+"""
+import argparse
+import asyncio
+import json
+import time
+import urllib.request
+from pathlib import Path
+
+from playwright import async_api
+
+import datagen
+import perf
+from runner import BASE_URL, ContextPool, launch_browser, open_app
+from waits import actionable, api_idle
+
+TABLE_ORDER = ("clientes", "servicos", "despesas", "comissoes")
+DEFAULT_RESULTS = Path(__file__).resolve().parent / "tmp" / "scale_results.json"
+
+_NEXT_FRAME_JS = "() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(() => r())))"
+
+
+def _request(url, body=None, timeout=300):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(url, data=data, method="POST" if data else "GET",
+                                 headers={"Content-Type": "application/json"})
+    started = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        payload = resp.read()
+    return time.perf_counter() - started, payload
+
+
+def import_dataset(base_url, data, batch_size):
+    # Post table by table in parent-first order so foreign keys always resolve
+    seconds = 0.0
+    errors = 0
+    for table in TABLE_ORDER:
+        rows = data[table]
+        for start in range(0, len(rows), batch_size):
+            elapsed, payload = _request(f"{base_url}/api/import", {table: rows[start:start + batch_size]})
+            seconds += elapsed
+            errors += len(json.loads(payload).get("errors") or [])
+    return seconds, errors
+
+
+async def _timed(page, action):
+    started = time.perf_counter()
+    await action()
+    await page.evaluate(_NEXT_FRAME_JS)
+    return (time.perf_counter() - started) * 1000
+
+
+async def measure_ui(pool, base_url, data):
+    async with pool.acquire() as context:
+        page = await open_app(context, base_url)
+        await perf.wait_for_mark(page, "dashboard:rendered", timeout=120000)
+        await api_idle(page, timeout=120000)
+        results = {}
+
+        for label, tab in (("Comissões", "comissoes"), ("Relatórios", "relatorios")):
+            await page.get_by_role("button", name=label, exact=True).click(timeout=120000)
+            await perf.wait_for_measure(page, f"tab:{tab}", timeout=120000)
+
+        cliente = page.get_by_placeholder("Nome do cliente...")
+        await actionable(cliente, timeout=120000)
+        nome = data["clientes"][0]["nome"]
+        results["filter.cliente_ms"] = await _timed(page, lambda: cliente.fill(nome, timeout=120000))
+        results["filter.cliente_clear_ms"] = await _timed(page, lambda: cliente.fill("", timeout=120000))
+
+        inicio = page.locator('input[type="date"]').nth(0)
+        first_day = min(s["data_servico"] for s in data["servicos"])
+        results["filter.data_inicio_ms"] = await _timed(page, lambda: inicio.fill(first_day, timeout=120000))
+
+        metrics = perf.summarize(await perf.collect(page))
+        results.update({k: v for k, v in metrics.items()
+                        if k in ("dashboard_load_time", "api./api/data", "tab.comissoes", "tab.relatorios")})
+        return results
+
+
+async def run(sizes, base_url, batch_size, skip_import, seed):
+    report = []
+    async with async_api.async_playwright() as pw:
+        browser = await launch_browser(pw)
+        pool = ContextPool(browser, 1)
+        try:
+            for size in sizes:
+                # Each size gets its own id range: [size * 10M, size * 10M + size] never overlaps
+                # another size's range (for sizes under 10M), so runs accumulate predictably
+                data = datagen.generate(servicos=size, seed=seed, id_offset=10_000_000 * size)
+                row = {"servicos": size, "comissoes": len(data["comissoes"]), "clientes": len(data["clientes"])}
+                if not skip_import:
+                    row["import_s"], row["import_errors"] = import_dataset(base_url, data, batch_size)
+                row["data_fetch_s"], payload = _request(f"{base_url}/api/data")
+                row["data_bytes"] = len(payload)
+                row.update(await measure_ui(pool, base_url, data))
+                report.append(row)
+                print(json.dumps(row))
+        finally:
+            await browser.close()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark import/load/render at increasing dataset sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--batch-size", type=int, default=2000, help="rows per /api/import request")
+    parser.add_argument("--skip-import", action="store_true", help="only measure loading what is already there")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", default=str(DEFAULT_RESULTS))
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args.sizes, args.base_url.rstrip("/"), args.batch_size, args.skip_import, args.seed))
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
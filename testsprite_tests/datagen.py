@@ -0,0 +1,165 @@
+"""Synthetic ``BusinessData`` generator for scale testing.
+
+Writes a backup in the same shape as ``backup-sistema-financeiro-*``
+(clientes/servicos/despesas/comissoes + metadata) with consistent foreign
+keys, so it can be loaded through ImportDialog or posted to ``/api/import``.
+An ``.ndjson`` output path writes the streaming backup format (header line,
+then one ``{"table", "row"}`` record per line); anything else writes the
+legacy single-document JSON.
+
+    python testsprite_tests/datagen.py --servicos 10000 -o /tmp/bench-10k.json
+    python testsprite_tests/datagen.py --servicos 100000 -o /tmp/bench-100k.ndjson
+"""
+import argparse
+import json
+import random
+from datetime import date, datetime, timedelta, timezone
+
+VEICULOS = ["CHR", "GLC-300", "COROLLA", "HB20", "ONIX", "COMPASS", "HILUX", "GOLF", "CIVIC", "T-CROSS", "KICKS", "RANGER"]
+NOMES = ["PDR TEAM", "AUTO CENTER", "OFICINA", "FUNILARIA", "MARTELINHO", "LOCADORA", "CONCESSIONARIA", "GARAGEM"]
+DESPESAS = ["ALUGUEL", "ENERGIA", "AGUA", "INTERNET", "FERRAMENTAS", "COMBUSTIVEL", "MATERIAL", "CONTADOR"]
+PORCENTAGENS = [30, 35, 40]
+
+
+def _placa(rng):
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return f"{rng.choice(letters)}{rng.choice(letters)}-{rng.randint(100, 999)}-{rng.choice(letters)}{rng.choice(letters)}"
+
+
+def _money(value):
+    # Backups and /api/import carry money in reais, rounded to the centavo like DECIMAL(10,2)
+    return round(value, 2)
+
+
+def generate(servicos=1000, clientes=None, despesas=None, months=24, received_ratio=0.6,
+             id_offset=10_000_000, seed=42, end=None):
+    """Build a ``BusinessData`` dict.
+
+    ``clientes`` and ``despesas`` default to sizes proportional to ``servicos``.
+    Services are spread evenly over the last ``months`` months; roughly
+    ``received_ratio`` of them have a commission received in full or in part,
+    each recorded as a ``recebido`` row in ``comissoes``.
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    start = end - timedelta(days=30 * months)
+    span = (end - start).days
+    clientes = clientes if clientes is not None else max(1, servicos // 50)
+    despesas = despesas if despesas is not None else max(1, months * 4)
+    now = datetime.now(timezone.utc).isoformat()
+
+    cliente_rows = []
+    for i in range(clientes):
+        cid = id_offset + i + 1
+        cliente_rows.append({
+            "id": cid,
+            "nome": f"{rng.choice(NOMES)} {i + 1:05d}",
+            "telefone": f"(11) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+            "email": f"cliente{i + 1}@example.com",
+            "endereco": f"Rua {i + 1}, {rng.randint(1, 999)}",
+            "cpf": "",
+            "created_at": now,
+        })
+
+    servico_rows = []
+    comissao_rows = []
+    for i in range(servicos):
+        sid = id_offset + i + 1
+        data_servico = start + timedelta(days=rng.randint(0, span))
+        valor_bruto = _money(rng.uniform(150, 6000))
+        porcentagem = rng.choice(PORCENTAGENS)
+        comissao_total = _money(valor_bruto * porcentagem / 100)
+        recebida = 0.0
+        if rng.random() < received_ratio:
+            recebida = comissao_total if rng.random() < 0.8 else _money(comissao_total * rng.uniform(0.2, 0.9))
+            data_recebimento = min(end, data_servico + timedelta(days=rng.randint(0, 60)))
+            comissao_rows.append({
+                "id": id_offset + len(comissao_rows) + 1,
+                "servico_id": sid,
+                "valor": recebida,
+                "data_recebimento": data_recebimento.isoformat(),
+                "status": "recebido",
+            })
+        servico_rows.append({
+            "id": sid,
+            "data_servico": data_servico.isoformat(),
+            "veiculo": rng.choice(VEICULOS),
+            "placa": _placa(rng),
+            "valor_bruto": valor_bruto,
+            "porcentagem_comissao": porcentagem,
+            "observacao": "",
+            "valor_pago": 0,
+            "quitado": False,
+            "comissao_recebida": recebida,
+            "cliente_id": cliente_rows[rng.randrange(clientes)]["id"],
+        })
+
+    despesa_rows = []
+    for i in range(despesas):
+        vencimento = start + timedelta(days=rng.randint(0, span))
+        despesa_rows.append({
+            "id": id_offset + i + 1,
+            "descricao": rng.choice(DESPESAS),
+            "valor": _money(rng.uniform(50, 2500)),
+            "data_vencimento": vencimento.isoformat(),
+            "pago": vencimento < end - timedelta(days=15) or rng.random() < 0.3,
+        })
+
+    return {
+        "clientes": cliente_rows,
+        "servicos": servico_rows,
+        "despesas": despesa_rows,
+        "comissoes": comissao_rows,
+        "metadata": {
+            "exportDate": now,
+            "version": "1.0",
+            "totalClientes": len(cliente_rows),
+            "totalServicos": len(servico_rows),
+            "totalDespesas": len(despesa_rows),
+            "totalComissoes": len(comissao_rows),
+        },
+    }
+
+
+def write_ndjson(data, fh):
+    """Write ``data`` in the streaming backup format read by ``src/lib/backup-stream.ts``."""
+    header = {"type": "header", "format": "backup-ndjson", "version": 1, "metadata": data["metadata"]}
+    fh.write(json.dumps(header, ensure_ascii=False) + "\n")
+    for table in ("clientes", "servicos", "despesas", "comissoes"):
+        for row in data[table]:
+            fh.write(json.dumps({"table": table, "row": row}, ensure_ascii=False) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic BusinessData backup (JSON or NDJSON)")
+    parser.add_argument("--servicos", type=int, default=1000)
+    parser.add_argument("--clientes", type=int, default=None)
+    parser.add_argument("--despesas", type=int, default=None)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--received-ratio", type=float, default=0.6)
+    parser.add_argument("--id-offset", type=int, default=10_000_000, help="first id used in every table, away from real rows")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", required=True)
+    args = parser.parse_args(argv)
+
+    data = generate(
+        servicos=args.servicos,
+        clientes=args.clientes,
+        despesas=args.despesas,
+        months=args.months,
+        received_ratio=args.received_ratio,
+        id_offset=args.id_offset,
+        seed=args.seed,
+    )
+    with open(args.output, "w", encoding="utf-8") as fh:
+        if args.output.endswith(".ndjson"):
+            write_ndjson(data, fh)
+        else:
+            json.dump(data, fh, ensure_ascii=False)
+    meta = data["metadata"]
+    print(f"{args.output}: {meta['totalClientes']} clientes, {meta['totalServicos']} servicos, "
+          f"{meta['totalDespesas']} despesas, {meta['totalComissoes']} comissoes")
+
+
+if __name__ == "__main__":
+    main()
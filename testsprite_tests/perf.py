@@ -0,0 +1,134 @@
+"""Timing harness for the performance test cases.
+
+Reads Navigation Timing, Resource Timing for the boot fetches in
+``Index.tsx`` and the ``app:*`` User Timing marks/measures emitted by
+``src/lib/perf.ts``, writes them to a JSON file and checks them against
+budgets (milliseconds) from ``perf_budgets.json``.
+
+Environment overrides:
+    PERF_BUDGETS  path to an alternative budgets JSON file
+    PERF_RESULTS  path of the results JSON file to write
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent
+DEFAULT_BUDGETS = TESTS_DIR / "perf_budgets.json"
+DEFAULT_RESULTS = TESTS_DIR / "tmp" / "perf_results.json"
+
+API_ENDPOINTS = ("/api/data",)
+
+_COLLECT_JS = """
+(endpoints) => {
+  const nav = performance.getEntriesByType('navigation')[0];
+  const navigation = nav ? {
+    ttfb: nav.responseStart - nav.startTime,
+    dom_content_loaded: nav.domContentLoadedEventEnd - nav.startTime,
+    load: nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null,
+    transfer_size: nav.transferSize,
+  } : {};
+  const api = {};
+  for (const entry of performance.getEntriesByType('resource')) {
+    const path = new URL(entry.name).pathname;
+    if (endpoints.includes(path)) {
+      (api[path] = api[path] || []).push({
+        start: entry.startTime,
+        duration: entry.duration,
+        transfer_size: entry.transferSize,
+      });
+    }
+  }
+  const marks = {};
+  for (const m of performance.getEntriesByType('mark')) {
+    if (m.name.startsWith('app:')) marks[m.name.slice(4)] = m.startTime;
+  }
+  const measures = {};
+  for (const m of performance.getEntriesByType('measure')) {
+    if (m.name.startsWith('app:')) (measures[m.name.slice(4)] = measures[m.name.slice(4)] || []).push(m.duration);
+  }
+  return { navigation, api, marks, measures };
+}
+"""
+
+
+def load_budgets(path=None):
+    path = Path(path or os.environ.get("PERF_BUDGETS") or DEFAULT_BUDGETS)
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+async def collect(page):
+    return await page.evaluate(_COLLECT_JS, list(API_ENDPOINTS))
+
+
+async def wait_for_mark(page, name, timeout=10000):
+    # Marks are set from React effects, so poll the entry list rather than the DOM
+    await page.wait_for_function(
+        "(n) => performance.getEntriesByName('app:' + n, 'mark').length > 0",
+        arg=name,
+        timeout=timeout,
+    )
+
+
+async def wait_for_measure(page, name, count=1, timeout=10000):
+    await page.wait_for_function(
+        "([n, c]) => performance.getEntriesByName('app:' + n, 'measure').length >= c",
+        arg=[name, count],
+        timeout=timeout,
+    )
+
+
+def summarize(raw):
+    """Flatten the raw browser entries into the metric names used by the budgets."""
+    metrics = {}
+    for key, value in raw.get("navigation", {}).items():
+        if isinstance(value, (int, float)) and key != "transfer_size":
+            metrics[f"navigation.{key}"] = value
+    for path, entries in raw.get("api", {}).items():
+        metrics[f"api.{path}"] = max(e["duration"] for e in entries)
+    marks = raw.get("marks", {})
+    if "dashboard:rendered" in marks:
+        metrics["dashboard_load_time"] = marks["dashboard:rendered"]
+    if "report-viewer:open" in marks:
+        metrics["report_viewer_open"] = marks["report-viewer:open"]
+    tabs = {}
+    for name, durations in raw.get("measures", {}).items():
+        if name.startswith("tab:"):
+            tabs[name[4:]] = max(durations)
+        else:
+            metrics[name] = max(durations)
+    for tab, duration in tabs.items():
+        metrics[f"tab.{tab}"] = duration
+    if tabs:
+        metrics["tab_switch_max"] = max(tabs.values())
+    return metrics
+
+
+def check(metrics, budgets):
+    """Return a list of human readable budget violations (empty when within budget)."""
+    violations = []
+    for name, limit in budgets.items():
+        if name.startswith("_"):
+            continue
+        value = metrics.get(name)
+        if value is None:
+            violations.append(f"{name}: not recorded (budget {limit}ms)")
+        elif value > limit:
+            violations.append(f"{name}: {value:.0f}ms > {limit}ms")
+    return violations
+
+
+def write_results(metrics, raw, violations, path=None):
+    path = Path(path or os.environ.get("PERF_RESULTS") or DEFAULT_RESULTS)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "metrics": metrics,
+        "violations": violations,
+        "raw": raw,
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, indent=2)
+    return path
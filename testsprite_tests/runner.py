@@ -0,0 +1,169 @@
+"""Shared-browser runner for the TestSprite suite.
+
+Starts one Chromium, hands every test case a fresh ``BrowserContext`` and runs
+several cases concurrently on the same event loop. Each TC script exposes
+``async def run_test(context)`` and can still be executed on its own:
+
+    python testsprite_tests/TC001_User_Login_Success.py
+    python testsprite_tests/runner.py -j 4
+    python testsprite_tests/runner.py -j 2 TC006 TC018
+"""
+import argparse
+import asyncio
+import importlib.util
+import sys
+import time
+import traceback
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from playwright import async_api
+
+from waits import track_api
+
+BASE_URL = "http://localhost:8080"
+TESTS_DIR = Path(__file__).resolve().parent
+
+BROWSER_ARGS = [
+    "--window-size=1280,720",         # Set the browser window size
+    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+    "--ipc=host",                     # Use host-level IPC for better stability
+]
+
+
+async def launch_browser(pw):
+    # A shared browser serves several contexts at once, so it cannot run in
+    # --single-process mode like the original per-script launches did.
+    return await pw.chromium.launch(headless=True, args=BROWSER_ARGS)
+
+
+async def open_app(context, url=BASE_URL):
+    # Open a new page in the browser context and wait for the app shell
+    page = await context.new_page()
+    track_api(page)
+    await page.goto(url, wait_until="commit", timeout=10000)
+
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
+        try:
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
+        except async_api.Error:
+            pass
+    return page
+
+
+class ContextPool:
+    """Hands out isolated contexts from one browser, at most ``size`` at a time."""
+
+    def __init__(self, browser, size):
+        self.browser = browser
+        self.size = size
+        self._slots = asyncio.Semaphore(size)
+
+    @asynccontextmanager
+    async def acquire(self):
+        async with self._slots:
+            context = await self.browser.new_context()
+            context.set_default_timeout(5000)
+            try:
+                yield context
+            finally:
+                await context.close()
+
+
+@dataclass
+class TestResult:
+    name: str
+    passed: bool
+    seconds: float
+    error: str = ""
+
+
+def load_test(path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.run_test
+
+
+def discover(patterns=None):
+    paths = sorted(TESTS_DIR.glob("TC*.py"))
+    if patterns:
+        paths = [p for p in paths if any(p.stem.startswith(pat) or pat in p.stem for pat in patterns)]
+    return paths
+
+
+async def run_one(pool, path):
+    started = time.perf_counter()
+    try:
+        run_test = load_test(path)
+        async with pool.acquire() as context:
+            await run_test(context)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}".strip()
+        if not str(exc):
+            error = traceback.format_exc(limit=1).strip().splitlines()[-1]
+        return TestResult(path.stem, False, time.perf_counter() - started, error)
+    return TestResult(path.stem, True, time.perf_counter() - started)
+
+
+async def run_suite(paths, concurrency=4):
+    async with async_api.async_playwright() as pw:
+        browser = await launch_browser(pw)
+        try:
+            pool = ContextPool(browser, concurrency)
+            return await asyncio.gather(*(run_one(pool, path) for path in paths))
+        finally:
+            await browser.close()
+
+
+async def run_standalone(run_test):
+    # Entry point used by the TC scripts when executed directly
+    async with async_api.async_playwright() as pw:
+        browser = await launch_browser(pw)
+        try:
+            async with ContextPool(browser, 1).acquire() as context:
+                await run_test(context)
+        finally:
+            await browser.close()
+
+
+def print_report(results, total_seconds):
+    width = max((len(r.name) for r in results), default=10)
+    for r in results:
+        status = "PASS" if r.passed else "FAIL"
+        line = f"{status}  {r.name:<{width}}  {r.seconds:7.2f}s"
+        if r.error:
+            line += f"  {r.error}"
+        print(line)
+    passed = sum(1 for r in results if r.passed)
+    print(f"\n{passed}/{len(results)} passed in {total_seconds:.2f}s wall time "
+          f"({sum(r.seconds for r in results):.2f}s summed)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the TestSprite suite on a shared browser")
+    parser.add_argument("tests", nargs="*", help="TC ids or name fragments to run (default: all)")
+    parser.add_argument("-j", "--concurrency", type=int, default=4, help="tests running at the same time")
+    args = parser.parse_args(argv)
+
+    paths = discover(args.tests)
+    if not paths:
+        print("No tests matched", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    results = asyncio.run(run_suite(paths, max(1, args.concurrency)))
+    print_report(results, time.perf_counter() - started)
+    return 0 if all(r.passed for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Event-driven waits for the TestSprite scripts.
+
+Replaces the fixed ``page.wait_for_timeout(3000)`` before every step with
+waits that return as soon as the app is ready:
+
+- ``api_idle``: no ``/api/*`` request in flight for a short quiet window
+- ``actionable``: element attached, visible and enabled
+- ``ready``: both of the above, used before every interaction
+- ``toast``: a toast (shadcn toaster or sonner) is on screen
+"""
+import asyncio
+import time
+import weakref
+
+from playwright.async_api import expect
+
+API_PATH = "/api/"
+TOAST_SELECTOR = "li[role='status'], [data-sonner-toast]"
+
+_trackers = weakref.WeakKeyDictionary()
+
+
+class ApiTracker:
+    """Counts in-flight ``/api/*`` requests issued by a page."""
+
+    def __init__(self, page):
+        self.inflight = 0
+        self.last_change = time.monotonic()
+        self._changed = asyncio.Event()
+        page.on("request", self._on_start)
+        page.on("requestfinished", self._on_end)
+        page.on("requestfailed", self._on_end)
+
+    def _touch(self):
+        self.last_change = time.monotonic()
+        self._changed.set()
+
+    def _on_start(self, request):
+        if API_PATH in request.url:
+            self.inflight += 1
+            self._touch()
+
+    def _on_end(self, request):
+        if API_PATH in request.url:
+            self.inflight = max(0, self.inflight - 1)
+            self._touch()
+
+    async def wait_idle(self, quiet_ms=100, timeout=10000):
+        deadline = time.monotonic() + timeout / 1000
+        quiet = quiet_ms / 1000
+        while True:
+            now = time.monotonic()
+            if self.inflight == 0 and now - self.last_change >= quiet:
+                return
+            if now >= deadline:
+                raise TimeoutError(f"{self.inflight} /api request(s) still pending after {timeout}ms")
+            self._changed.clear()
+            remaining = quiet - (now - self.last_change) if self.inflight == 0 else deadline - now
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=max(0.0, min(remaining, deadline - now)))
+            except asyncio.TimeoutError:
+                pass
+
+
+def track_api(page):
+    # Attach before navigation so the boot requests are counted too
+    tracker = _trackers.get(page)
+    if tracker is None:
+        tracker = _trackers[page] = ApiTracker(page)
+    return tracker
+
+
+async def api_idle(page, quiet_ms=100, timeout=10000):
+    await track_api(page).wait_idle(quiet_ms=quiet_ms, timeout=timeout)
+
+
+async def actionable(locator, timeout=5000):
+    await locator.wait_for(state="visible", timeout=timeout)
+    await expect(locator).to_be_enabled(timeout=timeout)
+
+
+async def ready(page, locator, timeout=5000):
+    await api_idle(page, timeout=max(timeout, 10000))
+    await actionable(locator, timeout=timeout)
+
+
+async def toast(page, text=None, timeout=5000):
+    locator = page.locator(TOAST_SELECTOR)
+    if text:
+        locator = locator.filter(has_text=text)
+    await locator.first.wait_for(state="visible", timeout=timeout)
+    return locator.first